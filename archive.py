@@ -0,0 +1,392 @@
+from datetime import datetime, timedelta, timezone
+import hashlib
+import json
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+import numpy as np
+from query_engine import parse_published
+
+# Layout under the archive folder:
+#   sources.txt, authors.txt   append-only dictionaries, line number = id
+#   index.u64 / index.log      URL-hash primary index (sorted base + appended tail)
+#   YYYY-MM/YYYY-MM-DD/seg-NNNNNN.col   immutable column segments per publish day
+#
+# A segment is a length-prefixed JSON header followed by column blobs. Numeric
+# columns are raw little-endian arrays; text columns are NUL-joined UTF-8
+# compressed with zlib, so scans only inflate text for segments that match.
+
+SEGMENT_MAGIC = b'NACS'
+HEADER = struct.Struct('<4sI')
+NUMERIC_COLUMNS = {
+    'published': '<i8',
+    'fetched': '<i8',
+    'source': '<u4',
+    'author': '<u4',
+    'url_hash': '<u8',
+}
+TEXT_COLUMNS = ('url', 'title', 'description', 'content', 'urlToImage')
+INDEX_DTYPE = np.dtype([('hash', '<u8'), ('day', '<i4')])
+
+FLUSH_ARTICLES = 200       # Pending articles written as one segment per day
+MAX_DAY_SEGMENTS = 8       # A day with more segments is merged into one
+INDEX_LOG_MERGE = 100000   # Tail entries folded into the sorted base on open
+
+
+def url_hash(url):
+    return int.from_bytes(hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def day_number(timestamp):
+    return int(timestamp // 86400)
+
+
+def day_label(day):
+    return (datetime(1970, 1, 1, tzinfo=timezone.utc) + timedelta(days=day)).strftime('%Y-%m-%d')
+
+
+def parse_day_label(label):
+    return day_number(datetime.strptime(label, '%Y-%m-%d').replace(tzinfo=timezone.utc).timestamp())
+
+
+class Dictionary:
+    # Append-only string -> id table backed by one line per entry
+
+    def __init__(self, path):
+        self.path = path
+        self.values = []
+        self.ids = {}
+        try:
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    self._add(line.rstrip('\n'))
+        except OSError:
+            pass
+        self.pending = []
+
+    def _add(self, value):
+        self.ids[value] = len(self.values)
+        self.values.append(value)
+
+    def encode(self, value):
+        value = (value or '').replace('\n', ' ')
+        if value not in self.ids:
+            self._add(value)
+            self.pending.append(value)
+        return self.ids[value]
+
+    def flush(self):
+        if self.pending:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(''.join(value + '\n' for value in self.pending))
+                f.flush()
+                os.fsync(f.fileno())
+            self.pending = []
+
+
+def write_segment(path, columns):
+    header = {'rows': len(columns['published']), 'columns': []}
+    blobs = []
+    offset = 0
+    for name, dtype in NUMERIC_COLUMNS.items():
+        blob = np.asarray(columns[name], dtype=dtype).tobytes()
+        header['columns'].append([name, offset, len(blob)])
+        blobs.append(blob)
+        offset += len(blob)
+    for name in TEXT_COLUMNS:
+        blob = zlib.compress('\0'.join((v or '').replace('\0', '') for v in columns[name]).encode('utf-8'), 6)
+        header['columns'].append([name, offset, len(blob)])
+        blobs.append(blob)
+        offset += len(blob)
+
+    header_bytes = json.dumps(header).encode('utf-8')
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(SEGMENT_MAGIC, len(header_bytes)))
+        f.write(header_bytes)
+        for blob in blobs:
+            f.write(blob)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class Segment:
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            magic, header_size = HEADER.unpack(f.read(HEADER.size))
+            if magic != SEGMENT_MAGIC:
+                raise ValueError(f"not an archive segment: {path}")
+            header = json.loads(f.read(header_size))
+        self.rows = header['rows']
+        self.base = HEADER.size + header_size
+        self.columns = {name: (offset, size) for name, offset, size in header['columns']}
+
+    def _read(self, f, name):
+        offset, size = self.columns[name]
+        f.seek(self.base + offset)
+        return f.read(size)
+
+    def numeric(self, *names):
+        with open(self.path, 'rb') as f:
+            return [np.frombuffer(self._read(f, name), dtype=NUMERIC_COLUMNS[name]) for name in names]
+
+    def text(self, *names):
+        with open(self.path, 'rb') as f:
+            result = []
+            for name in names:
+                values = zlib.decompress(self._read(f, name)).decode('utf-8').split('\0')
+                result.append(values if self.rows else [])
+            return result
+
+    def read_all(self):
+        columns = dict(zip(NUMERIC_COLUMNS, self.numeric(*NUMERIC_COLUMNS)))
+        columns.update(zip(TEXT_COLUMNS, self.text(*TEXT_COLUMNS)))
+        return columns
+
+
+class ArticleArchive:
+    """Append-only, day-partitioned columnar archive of every fetched article.
+
+    add() only queues; a single writer thread dedupes against the URL-hash
+    index, dictionary-encodes sources and authors and writes one immutable
+    segment per publish day. Scans prune by day directory first and read
+    the narrow numeric columns before inflating any text.
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.lock = threading.RLock()
+        self.queue = queue.Queue()
+        self.loaded = False
+        self.pending = []
+        self.articles_written = 0
+        threading.Thread(target=self._work, name="archive", daemon=True).start()
+
+    def _load(self):
+        # Dictionaries and the index are read on the writer thread, not at startup
+        if self.loaded:
+            return
+        self.sources = Dictionary(os.path.join(self.folder, 'sources.txt'))
+        self.authors = Dictionary(os.path.join(self.folder, 'authors.txt'))
+        self.index_base = self._read_index('index.u64')
+        tail = self._read_index('index.log')
+        if len(tail) > INDEX_LOG_MERGE:
+            self._merge_index(tail)
+            tail = tail[:0]
+        self.index_tail = {int(h): int(d) for h, d in zip(tail['hash'], tail['day'])}
+        self.loaded = True
+
+    def _read_index(self, name):
+        try:
+            with open(os.path.join(self.folder, name), 'rb') as f:
+                data = f.read()
+        except OSError:
+            return np.zeros(0, dtype=INDEX_DTYPE)
+        usable = len(data) - len(data) % INDEX_DTYPE.itemsize  # A torn tail entry is ignored
+        return np.frombuffer(data[:usable], dtype=INDEX_DTYPE)
+
+    def _merge_index(self, tail):
+        merged = np.concatenate([self.index_base, tail])
+        merged = merged[np.argsort(merged['hash'], kind='stable')]
+        tmp_path = os.path.join(self.folder, 'index.u64.tmp')
+        merged.tofile(tmp_path)
+        os.replace(tmp_path, os.path.join(self.folder, 'index.u64'))
+        open(os.path.join(self.folder, 'index.log'), 'wb').close()
+        self.index_base = merged
+
+    def lookup(self, url):
+        # Publish day of an archived URL, or None
+        with self.lock:
+            self._load()
+            h = url_hash(url)
+            if h in self.index_tail:
+                return self.index_tail[h]
+            i = np.searchsorted(self.index_base['hash'], np.uint64(h))
+            if i < len(self.index_base) and self.index_base['hash'][i] == h:
+                return int(self.index_base['day'][i])
+            return None
+
+    def __contains__(self, url):
+        return self.lookup(url) is not None
+
+    def add(self, articles):
+        self.queue.put(('add', list(articles)))
+
+    def flush(self, wait=False):
+        done = threading.Event()
+        self.queue.put(('flush', done))
+        if wait:
+            done.wait()
+
+    def _work(self):
+        while True:
+            kind, payload = self.queue.get()
+            try:
+                with self.lock:
+                    self._load()
+                    if kind == 'add':
+                        self.pending.extend(payload)
+                        if len(self.pending) >= FLUSH_ARTICLES:
+                            self._write_pending()
+                    else:
+                        self._write_pending()
+            except Exception as e:
+                print(f"Error writing article archive: {e}")
+            finally:
+                if kind == 'flush':
+                    payload.set()
+
+    def _write_pending(self):
+        pending, self.pending = self.pending, []
+        now = int(time.time())
+        by_day = {}
+        seen = set()
+        for article in pending:
+            url = article.get('url')
+            if not url:
+                continue
+            h = url_hash(url)
+            if h in seen or self.lookup(url) is not None:
+                continue
+            seen.add(h)
+            published = int(parse_published(article.get('publishedAt'))) or now
+            by_day.setdefault(day_number(published), []).append((h, published, article))
+        if not by_day:
+            return
+
+        segments = []
+        for day, rows in by_day.items():
+            columns = {
+                'published': [published for _, published, _ in rows],
+                'fetched': [now] * len(rows),
+                'source': [self.sources.encode((a.get('source') or {}).get('name')) for _, _, a in rows],
+                'author': [self.authors.encode(a.get('author')) for _, _, a in rows],
+                'url_hash': [h for h, _, _ in rows],
+            }
+            for name in TEXT_COLUMNS:
+                columns[name] = [a.get(name) or '' for _, _, a in rows]
+            segments.append((day, columns))
+
+        # Dictionaries first, then segments, then the index: a crash never leaves
+        # a segment pointing at an unknown source or author id
+        self.sources.flush()
+        self.authors.flush()
+        entries = []
+        for day, columns in segments:
+            folder = self.day_folder(day, create=True)
+            write_segment(os.path.join(folder, f"seg-{self._next_segment(folder):06d}.col"), columns)
+            entries.extend((h, day) for h in columns['url_hash'])
+            if len(self._segment_paths(folder)) > MAX_DAY_SEGMENTS:
+                self._compact_day(folder)
+
+        index = np.array(entries, dtype=INDEX_DTYPE)
+        with open(os.path.join(self.folder, 'index.log'), 'ab') as f:
+            f.write(index.tobytes())
+        self.index_tail.update(entries)
+        self.articles_written += len(entries)
+
+    def day_folder(self, day, create=False):
+        label = day_label(day)
+        folder = os.path.join(self.folder, label[:7], label)
+        if create:
+            os.makedirs(folder, exist_ok=True)
+        return folder
+
+    def _segment_paths(self, folder):
+        try:
+            return sorted(os.path.join(folder, name) for name in os.listdir(folder) if name.endswith('.col'))
+        except OSError:
+            return []
+
+    def _next_segment(self, folder):
+        paths = self._segment_paths(folder)
+        return int(os.path.basename(paths[-1])[4:10]) + 1 if paths else 1
+
+    def _compact_day(self, folder):
+        paths = self._segment_paths(folder)
+        parts = [Segment(path).read_all() for path in paths]
+        merged = {name: [value for part in parts for value in part[name]]
+                  for name in (*NUMERIC_COLUMNS, *TEXT_COLUMNS)}
+        write_segment(os.path.join(folder, f"seg-{self._next_segment(folder):06d}.col"), merged)
+        for path in paths:
+            os.remove(path)
+
+    def days(self):
+        # Archived publish days, newest first
+        labels = []
+        try:
+            for month in os.listdir(self.folder):
+                month_folder = os.path.join(self.folder, month)
+                if os.path.isdir(month_folder):
+                    labels.extend(day for day in os.listdir(month_folder)
+                                  if self._segment_paths(os.path.join(month_folder, day)))
+        except OSError:
+            pass
+        return sorted(labels, reverse=True)
+
+    def scan(self, since=None, until=None, sources=None, authors=None, query=None, limit=None):
+        """Articles published in [since, until) matching the filters, newest first."""
+        with self.lock:
+            self._load()
+            source_ids = None if sources is None else {self.sources.ids[s] for s in sources if s in self.sources.ids}
+            author_ids = None if authors is None else {self.authors.ids[a] for a in authors if a in self.authors.ids}
+            source_names = list(self.sources.values)
+            author_names = list(self.authors.values)
+        if source_ids == set() or author_ids == set():
+            return []
+
+        first = day_number(since) if since else None
+        last = day_number(until - 1) if until else None
+        terms = query.lower().split() if query else []
+        results = []
+        seen = set()
+        for label in self.days():
+            day = parse_day_label(label)
+            if first is not None and day < first or last is not None and day > last:
+                continue
+            for path in self._segment_paths(self.day_folder(day)):
+                try:
+                    segment = Segment(path)
+                    published, source, author, hashes = segment.numeric('published', 'source', 'author', 'url_hash')
+                except (OSError, ValueError):
+                    continue
+                mask = np.ones(segment.rows, dtype=bool)
+                if since:
+                    mask &= published >= since
+                if until:
+                    mask &= published < until
+                if source_ids is not None:
+                    mask &= np.isin(source, list(source_ids))
+                if author_ids is not None:
+                    mask &= np.isin(author, list(author_ids))
+                rows = np.flatnonzero(mask)
+                if not len(rows):
+                    continue
+                text = dict(zip(TEXT_COLUMNS, segment.text(*TEXT_COLUMNS)))
+                for row in rows:
+                    if hashes[row] in seen:
+                        continue
+                    if terms:
+                        haystack = f"{text['title'][row]} {text['description'][row]}".lower()
+                        if not all(term in haystack for term in terms):
+                            continue
+                    seen.add(hashes[row])
+                    results.append({
+                        'source': {'id': None, 'name': source_names[source[row]]},
+                        'author': author_names[author[row]] or None,
+                        'title': text['title'][row],
+                        'description': text['description'][row],
+                        'url': text['url'][row],
+                        'urlToImage': text['urlToImage'][row] or None,
+                        'publishedAt': datetime.fromtimestamp(int(published[row]), timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+                        'content': text['content'][row]
+                    })
+            if limit and len(results) >= limit:
+                break
+        results.sort(key=lambda a: a['publishedAt'], reverse=True)
+        return results[:limit] if limit else results
@@ -0,0 +1,359 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import codecs
+import hashlib
+from html.parser import HTMLParser
+import json
+import os
+import queue
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import requests
+from requests.adapters import HTTPAdapter
+
+WORKERS = 16
+PER_HOST = 2              # Concurrent requests to any one site
+MAX_HEAD_BYTES = 512 * 1024  # Stop reading a page here if </head> hasn't shown up
+CHUNK_SIZE = 16384
+TIMEOUT = 15
+BATCH_SIZE = 50           # Files written (and the job log synced) per batch
+BATCH_SECONDS = 1.0
+TRACKING_PARAMS = ('utm_', 'fbclid', 'gclid', 'mc_cid', 'mc_eid')
+USER_AGENT = "Mozilla/5.0 (compatible; NewsExplorer bulk import)"
+
+
+def normalize_url(url):
+    # Same article, same key: no fragment, tracking parameters or trailing slash
+    parts = urlsplit(url.strip())
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if not k.lower().startswith(TRACKING_PARAMS)]
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ''))
+
+
+class BookmarkParser(HTMLParser):
+    # Netscape bookmark files (what browsers export) are HTML with one <A HREF> per bookmark
+    def __init__(self):
+        super().__init__()
+        self.urls = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'a':
+            href = dict(attrs).get('href')
+            if href:
+                self.urls.append(href)
+
+
+def json_bookmark_urls(node):
+    # Chromium's Bookmarks file: nested folders with "children" lists
+    if isinstance(node, dict):
+        if node.get('type') == 'url' and node.get('url'):
+            yield node['url']
+        for value in node.values():
+            if isinstance(value, (dict, list)):
+                yield from json_bookmark_urls(value)
+    elif isinstance(node, list):
+        for item in node:
+            yield from json_bookmark_urls(item)
+
+
+def read_url_list(path):
+    """URLs from a plain list, a bookmarks HTML export or a Chromium Bookmarks JSON file."""
+    with open(path, encoding='utf-8', errors='replace') as f:
+        text = f.read()
+    stripped = text.lstrip()
+    if stripped.startswith('{'):
+        urls = list(json_bookmark_urls(json.loads(text)))
+    elif stripped[:200].lower().startswith(('<!doctype netscape', '<html', '<dl', '<meta')):
+        parser = BookmarkParser()
+        parser.feed(text)
+        urls = parser.urls
+    else:
+        urls = [line.strip() for line in text.splitlines()]
+
+    seen = set()
+    result = []
+    for url in urls:
+        if not url.startswith(('http://', 'https://')):
+            continue
+        key = normalize_url(url)
+        if key not in seen:
+            seen.add(key)
+            result.append(url)
+    return result
+
+
+class MetadataParser(HTMLParser):
+    """Collects OpenGraph and meta-tag fields from a page as it streams in.
+
+    Sets done at </head> or <body>, so the rest of the page need not be read.
+    """
+
+    FIELDS = {
+        'og:title': 'title', 'twitter:title': 'title',
+        'og:site_name': 'source', 'application-name': 'source',
+        'author': 'author', 'article:author': 'author', 'byl': 'author', 'parsely-author': 'author',
+        'article:published_time': 'publishedAt', 'og:published_time': 'publishedAt',
+        'date': 'publishedAt', 'pubdate': 'publishedAt', 'parsely-pub-date': 'publishedAt',
+        'og:description': 'description', 'twitter:description': 'description', 'description': 'description',
+        'og:url': 'url', 'og:image': 'urlToImage'
+    }
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.meta = {}
+        self.title_parts = None
+        self.page_title = ''
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'meta':
+            attrs = dict(attrs)
+            name = (attrs.get('property') or attrs.get('name') or attrs.get('itemprop') or '').lower()
+            field = self.FIELDS.get(name)
+            content = (attrs.get('content') or '').strip()
+            if field and content:
+                self.meta.setdefault(field, content)  # The first (usually OpenGraph) value wins
+        elif tag == 'link' and 'canonical' in (dict(attrs).get('rel') or '').lower():
+            self.meta.setdefault('url', dict(attrs).get('href'))
+        elif tag == 'title':
+            self.title_parts = []
+        elif tag == 'body':
+            self.done = True
+
+    def handle_data(self, data):
+        if self.title_parts is not None:
+            self.title_parts.append(data)
+
+    def handle_endtag(self, tag):
+        if tag == 'title' and self.title_parts is not None:
+            self.page_title = ' '.join(''.join(self.title_parts).split())
+            self.title_parts = None
+        elif tag == 'head':
+            self.done = True
+
+
+def fetch_metadata(session, url, max_bytes=MAX_HEAD_BYTES):
+    with session.get(url, timeout=TIMEOUT, stream=True) as response:
+        response.raise_for_status()
+        content_type = response.headers.get('Content-Type', 'text/html')
+        if 'html' not in content_type:
+            raise ValueError(f"not an HTML page ({content_type})")
+        # Without a charset requests assumes Latin-1 for text/*; UTF-8 is the better guess for HTML
+        encoding = response.encoding if 'charset' in content_type.lower() else 'utf-8'
+        try:
+            decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        except LookupError:
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        parser = MetadataParser()
+        received = 0
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            parser.feed(decoder.decode(chunk))
+            received += len(chunk)
+            if parser.done or received >= max_bytes:
+                break
+        final_url = response.url
+
+    meta = parser.meta
+    host = urlsplit(final_url).netloc
+    return {
+        'title': meta.get('title') or parser.page_title or url,
+        'source': {'name': meta.get('source') or (host[4:] if host.startswith('www.') else host)},
+        'author': meta.get('author') or 'Unknown',
+        'publishedAt': meta.get('publishedAt', ''),
+        'description': meta.get('description', ''),
+        'content': '',
+        'url': url,
+        'canonical': meta.get('url') or final_url,
+        'urlToImage': meta.get('urlToImage')
+    }
+
+
+class ImportJob:
+    """Resumable bulk import of URLs into the saved library.
+
+    The job log (JSON lines: a header with the URL list, then one line per
+    finished URL) is synced after every written batch, so a job cut short
+    picks up where it stopped. Pages are fetched by a thread pool that a
+    scheduler feeds round-robin across hosts, never more than per_host at
+    once for any site; a single writer thread saves the results in batches.
+    """
+
+    def __init__(self, log_path, write_article, existing_urls, on_progress=None, on_done=None,
+                 workers=WORKERS, per_host=PER_HOST):
+        self.log_path = log_path
+        self.write_article = write_article      # article -> saved path, called from the writer thread
+        self.existing = {normalize_url(u) for u in existing_urls if u}
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.workers = workers
+        self.per_host = per_host
+        self.cancelled = threading.Event()
+        self.results = queue.Queue()
+        self.counts = {'saved': 0, 'duplicate': 0, 'failed': 0}
+        self.total = 0
+        self.done = 0
+        self.saved_paths = []
+
+    @staticmethod
+    def log_path_for(folder, urls):
+        digest = hashlib.sha1('\n'.join(urls).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(folder, f"import-{digest}.jsonl")
+
+    @staticmethod
+    def unfinished(folder):
+        paths = []
+        for name in sorted(os.listdir(folder)):
+            if name.startswith('import-') and name.endswith('.jsonl'):
+                with open(os.path.join(folder, name), 'rb') as f:
+                    f.seek(0, os.SEEK_END)
+                    f.seek(max(0, f.tell() - 256))
+                    if b'"type": "finished"' not in f.read():
+                        paths.append(os.path.join(folder, name))
+        return paths
+
+    def load(self, urls=None):
+        # A new job writes its header; an existing log gives back the URLs and what is already done
+        finished = set()
+        if os.path.exists(self.log_path):
+            with open(self.log_path, 'rb+') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    f.write(b'\n')  # Don't append onto a line torn by a crash
+            with open(self.log_path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # Torn last line from a crash
+                    if entry.get('type') == 'header':
+                        urls = entry['urls']
+                    elif 'url' in entry:
+                        finished.add(entry['url'])
+                        self.counts[entry['status']] = self.counts.get(entry['status'], 0) + 1
+        else:
+            with open(self.log_path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps({'type': 'header', 'created': time.time(), 'urls': urls}) + '\n')
+        self.total = len(urls)
+        self.done = len(finished)
+        return [url for url in urls if url not in finished]
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def run(self, urls=None):
+        try:
+            pending = self.load(urls)
+            writer = threading.Thread(target=self._write_loop, name="bulk-import-writer", daemon=True)
+            writer.start()
+            self._fetch_all(pending)
+            self.results.put(None)
+            writer.join()
+        except Exception as e:
+            print(f"Error importing URLs: {e}")
+            self.counts['error'] = str(e)
+        if self.on_done:
+            self.on_done(self)
+
+    def _fetch_all(self, urls):
+        by_host = {}
+        for url in urls:
+            by_host.setdefault(urlsplit(url).netloc.lower(), deque()).append(url)
+        hosts = deque(by_host)
+        active = {}
+        condition = threading.Condition()
+
+        session = requests.Session()
+        session.headers['User-Agent'] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=self.workers, pool_maxsize=self.per_host)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        def fetch(host, url):
+            try:
+                key = normalize_url(url)
+                if key in self.existing:
+                    self.results.put((url, None, 'duplicate'))
+                    return
+                article = fetch_metadata(session, url)
+                self.results.put((url, article, None))
+            except Exception as e:
+                self.results.put((url, None, f"{type(e).__name__}: {e}"))
+            finally:
+                with condition:
+                    active[host] -= 1
+                    condition.notify()
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bulk-import") as pool:
+            running = 0
+            with condition:
+                while hosts and not self.cancelled.is_set():
+                    # Hand out the next URL of the first host with a free slot, rotating hosts
+                    running = sum(active.values())
+                    for _ in range(len(hosts)):
+                        host = hosts[0]
+                        hosts.rotate(-1)
+                        if active.get(host, 0) < self.per_host and running < self.workers:
+                            url = by_host[host].popleft()
+                            if not by_host[host]:
+                                hosts.remove(host)
+                            active[host] = active.get(host, 0) + 1
+                            running += 1
+                            pool.submit(fetch, host, url)
+                            break
+                    else:
+                        condition.wait(0.5)
+        session.close()
+
+    def _write_loop(self):
+        batch = []
+        deadline = time.monotonic() + BATCH_SECONDS
+        with open(self.log_path, 'a', encoding='utf-8') as log:
+            while True:
+                try:
+                    item = self.results.get(timeout=max(0.05, deadline - time.monotonic()))
+                except queue.Empty:
+                    item = False
+                if item:
+                    batch.append(item)
+                if item is None or len(batch) >= BATCH_SIZE or time.monotonic() >= deadline:
+                    if batch:
+                        self._write_batch(batch, log)
+                        batch = []
+                    deadline = time.monotonic() + BATCH_SECONDS
+                if item is None:
+                    log.write(json.dumps({'type': 'finished' if not self.cancelled.is_set() else 'paused',
+                                          **self.counts}) + '\n')
+                    return
+
+    def _write_batch(self, batch, log):
+        for url, article, error in batch:
+            entry = {'url': url}
+            if article is not None:
+                # Redirects and canonical links can reveal a duplicate only after the fetch
+                canonical = normalize_url(article.pop('canonical'))
+                if canonical in self.existing:
+                    error = 'duplicate'
+                else:
+                    try:
+                        entry['path'] = self.write_article(article)
+                        self.saved_paths.append(entry['path'])
+                        self.existing.add(canonical)
+                        self.existing.add(normalize_url(url))
+                    except OSError as e:
+                        error = f"write failed: {e}"
+            if error == 'duplicate':
+                entry['status'] = 'duplicate'
+            elif error:
+                entry['status'] = 'failed'
+                entry['error'] = error
+            else:
+                entry['status'] = 'saved'
+            self.counts[entry['status']] += 1
+            self.done += 1
+            log.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        log.flush()
+        os.fsync(log.fileno())
+        if self.on_progress:
+            self.on_progress(self)
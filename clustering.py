@@ -0,0 +1,197 @@
+import queue
+import threading
+import numpy as np
+from textutil import article_text, tokenize, hashed_features
+
+N_FEATURES = 4096
+SIMILARITY_THRESHOLD = 0.35
+MAX_ARTICLES = 5000
+CHUNK_SIZE = 64  # Rows compared against the stories at once
+
+
+class StoryClusterer:
+    """Incremental TF-IDF leader clustering of articles into stories.
+
+    Each batch is vectorized in one pass (hashed term counts, log TF and the
+    running IDF) and compared against every existing story centroid with a
+    matrix product over the features it uses, so new pages are absorbed
+    without refitting. submit() and submit_grouping() run on one worker
+    thread in order, so a grouping request sees every batch submitted
+    before it.
+    """
+
+    def __init__(self, n_features=N_FEATURES, threshold=SIMILARITY_THRESHOLD, max_articles=MAX_ARTICLES):
+        self.n_features = n_features
+        self.threshold = threshold
+        self.max_articles = max_articles
+        self.clear()
+        self.queue = queue.Queue()
+        threading.Thread(target=self._work, name="clustering", daemon=True).start()
+
+    def submit(self, articles):
+        self.queue.put((list(articles), None))
+
+    def submit_grouping(self, articles, callback):
+        # callback(stories) runs on the worker, see stories()
+        self.queue.put((list(articles), callback))
+
+    def pending(self):
+        # Submitted work not yet finished, including its callback
+        return self.queue.unfinished_tasks
+
+    def _work(self):
+        while True:
+            articles, callback = self.queue.get()
+            try:
+                if callback is None:
+                    self.add(articles)
+                else:
+                    callback(self.stories(articles))
+            except Exception as e:
+                print(f"Error clustering articles: {e}")
+            finally:
+                self.queue.task_done()
+
+    def clear(self):
+        self.doc_freq = np.zeros(self.n_features, dtype=np.float32)
+        self.n_docs = 0
+        # Story centroids stored feature-major so gathering a chunk's features copies whole rows
+        self.centroids = np.zeros((self.n_features, 64), dtype=np.float32)  # grown by doubling
+        self.centroid_norms = np.zeros(64, dtype=np.float32)
+        self.members = []     # cluster id -> list of urls
+        self.vectors = {}     # url -> (feature ids, weights)
+        self.articles = {}    # url -> article
+        self.cluster_by_url = {}
+
+    def __len__(self):
+        return len(self.members)
+
+    def vectorize(self, token_lists):
+        # Returns (feature ids the batch uses, rows over just those columns)
+        rows = np.repeat(np.arange(len(token_lists)), [len(t) for t in token_lists])
+        hashed = np.fromiter((f for tokens in token_lists for f in hashed_features(tokens, self.n_features)),
+                             dtype=np.int64, count=len(rows))
+        features, cols = np.unique(hashed, return_inverse=True)
+        counts = np.zeros((len(token_lists), len(features)), dtype=np.float32)
+        np.add.at(counts, (rows, cols), 1.0)
+
+        # Document frequencies grow with every batch; older vectors keep their weights
+        self.doc_freq[features] += (counts > 0).sum(axis=0)
+        self.n_docs += len(token_lists)
+        idf = np.log((1.0 + self.n_docs) / (1.0 + self.doc_freq[features])) + 1.0
+
+        matrix = np.log1p(counts) * idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return features, matrix / norms
+
+    def add(self, articles):
+        if len(self.vectors) + len(articles) > self.max_articles:
+            self.clear()
+
+        batch = []
+        seen = set()
+        for article in articles:
+            url = article.get('url')
+            if url and url not in self.cluster_by_url and url not in seen:
+                seen.add(url)
+                batch.append(article)
+        if not batch:
+            return 0
+
+        features, matrix = self.vectorize([tokenize(article_text(a)) for a in batch])
+        for start in range(0, len(batch), CHUNK_SIZE):
+            self._absorb(batch[start:start + CHUNK_SIZE], features, matrix[start:start + CHUNK_SIZE])
+        return len(batch)
+
+    def _absorb(self, batch, features, matrix):
+        # Only features present in the chunk matter for the dot products
+        used = matrix.any(axis=0)
+        features = features[used]
+        chunk = matrix[:, used]
+        n_existing = len(self.members)
+
+        # Similarity to existing stories and within the chunk, each in one product
+        existing = chunk @ self.centroids[features, :n_existing]
+        norms = self.centroid_norms[:n_existing].copy()
+        norms[norms == 0] = 1.0
+        existing /= norms
+        within = chunk @ chunk.T
+
+        leader_rows = np.zeros(len(batch), dtype=np.int64)  # chunk row leading each new story
+        n_leaders = 0
+        touched = set()
+        for row, article in enumerate(batch):
+            best_cluster, best_score = None, self.threshold
+            if n_existing:
+                candidate = int(existing[row].argmax())
+                if existing[row, candidate] >= best_score:
+                    best_cluster, best_score = candidate, existing[row, candidate]
+            if n_leaders:
+                scores = within[row, leader_rows[:n_leaders]]
+                candidate = int(scores.argmax())
+                if scores[candidate] > best_score:
+                    best_cluster = n_existing + candidate
+
+            if best_cluster is None:
+                best_cluster = self._new_cluster()
+                leader_rows[n_leaders] = row
+                n_leaders += 1
+
+            self.centroids[features, best_cluster] += chunk[row]
+            touched.add(best_cluster)
+
+            url = article['url']
+            nonzero = np.flatnonzero(chunk[row])
+            self.vectors[url] = (features[nonzero], chunk[row, nonzero])
+            self.articles[url] = article
+            self.members[best_cluster].append(url)
+            self.cluster_by_url[url] = best_cluster
+
+        touched = np.fromiter(touched, dtype=np.int64)
+        self.centroid_norms[touched] = np.linalg.norm(self.centroids[:, touched], axis=0)
+
+    def _new_cluster(self):
+        cluster = len(self.members)
+        if cluster == self.centroids.shape[1]:
+            grown = np.zeros((self.n_features, 2 * cluster), dtype=np.float32)
+            grown[:, :cluster] = self.centroids
+            self.centroids = grown
+            self.centroid_norms = np.concatenate([self.centroid_norms, np.zeros(cluster, np.float32)])
+        self.members.append([])
+        return cluster
+
+    def representative(self, cluster, urls=None):
+        # The member closest to the story centroid
+        centroid = self.centroids[:, cluster]
+        best_url, best_score = None, -1.0
+        for url in urls or self.members[cluster]:
+            features, weights = self.vectors[url]
+            score = float(centroid[features] @ weights)
+            if score > best_score:
+                best_url, best_score = url, score
+        return best_url
+
+    def group(self, articles):
+        # Group a displayed list by story: [(cluster id or None, [indices])]
+        groups = {}
+        order = []
+        for i, article in enumerate(articles):
+            cluster = self.cluster_by_url.get(article.get('url'))
+            key = cluster if cluster is not None else ('single', i)
+            if key not in groups:
+                groups[key] = []
+                order.append(key)
+            groups[key].append(i)
+        return [(key if not isinstance(key, tuple) else None, groups[key]) for key in order]
+
+    def stories(self, articles):
+        # group() plus each story's lead: [(cluster id or None, [indices], lead index)]
+        stories = []
+        for cluster, indices in self.group(articles):
+            lead = indices[0]
+            if cluster is not None and len(indices) > 1:
+                representative = self.representative(cluster, [articles[i].get('url') for i in indices])
+                lead = next(i for i in indices if articles[i].get('url') == representative)
+            stories.append((cluster, indices, lead))
+        return stories
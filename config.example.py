@@ -1,3 +1,11 @@
 # Example configuration file
 # Rename to config.py and add your API key
-API_KEY = 'your_api_key_here' 
\ No newline at end of file
+API_KEY = 'your_api_key_here' 
+
+# Optional RSS/Atom feeds shown under "📡 Feeds"
+FEEDS = [
+    # 'https://feeds.bbci.co.uk/news/world/rss.xml',
+]
+
+# Optional hub for "🔁 Sync": a shared folder or a library_sync.py server URL
+# SYNC_HUB = 'http://hub-host:8766'
@@ -0,0 +1,114 @@
+from collections import deque
+import threading
+import time
+
+BUDGET_MS = 8      # Time the Tk thread spends on queued updates per tick
+POLL_MS = 16       # Tick interval while the queue is empty, for drivers that pump update()
+
+
+class UiDispatcher:
+    """Single hand-off point from worker threads to Tk widgets.
+
+    Workers post callables; only the Tk thread runs them, from a root.after
+    tick that stops after the frame budget and leaves the rest for the next
+    tick. Posts sharing a key replace each other, so only the latest status
+    text or refresh request is applied. Nothing is scheduled while the queue
+    is empty: the post that fills it schedules the next tick.
+
+    Scheduling from a worker relies on Tk marshalling the call to a running
+    mainloop. Headless drivers that pump root.update() instead pass
+    poll_when_idle, so workers never touch Tk and the queue is polled.
+    """
+
+    def __init__(self, root, metrics=None, budget_ms=BUDGET_MS, poll_ms=POLL_MS, poll_when_idle=False):
+        self.root = root
+        self.metrics = metrics
+        self.budget = budget_ms / 1000
+        self.poll_ms = poll_ms
+        self.lock = threading.Lock()
+        self.pending = deque()   # callables, or keys for merged updates
+        self.keyed = {}          # key -> latest callable
+        self.running = True
+        self.scheduled = poll_when_idle   # A drain tick is queued with Tk
+        self.polling = poll_when_idle
+        if poll_when_idle:
+            self.root.after(self.poll_ms, self.drain)
+
+    def __len__(self):
+        with self.lock:
+            return len(self.pending)
+
+    def post(self, callback, key=None):
+        with self.lock:
+            merged = False
+            if key is None:
+                self.pending.append(callback)
+            elif key in self.keyed:
+                merged = True
+            else:
+                self.pending.append(('key', key))
+            if key is not None:
+                self.keyed[key] = callback
+            wake = self._claim_tick()
+        if merged and self.metrics:
+            self.metrics.incr('ui.merged')
+        if wake:
+            self.root.after(0, self.drain)
+
+    def post_batch(self, callbacks):
+        with self.lock:
+            self.pending.extend(callbacks)
+            wake = self._claim_tick()
+        if wake:
+            self.root.after(0, self.drain)
+
+    def _claim_tick(self):
+        # Called with the lock held; True when the caller has to schedule the drain
+        if self.scheduled or self.polling or not self.pending:
+            return False
+        self.scheduled = True
+        return True
+
+    def _next(self):
+        with self.lock:
+            if not self.pending:
+                return None
+            item = self.pending.popleft()
+            if isinstance(item, tuple):
+                return self.keyed.pop(item[1])
+            return item
+
+    def drain(self):
+        if not self.running:
+            return
+        started = time.perf_counter()
+        ran = 0
+        while time.perf_counter() - started < self.budget:
+            callback = self._next()
+            if callback is None:
+                break
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error in UI update: {e}")
+                if self.metrics:
+                    self.metrics.incr('ui.errors')
+            ran += 1
+
+        with self.lock:
+            left = len(self.pending)
+            # A post that lands after this sees the flag cleared and schedules the next tick
+            self.scheduled = bool(left) or self.polling
+        if self.metrics and ran:
+            self.metrics.incr('ui.dispatched', ran)
+            self.metrics.observe('ui.drain_ms', (time.perf_counter() - started) * 1000)
+        if left and self.metrics:
+            self.metrics.incr('ui.deferred', left)  # Updates pushed to a later tick by the budget
+        # Come straight back when work was left over; when idle only a polling driver ticks
+        if left:
+            self.root.after(1, self.drain)
+        elif self.polling:
+            self.root.after(self.poll_ms, self.drain)
+
+    def stop(self):
+        self.running = False
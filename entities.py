@@ -0,0 +1,253 @@
+import re
+import threading
+from textutil import STOPWORDS, strip_truncation
+
+PERSON = 'person'
+ORG = 'org'
+PLACE = 'place'
+KIND_LABELS = {PERSON: "People", ORG: "Organizations", PLACE: "Places"}
+
+MAX_ARTICLES = 20000  # Fetched articles kept; the oldest half is evicted past this
+MAX_TOKENS = 5
+
+# Small built-in gazetteer; anything else is classified from its shape
+PLACES = frozenset("""
+afghanistan africa alaska argentina arizona asia australia austria beijing belgium berlin brazil
+britain brussels california canada chicago china colombia cuba delhi denmark egypt england europe
+finland florida france gaza georgia germany greece india indonesia iran iraq ireland israel italy
+japan jerusalem kenya kyiv korea london mexico michigan moscow nigeria norway ohio pakistan paris
+pennsylvania philippines poland portugal russia scotland seoul shanghai singapore spain sweden
+switzerland syria taiwan texas tokyo turkey ukraine venezuela vietnam washington wales
+u.s. us uk u.k.
+""".split())
+MULTIWORD_PLACES = frozenset([
+    'hong kong', 'los angeles', 'new york', 'new york city', 'north korea', 'south korea',
+    'saudi arabia', 'south africa', 'united kingdom', 'united states', 'west bank',
+    'san francisco', 'silicon valley', 'middle east', 'latin america', 'new zealand', 'new delhi'
+])
+ORGS = frozenset("""
+amazon apple boeing fbi cia nasa nato google meta microsoft netflix nvidia openai opec pentagon
+reuters tesla twitter uber who congress senate parliament kremlin fifa uefa nfl nba mlb spacex
+intel samsung sony toyota walmart disney eu un imf
+""".split())
+GAZETTEER = PLACES | MULTIWORD_PLACES | ORGS
+ORG_WORDS = frozenset("""
+inc corp corporation co ltd llc plc group bank university college institute party ministry
+department council agency commission committee court association federation union fund
+foundation company airlines motors news times post journal club fc united reserve press
+""".split())
+PERSON_TITLES = frozenset("""
+mr mrs ms dr president senator sen rep governor gov mayor minister chancellor pope king queen
+prince princess judge ceo chairman secretary general
+""".split())
+# Capitalized words that start sentences or headlines without naming anything
+COMMON_CAPS = STOPWORDS | frozenset("""
+monday tuesday wednesday thursday friday saturday sunday january february march april may june
+july august september october november december breaking exclusive opinion analysis watch
+here there how why what when where who according meanwhile however still despite
+""".split())
+
+NAME_TOKEN = r"(?:(?:[A-Z]\.){2,}|[A-Z][a-zA-Z&\-]*|[A-Z]{2,})(?:'s)?"
+CAPITALIZED_RUN_RE = re.compile(
+    rf"\b{NAME_TOKEN}(?:\s+(?:(?:of|de|la|van|von|al|bin)\s+)?{NAME_TOKEN})*"
+)
+POSSESSIVE_RE = re.compile(r"'s(?:\s+|$)")
+
+
+def classify(name, title_before=False):
+    lowered = name.lower()
+    words = lowered.replace('.', '').split()
+    if lowered in MULTIWORD_PLACES or lowered in PLACES:
+        return PLACE
+    if lowered in ORGS or (name.isupper() and '.' not in name and 2 <= len(name) <= 6):
+        return ORG
+    if words and (words[-1] in ORG_WORDS or words[0] in ORG_WORDS and 'of' in words):
+        return ORG
+    if title_before or 2 <= len(words) <= 3:
+        return PERSON
+    return None
+
+
+def add_candidate(found, words, title_before):
+    name = ' '.join(words)
+    if name.lower() not in GAZETTEER:
+        while words and words[0].lower() in COMMON_CAPS:
+            words = words[1:]
+        name = ' '.join(words)
+    if not words or len(words) > MAX_TOKENS or len(name) < 3 and not name.isupper():
+        return
+    kind = classify(name, title_before)
+    if kind:
+        found.setdefault(name, kind)
+    elif len(words) == 1 and name.lower() not in COMMON_CAPS:
+        found.setdefault(name, None)  # Resolved against longer names below
+
+
+def extract_entities(text):
+    """Capitalized runs classified by gazetteer and shape, as {name: kind}.
+
+    A lone surname is folded into the full name seen in the same text, so
+    "Biden" counts towards "Joe Biden".
+    """
+    found = {}
+    # A possessive ends a name: "Apple's CEO Tim Cook" is two runs
+    runs = (part for match in CAPITALIZED_RUN_RE.finditer(text)
+            for part in POSSESSIVE_RE.split(match.group(0)))
+    for run in runs:
+        # A title also starts a new name: "U.S. Senator Ted Cruz"
+        words = []
+        title_before = False
+        for word in run.split() + [None]:
+            if word is None or word.lower().rstrip('.') in PERSON_TITLES:
+                if words:
+                    add_candidate(found, words, title_before)
+                words = []
+                title_before = word is not None
+            else:
+                words.append(word)
+
+    people = [name for name, kind in found.items() if kind == PERSON and ' ' in name]
+    entities = {}
+    for name, kind in found.items():
+        if kind is None or kind == PERSON and ' ' not in name:
+            full = next((person for person in people if person.endswith(' ' + name)), None)
+            if full:
+                continue
+            if kind is None:
+                continue
+        entities[name] = kind
+    return entities
+
+
+def entity_text(article):
+    return ' . '.join(filter(None, [article.get('title'), article.get('description'),
+                                     strip_truncation(article.get('content'))]))
+
+
+class EntityIndex:
+    """Inverted entity -> articles index with per-entity article counts.
+
+    Postings are bitsets over article ids (Python ints), so adding a page
+    only sets a few bits and counts are popcounts. Saved-library articles
+    (those with a 'path') do not count towards max_articles and are never
+    evicted; past the cap the oldest fetched articles are dropped. Deleting
+    a saved file unpins its article, or drops it if it was never fetched.
+    """
+
+    def __init__(self, max_articles=MAX_ARTICLES):
+        self.max_articles = max_articles
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        self.articles = []
+        self.entities = []   # article id -> {name: kind}, kept so eviction needs no re-extraction
+        self.saved = set()   # ids of saved-library articles, exempt from eviction
+        self.saved_paths = {}  # saved file path -> article id
+        self.ids_by_key = {}
+        self.postings = {}   # name -> bitset of article ids
+        self.kinds = {}      # name -> kind
+        self.version = 0
+
+    def __len__(self):
+        return len(self.postings)
+
+    def add(self, articles):
+        # Extraction happens outside the lock; only the merge is serialized
+        batch = []
+        for article in articles:
+            key = article.get('url') or article.get('path')
+            if key:
+                batch.append((key, article, extract_entities(entity_text(article))))
+        with self.lock:
+            added = 0
+            for key, article, entities in batch:
+                doc_id = self.ids_by_key.get(key)
+                if doc_id is not None:
+                    # Saving an already fetched article pins it
+                    if article.get('path'):
+                        self.saved.add(doc_id)
+                        self.saved_paths[article['path']] = doc_id
+                    continue
+                self._append(key, article, entities)
+                added += 1
+            if len(self.articles) - len(self.saved) > self.max_articles:
+                self._evict(self.max_articles // 2)
+            if added:
+                self.version += 1
+            return added
+
+    def _append(self, key, article, entities):
+        doc_id = len(self.articles)
+        self.ids_by_key[key] = doc_id
+        self.articles.append(article)
+        self.entities.append(entities)
+        if article.get('path'):
+            self.saved.add(doc_id)
+            self.saved_paths[article['path']] = doc_id
+        bit = 1 << doc_id
+        for name, kind in entities.items():
+            self.postings[name] = self.postings.get(name, 0) | bit
+            self.kinds.setdefault(name, kind)
+
+    def remove_saved(self, path):
+        with self.lock:
+            doc_id = self.saved_paths.pop(path, None)
+            if doc_id is None:
+                return
+            if doc_id not in self.saved_paths.values():
+                self.saved.discard(doc_id)
+            article = self.articles[doc_id]
+            if doc_id not in self.saved and article.get('path'):
+                # Only ever read from the library, so nothing else shows it: drop its postings
+                bit = 1 << doc_id
+                for name in self.entities[doc_id]:
+                    bits = self.postings[name] & ~bit
+                    if bits:
+                        self.postings[name] = bits
+                    else:
+                        del self.postings[name]
+                        del self.kinds[name]
+                del self.ids_by_key[article.get('url') or article['path']]
+                self.entities[doc_id] = None
+            self.version += 1
+
+    def _evict(self, keep):
+        # Keep every saved article and the newest fetched ones, renumbered in their original order
+        keys = {doc_id: key for key, doc_id in self.ids_by_key.items()}
+        fetched = [doc_id for doc_id in range(len(self.articles)) if doc_id in keys and doc_id not in self.saved]
+        kept = self.saved.union(fetched[-keep:] if keep else ())
+        paths = {}
+        for path, doc_id in self.saved_paths.items():
+            paths.setdefault(doc_id, []).append(path)
+        rows = [(keys[doc_id], self.articles[doc_id], self.entities[doc_id], paths.get(doc_id, ()))
+                for doc_id in sorted(kept)]
+        version = self.version
+        self.clear()
+        self.version = version
+        for key, article, entities, saved_paths in rows:
+            self._append(key, article, entities)
+            for path in saved_paths:
+                self.saved.add(len(self.articles) - 1)
+                self.saved_paths[path] = len(self.articles) - 1
+
+    def top(self, kind=None, prefix='', limit=200, min_count=1):
+        prefix = prefix.lower()
+        with self.lock:
+            counts = [(name, self.kinds[name], bits.bit_count()) for name, bits in self.postings.items()
+                      if (kind is None or self.kinds[name] == kind) and name.lower().startswith(prefix)]
+        counts = [entry for entry in counts if entry[2] >= min_count]
+        counts.sort(key=lambda entry: (-entry[2], entry[0]))
+        return counts[:limit]
+
+    def articles_for(self, name):
+        with self.lock:
+            bits = self.postings.get(name, 0)
+            articles = self.articles
+            result = []
+            while bits:
+                low = bits & -bits
+                result.append(articles[low.bit_length() - 1])
+                bits ^= low
+        result.sort(key=lambda a: a.get('publishedAt') or '', reverse=True)
+        return result
@@ -0,0 +1,273 @@
+"""Local stand-in server for development and soak runs.
+
+Serves deterministic RSS and Atom fixture feeds with ETag / Last-Modified
+support so conditional GETs can be exercised without the network:
+
+    python fixture_server.py --port 8765
+
+Feeds live at /feeds/<name>.rss and /feeds/<name>.atom; POST
+/feeds/<name>/bump publishes one more item and changes the validators.
+It also stands in for NewsAPI (/v2/top-headlines and /v2/everything, with
+thumbnails under /images/) when config.API_BASE_URL points at it.
+"""
+import argparse
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+import hashlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import json
+import struct
+import threading
+import time
+import zlib
+from xml.sax.saxutils import escape
+
+BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+TOPICS = ["markets", "elections", "climate", "chips", "football", "vaccines", "rockets", "banks"]
+SOURCES = ["Reuters", "Associated Press", "BBC News", "The Verge", "Bloomberg", "ESPN"]
+API_TOTAL_RESULTS = 100
+
+
+def render_png(width, height, seed):
+    # Solid colour PNG built by hand so the server needs no imaging library
+    color = bytes(((seed * 67) % 256, (seed * 131) % 256, (seed * 199) % 256))
+    row = b'\x00' + color * width
+    raw = zlib.compress(row * height, 6)
+
+    def chunk(kind, data):
+        return (struct.pack('>I', len(data)) + kind + data +
+                struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff))
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) + chunk(b'IDAT', raw) + chunk(b'IEND', b'')
+
+
+class FixtureNewsApi:
+    def __init__(self, base_url_getter, latency=0.0):
+        self.base_url = base_url_getter
+        self.latency = latency
+        self.images = {}
+
+    def articles(self, key, page, page_size):
+        seed = int(hashlib.sha1(key.encode()).hexdigest()[:8], 16)
+        start = (page - 1) * page_size
+        now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        result = []
+        for i in range(start, min(start + page_size, API_TOTAL_RESULTS)):
+            topic = TOPICS[(seed + i) % len(TOPICS)]
+            n = (seed + i) % 10000
+            result.append({
+                'source': {'id': None, 'name': SOURCES[(seed + i) % len(SOURCES)]},
+                'author': f"Reporter {(seed + i) % 7}",
+                'title': f"{topic.title()} story {n} for {key}",
+                'description': f"A fixture article about {topic} and {key}, number {n}.",
+                'url': f"http://fixture.local/articles/{seed % 1000}/{i}",
+                'urlToImage': f"{self.base_url()}/images/{n % 64}.png",
+                'publishedAt': (now - timedelta(hours=i)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+                'content': f"Full fixture text about {topic}. " * 5 + "[+1200 chars]"
+            })
+        return result
+
+    def respond(self, endpoint, query):
+        if self.latency:
+            time.sleep(self.latency)
+        page = int(query.get('page', ['1'])[0])
+        page_size = int(query.get('pageSize', ['20'])[0])
+        if endpoint == 'everything':
+            key = query.get('q', [''])[0] + '|' + query.get('sortBy', [''])[0]
+        else:
+            key = 'headlines|' + query.get('category', ['all'])[0]
+        return {
+            'status': 'ok',
+            'totalResults': API_TOTAL_RESULTS,
+            'articles': self.articles(key, page, page_size)
+        }
+
+    def image(self, n):
+        if n not in self.images:
+            self.images[n] = render_png(400, 240, n)
+        return self.images[n]
+
+
+class FixtureFeeds:
+    def __init__(self, items=20):
+        self.items = items
+        self.revisions = {}
+        self.lock = threading.Lock()
+
+    def bump(self, name):
+        with self.lock:
+            self.revisions[name] = self.revisions.get(name, 0) + 1
+
+    def state(self, name):
+        with self.lock:
+            revision = self.revisions.get(name, 0)
+        count = self.items + revision
+        return count, BASE_TIME + timedelta(hours=count)
+
+    def entries(self, name, count):
+        for i in range(count - 1, -1, -1):
+            topic = TOPICS[i % len(TOPICS)]
+            yield {
+                'title': f"{name.title()} story {i}: {topic} update",
+                'link': f"http://fixture.local/{name}/{i}",
+                'description': f"<p>Coverage of {topic} from the {name} desk, item {i}.</p>",
+                'author': f"Reporter {i % 5}",
+                'image': f"http://fixture.local/{name}/{i}.jpg",
+                'published': BASE_TIME + timedelta(hours=i)
+            }
+
+    def render_rss(self, name, count):
+        parts = [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            '<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/" '
+            'xmlns:media="http://search.yahoo.com/mrss/">',
+            f'<channel><title>{escape(name.title())} Fixture</title><link>http://fixture.local/{name}</link>'
+        ]
+        for entry in self.entries(name, count):
+            parts.append(
+                f"<item><title>{escape(entry['title'])}</title>"
+                f"<link>{entry['link']}</link>"
+                f"<description>{escape(entry['description'])}</description>"
+                f"<dc:creator>{entry['author']}</dc:creator>"
+                f"<media:thumbnail url=\"{entry['image']}\"/>"
+                f"<pubDate>{format_datetime(entry['published'])}</pubDate></item>"
+            )
+        parts.append('</channel></rss>')
+        return '\n'.join(parts).encode('utf-8')
+
+    def render_atom(self, name, count):
+        parts = [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            '<feed xmlns="http://www.w3.org/2005/Atom">',
+            f'<title>{escape(name.title())} Atom Fixture</title>'
+        ]
+        for entry in self.entries(name, count):
+            parts.append(
+                f"<entry><title>{escape(entry['title'])}</title>"
+                f"<link rel=\"alternate\" href=\"{entry['link']}\"/>"
+                f"<id>{entry['link']}</id>"
+                f"<summary type=\"html\">{escape(entry['description'])}</summary>"
+                f"<author><name>{entry['author']}</name></author>"
+                f"<published>{entry['published'].isoformat()}</published></entry>"
+            )
+        parts.append('</feed>')
+        return '\n'.join(parts).encode('utf-8')
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def send_body(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path.startswith('/feeds/'):
+            return self.serve_feed(url.path[len('/feeds/'):])
+        if url.path in ('/v2/top-headlines', '/v2/everything'):
+            self.server.api_hits += 1
+            body = json.dumps(self.server.api.respond(url.path[len('/v2/'):], parse_qs(url.query)))
+            return self.send_body(200, body.encode('utf-8'), 'application/json')
+        if url.path.startswith('/images/') and url.path.endswith('.png'):
+            try:
+                n = int(url.path[len('/images/'):-len('.png')])
+            except ValueError:
+                return self.send_body(404, b'not found', 'text/plain')
+            return self.send_body(200, self.server.api.image(n), 'image/png')
+        self.send_body(404, b'not found', 'text/plain')
+
+    do_HEAD = do_GET
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        if path.startswith('/feeds/') and path.endswith('/bump'):
+            self.server.feeds.bump(path[len('/feeds/'):-len('/bump')])
+            return self.send_body(200, b'ok', 'text/plain')
+        self.send_body(404, b'not found', 'text/plain')
+
+    def serve_feed(self, filename):
+        name, _, kind = filename.rpartition('.')
+        if kind not in ('rss', 'atom') or not name:
+            return self.send_body(404, b'unknown feed', 'text/plain')
+
+        feeds = self.server.feeds
+        count, modified = feeds.state(name)
+        etag = '"' + hashlib.sha1(f"{name}.{kind}:{count}".encode()).hexdigest()[:16] + '"'
+        validators = {'ETag': etag, 'Last-Modified': format_datetime(modified, usegmt=True)}
+
+        if self.headers.get('If-None-Match') == etag:
+            return self.send_body(304, b'', 'text/plain', validators)
+        since = self.headers.get('If-Modified-Since')
+        if since and not self.headers.get('If-None-Match'):
+            try:
+                if modified <= parsedate_to_datetime(since):
+                    return self.send_body(304, b'', 'text/plain', validators)
+            except (TypeError, ValueError):
+                pass
+
+        self.server.feed_hits += 1
+        if kind == 'rss':
+            body = feeds.render_rss(name, count)
+            content_type = 'application/rss+xml; charset=utf-8'
+        else:
+            body = feeds.render_atom(name, count)
+            content_type = 'application/atom+xml; charset=utf-8'
+        self.send_body(200, body, content_type, validators)
+
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port=0, items=20, verbose=False, latency=0.0):
+        super().__init__(('127.0.0.1', port), FixtureHandler)
+        self.feeds = FixtureFeeds(items)
+        self.api = FixtureNewsApi(lambda: self.base_url, latency)
+        self.verbose = verbose
+        self.feed_hits = 0
+        self.api_hits = 0
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def feed_url(self, name, kind='rss'):
+        return f"{self.base_url}/feeds/{name}.{kind}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local fixture server for News Explorer")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--items', type=int, default=20, help="items per fixture feed")
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to each API response")
+    args = parser.parse_args()
+
+    server = FixtureServer(args.port, args.items, verbose=True, latency=args.latency)
+    print(f"Serving fixtures on {server.base_url}")
+    print(f"  NewsAPI stand-in: API_BASE_URL = '{server.base_url}'")
+    print(f"  RSS:  {server.feed_url('world')}")
+    print(f"  Atom: {server.feed_url('tech', 'atom')}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+from array import array
+import re
+import threading
+import numpy as np
+
+MIN_SCORE = 0.25
+RERANK_FACTOR = 2     # Candidates per result that get the token-level rerank
+MAX_TYPO_DISTANCE = 2
+
+NORMALIZE_RE = re.compile(r'[^a-z0-9]+')
+
+
+def normalize(text):
+    return NORMALIZE_RE.sub(' ', (text or '').lower()).split()
+
+
+def trigrams(words):
+    # Words are padded on both sides so short words and word starts still count
+    grams = set()
+    for word in words:
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            grams.add(padded[i:i + 3])
+    return grams
+
+
+def typo_distance(a, b, limit=MAX_TYPO_DISTANCE):
+    # Optimal string alignment distance (adjacent swaps count once), capped at limit + 1
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def token_similarity(query_words, doc_words, distances):
+    # Share of query words found in the document, typos counting partly.
+    # distances memoizes {query word: {word: distance}} across one search.
+    total = 0.0
+    for word in query_words:
+        if word in doc_words:
+            total += 1
+            continue
+        if len(word) < 4:
+            continue  # Too short to tell a typo from a different word
+        known = distances.get(word)
+        if known is None:
+            known = distances[word] = {}
+        best = MAX_TYPO_DISTANCE + 1
+        for other in doc_words:
+            distance = known.get(other)
+            if distance is None:
+                distance = known[other] = word_distance(word, other)
+            if distance < best:
+                best = distance
+        if best <= MAX_TYPO_DISTANCE:
+            total += 1 - best / (MAX_TYPO_DISTANCE + 1)
+    return total / len(query_words)
+
+
+def word_distance(word, other):
+    # Each edit changes at most two letters of the letter sets, which rules most pairs out cheaply
+    if abs(len(word) - len(other)) > MAX_TYPO_DISTANCE or \
+            len(set(word).symmetric_difference(other)) > 2 * MAX_TYPO_DISTANCE:
+        return MAX_TYPO_DISTANCE + 1
+    return typo_distance(word, other)
+
+
+class TrigramIndex:
+    """Typo-tolerant title index.
+
+    Each key's text is broken into padded word trigrams. A query counts the
+    trigrams it shares with every document through one numpy bincount over
+    the postings, scores candidates by trigram Jaccard, and reranks the best
+    of them by how many query words match up to a couple of typos.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        self.doc_keys = []      # doc id -> key, None once removed
+        self.words = []         # doc id -> normalized words
+        self.ids = {}           # key -> doc id
+        self.sizes = array('i')
+        self.alive = bytearray()
+        self.postings = {}      # trigram -> array of doc ids
+        self.dead = 0
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, key):
+        return key in self.ids
+
+    def keys(self):
+        with self.lock:
+            return list(self.ids)
+
+    def add(self, key, text):
+        words = normalize(text)
+        grams = trigrams(words)
+        with self.lock:
+            self._remove(key)
+            doc_id = len(self.doc_keys)
+            self.doc_keys.append(key)
+            self.words.append(words)
+            self.ids[key] = doc_id
+            self.sizes.append(len(grams))
+            self.alive.append(1)
+            for gram in grams:
+                posting = self.postings.get(gram)
+                if posting is None:
+                    posting = self.postings[gram] = array('i')
+                posting.append(doc_id)
+
+    def add_many(self, items):
+        for key, text in items:
+            self.add(key, text)
+
+    def remove(self, key):
+        with self.lock:
+            self._remove(key)
+            if self.dead > 1000 and self.dead > len(self.ids):
+                self._rebuild()
+
+    def _remove(self, key):
+        doc_id = self.ids.pop(key, None)
+        if doc_id is not None:
+            self.doc_keys[doc_id] = None
+            self.alive[doc_id] = 0
+            self.dead += 1
+
+    def _rebuild(self):
+        # Removed documents stay in the postings until enough pile up to rewrite them
+        live = [(key, ' '.join(words)) for key, words in zip(self.doc_keys, self.words) if key is not None]
+        self.clear()
+        for key, text in live:
+            words = text.split()
+            doc_id = len(self.doc_keys)
+            self.doc_keys.append(key)
+            self.words.append(words)
+            self.ids[key] = doc_id
+            grams = trigrams(words)
+            self.sizes.append(len(grams))
+            self.alive.append(1)
+            for gram in grams:
+                self.postings.setdefault(gram, array('i')).append(doc_id)
+
+    def search(self, query, limit=50, min_score=MIN_SCORE):
+        """Best matching keys for query as [(key, score)], highest first."""
+        query_words = normalize(query)
+        grams = trigrams(query_words)
+        if not grams:
+            return []
+        with self.lock:
+            count = len(self.doc_keys)
+            lists = [np.frombuffer(self.postings[g], dtype=np.int32) for g in grams if g in self.postings]
+            if not lists or not count:
+                return []
+            overlap = np.bincount(np.concatenate(lists), minlength=count)
+            # Views must be gone before the lock is released, or appends can't resize the arrays
+            del lists
+            sizes = np.frombuffer(self.sizes, dtype=np.int32)
+            jaccard = overlap / (len(grams) + sizes - overlap)
+            del sizes
+            jaccard[np.frombuffer(self.alive, dtype=np.uint8) == 0] = 0
+
+            # Trigram Jaccard narrows the field; word-level matching orders the rest
+            shortlist = min(count, limit * RERANK_FACTOR)
+            candidates = np.argpartition(-jaccard, shortlist - 1)[:shortlist]
+            candidates = candidates[jaccard[candidates] > 0]
+            scored = []
+            distances = {}
+            for doc_id in candidates.tolist():
+                score = 0.5 * float(jaccard[doc_id]) + 0.5 * token_similarity(query_words, self.words[doc_id],
+                                                                              distances)
+                if score >= min_score:
+                    scored.append((score, doc_id))
+            scored.sort(key=lambda item: -item[0])
+            return [(self.doc_keys[doc_id], score) for score, doc_id in scored[:limit]]
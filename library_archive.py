@@ -0,0 +1,372 @@
+"""Streaming export and import of the saved library.
+
+    python library_archive.py export library.tar.gz
+    python library_archive.py import library.tar.gz
+
+The archive is an ordinary .tar.gz (tar xzf reads it), written as one gzip
+member per batch of articles. Each batch starts with its slice of the JSON
+lines manifest (name, SHA-256, size, modified time), so memory stays at one
+batch however large the library is, and a member boundary is a safe point
+to stop at: an interrupted export is truncated back to its last complete
+batch and continued, an interrupted import seeks straight past the batches
+it already finished. Batches are imported in parallel; articles whose
+content is already in the library are skipped, name clashes get a suffix.
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import gzip
+import hashlib
+import io
+import json
+import os
+import tarfile
+import threading
+import time
+import zlib
+
+FORMAT_VERSION = 1
+BATCH_FILES = 1000
+BATCH_BYTES = 4 * 1024 * 1024
+READ_SIZE = 1024 * 1024
+WORKERS = 4
+LIBRARY_PREFIX = "library/"
+MANIFEST_PREFIX = "manifest/"
+SETTINGS_FILE = "settings.json"
+HASH_CACHE_FILE = "library_hashes.json"
+
+
+def default_folder():
+    return os.path.join(os.path.expanduser("~"), "Documents", "NewsApp_Saved_Articles")
+
+
+def data_folder(folder, *parts):
+    path = os.path.join(folder, ".newsapp", *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def library_files(folder):
+    return sorted(name for name in os.listdir(folder) if name.endswith('.txt'))
+
+
+def write_json(path, value):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(value, f)
+    os.replace(tmp_path, path)
+
+
+def library_hashes(folder):
+    """{file name: SHA-256} for the library; unchanged files come from a cache keyed by size and mtime."""
+    cache_path = os.path.join(data_folder(folder), HASH_CACHE_FILE)
+    try:
+        with open(cache_path, encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    hashes = {}
+    fresh = {}
+    for name in library_files(folder):
+        try:
+            stat = os.stat(os.path.join(folder, name))
+        except OSError:
+            continue
+        entry = cache.get(name)
+        if entry is None or entry[0] != stat.st_size or entry[1] != stat.st_mtime_ns:
+            try:
+                with open(os.path.join(folder, name), 'rb') as f:
+                    entry = [stat.st_size, stat.st_mtime_ns, content_hash(f.read())]
+            except OSError:
+                continue
+        fresh[name] = entry
+        hashes[name] = entry[2]
+    if fresh != cache:
+        write_json(cache_path, fresh)
+    return hashes
+
+
+def tar_member(name, data, mtime):
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    info.mtime = mtime
+    info.mode = 0o644
+    return info.tobuf(format=tarfile.PAX_FORMAT) + data + b'\0' * (-len(data) % tarfile.BLOCKSIZE)
+
+
+def gzip_members(f, start=0):
+    # Yields (start offset, end offset, data) per gzip member, so a reader can resume at any member
+    f.seek(start)
+    position = start
+    pending = b''
+    decompressor = None
+    while True:
+        if not pending:
+            pending = f.read(READ_SIZE)
+            if not pending:
+                if decompressor is not None:
+                    raise ValueError("archive is truncated")
+                return
+        if decompressor is None:
+            decompressor = zlib.decompressobj(wbits=31)
+            member_start = position
+            chunks = []
+        chunks.append(decompressor.decompress(pending))
+        position += len(pending) - len(decompressor.unused_data)
+        pending = decompressor.unused_data
+        if decompressor.eof:
+            yield member_start, position, b''.join(chunks)
+            decompressor = None
+
+
+class LibraryExport:
+    """Writes the library to archive_path, resuming a .part file left by an interrupted run."""
+
+    def __init__(self, folder, archive_path, on_progress=None):
+        self.folder = folder
+        self.archive_path = archive_path
+        self.part_path = archive_path + ".part"
+        self.state_path = self.part_path + ".json"
+        self.on_progress = on_progress
+        self.cancelled = threading.Event()
+        self.state = {'version': FORMAT_VERSION, 'offset': 0, 'batches': 0, 'last': '', 'files': 0, 'bytes': 0}
+        self.total = 0
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def run(self):
+        """Returns the finished archive's path, or None when cancelled (run again to resume)."""
+        if os.path.exists(self.part_path) and os.path.exists(self.state_path):
+            with open(self.state_path, encoding='utf-8') as f:
+                self.state = json.load(f)
+        names = library_files(self.folder)
+        self.total = len(names)
+        # Names sort by save date, so continuing after the last exported name picks up new saves too
+        names = [name for name in names if name > self.state['last']]
+
+        with open(self.part_path, 'r+b' if self.state['offset'] else 'wb') as out:
+            out.truncate(self.state['offset'])  # Drop a batch that was half written
+            out.seek(self.state['offset'])
+            batch = []
+            size = 0
+            for name in names:
+                if self.cancelled.is_set():
+                    return None
+                path = os.path.join(self.folder, name)
+                try:
+                    with open(path, 'rb') as f:
+                        data = f.read()
+                    mtime = os.path.getmtime(path)
+                except OSError as e:
+                    print(f"Error exporting {name}: {e}")
+                    continue
+                batch.append((name, data, mtime))
+                size += len(data)
+                if len(batch) >= BATCH_FILES or size >= BATCH_BYTES:
+                    self._write_batch(out, batch)
+                    batch = []
+                    size = 0
+            if batch:
+                self._write_batch(out, batch)
+            self._write_trailer(out)
+
+        os.replace(self.part_path, self.archive_path)
+        os.remove(self.state_path)
+        return self.archive_path
+
+    def _write_batch(self, out, batch):
+        self.state['batches'] += 1
+        manifest = ''.join(json.dumps({'name': name, 'sha256': content_hash(data), 'size': len(data),
+                                       'mtime': mtime}, ensure_ascii=False) + '\n'
+                           for name, data, mtime in batch).encode('utf-8')
+        chunks = [tar_member(f"{MANIFEST_PREFIX}{self.state['batches']:06d}.jsonl", manifest, time.time())]
+        chunks += [tar_member(LIBRARY_PREFIX + name, data, mtime) for name, data, mtime in batch]
+        out.write(gzip.compress(b''.join(chunks), mtime=0))
+        out.flush()
+        os.fsync(out.fileno())
+
+        self.state['offset'] = out.tell()
+        self.state['last'] = batch[-1][0]
+        self.state['files'] += len(batch)
+        self.state['bytes'] += sum(len(data) for _, data, _ in batch)
+        write_json(self.state_path, self.state)
+        if self.on_progress:
+            self.on_progress(self)
+
+    def _write_trailer(self, out):
+        # Settings, a summary, and the two empty blocks that end a tar stream
+        chunks = []
+        settings_path = os.path.join(self.folder, SETTINGS_FILE)
+        if os.path.exists(settings_path):
+            with open(settings_path, 'rb') as f:
+                chunks.append(tar_member(SETTINGS_FILE, f.read(), os.path.getmtime(settings_path)))
+        summary = {'version': FORMAT_VERSION, 'created': time.time(), 'files': self.state['files'],
+                   'bytes': self.state['bytes'], 'batches': self.state['batches']}
+        chunks.append(tar_member(MANIFEST_PREFIX + "summary.json", json.dumps(summary).encode('utf-8'), time.time()))
+        chunks.append(b'\0' * (2 * tarfile.BLOCKSIZE))
+        out.write(gzip.compress(b''.join(chunks), mtime=0))
+        out.flush()
+        os.fsync(out.fileno())
+
+
+class LibraryImport:
+    """Imports an archive written by LibraryExport, batches in parallel, skipping content already saved."""
+
+    def __init__(self, folder, archive_path, on_progress=None, workers=WORKERS):
+        self.folder = folder
+        self.archive_path = archive_path
+        self.on_progress = on_progress
+        self.workers = workers
+        self.cancelled = threading.Event()
+        self.lock = threading.Lock()
+        stat = os.stat(archive_path)
+        key = hashlib.sha1(f"{os.path.abspath(archive_path)}|{stat.st_size}|{stat.st_mtime_ns}".encode()).hexdigest()
+        self.state_path = os.path.join(data_folder(folder, "imports"), f"library-{key[:16]}.json")
+        self.total_bytes = stat.st_size
+        self.state = {'offset': 0, 'imported': 0, 'duplicates': 0, 'renamed': 0}
+        self.known = set()
+        self.imported_paths = []
+
+    def cancel(self):
+        self.cancelled.set()
+
+    @property
+    def done_bytes(self):
+        return self.state['offset']
+
+    def run(self):
+        """Returns the state counts, or None when cancelled (run again to resume)."""
+        try:
+            with open(self.state_path, encoding='utf-8') as f:
+                self.state = json.load(f)
+        except (OSError, ValueError):
+            pass
+        self.known = set(library_hashes(self.folder).values())
+
+        # Batches finish out of order; the saved offset only moves past an unbroken run of finished ones
+        ends = {}
+        finished = set()
+        next_index = 0
+        slots = threading.Semaphore(self.workers * 2)  # Decompressed batches waiting in memory
+        errors = []
+
+        def done(index, future):
+            nonlocal next_index
+            slots.release()
+            error = future.exception()
+            with self.lock:
+                if error is not None:
+                    errors.append(error)
+                    return
+                finished.add(index)
+                advanced = False
+                while next_index in finished:
+                    self.state['offset'] = ends[next_index]
+                    finished.discard(next_index)
+                    next_index += 1
+                    advanced = True
+                if advanced:
+                    write_json(self.state_path, self.state)
+            if self.on_progress:
+                self.on_progress(self)
+
+        with open(self.archive_path, 'rb') as f, ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for index, (start, end, data) in enumerate(gzip_members(f, self.state['offset'])):
+                if self.cancelled.is_set() or errors:
+                    break
+                slots.acquire()
+                with self.lock:
+                    ends[index] = end
+                future = pool.submit(self._import_batch, data)
+                future.add_done_callback(lambda future, index=index: done(index, future))
+        if errors:
+            raise errors[0]
+        if self.cancelled.is_set():
+            return None
+        os.remove(self.state_path)
+        return self.state
+
+    def _import_batch(self, data):
+        manifest = {}
+        with tarfile.open(fileobj=io.BytesIO(data), mode='r:') as tar:
+            for member in tar:
+                if not member.isfile():
+                    continue
+                content = tar.extractfile(member).read()
+                if member.name.startswith(MANIFEST_PREFIX) and member.name.endswith('.jsonl'):
+                    for line in content.decode('utf-8').splitlines():
+                        entry = json.loads(line)
+                        manifest[entry['name']] = entry
+                elif member.name.startswith(LIBRARY_PREFIX):
+                    self._import_article(member, content, manifest)
+                elif member.name == SETTINGS_FILE:
+                    self._import_settings(content)
+
+    def _import_article(self, member, content, manifest):
+        name = os.path.basename(member.name[len(LIBRARY_PREFIX):])
+        digest = content_hash(content)
+        expected = manifest.get(name)
+        if expected is not None and expected['sha256'] != digest:
+            raise ValueError(f"{name} is corrupt in the archive")
+        mtime = expected['mtime'] if expected else member.mtime
+        with self.lock:
+            if digest in self.known:
+                self.state['duplicates'] += 1
+                return
+            self.known.add(digest)
+
+        # Written under a temporary name first, so an interrupted import never leaves a half article
+        tmp_path = os.path.join(self.folder, f".{name}.{threading.get_ident()}.part")
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.utime(tmp_path, (mtime, mtime))  # The Saved tab dates articles by modification time
+        stem = name[:-4]
+        with self.lock:
+            path = os.path.join(self.folder, name)
+            counter = 0
+            while os.path.exists(path):
+                counter += 1
+                path = os.path.join(self.folder, f"{stem}_{counter}.txt")
+            os.replace(tmp_path, path)
+            self.state['imported'] += 1
+            self.state['renamed'] += counter > 0
+            self.imported_paths.append(path)
+
+    def _import_settings(self, content):
+        # Local settings win; an archive's settings only seed a fresh library
+        path = os.path.join(self.folder, SETTINGS_FILE)
+        with self.lock:
+            if not os.path.exists(path):
+                with open(path, 'wb') as f:
+                    f.write(content)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export or import the News Explorer saved library")
+    parser.add_argument('command', choices=('export', 'import'))
+    parser.add_argument('archive', help="a .tar.gz archive")
+    parser.add_argument('--folder', default=default_folder(), help="saved library folder")
+    args = parser.parse_args()
+    os.makedirs(args.folder, exist_ok=True)
+
+    started = time.perf_counter()
+    if args.command == 'export':
+        job = LibraryExport(args.folder, args.archive,
+                            on_progress=lambda job: print(f"\r{job.state['files']}/{job.total} articles", end=''))
+        job.run()
+        print(f"\nExported {job.state['files']} articles ({os.path.getsize(args.archive) // 1024} KB) "
+              f"in {time.perf_counter() - started:.1f}s")
+    else:
+        job = LibraryImport(args.folder, args.archive,
+                            on_progress=lambda job: print(f"\r{job.done_bytes * 100 // max(1, job.total_bytes)}%", end=''))
+        state = job.run()
+        print(f"\nImported {state['imported']} articles ({state['duplicates']} already saved, "
+              f"{state['renamed']} renamed) in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,441 @@
+"""Delta sync of the saved library between machines.
+
+    python library_sync.py sync /mnt/shared/newsapp-hub
+    python library_sync.py serve /srv/newsapp-hub --port 8766
+    python library_sync.py sync http://hub-host:8766
+
+Machines sync through a hub: a shared directory, or the small HTTP server
+above standing in for a real service. The hub holds an append-only change
+log (one numbered entry per push, listing saved or deleted articles by
+content hash) and the article contents, stored once per SHA-256.
+
+Each machine remembers the hashes it last synced and the last log entry it
+has seen, so a sync reads only newer log entries, rehashes only files whose
+size or mtime changed, and sends only the changed articles, batched and
+gzip-compressed. Deletions made in the app are recorded as tombstones; a
+delete never removes a copy that was edited elsewhere in the meantime, and
+an article changed on both sides is kept twice rather than overwritten.
+"""
+import argparse
+import gzip
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import io
+import json
+import os
+import tarfile
+import threading
+import time
+from urllib.parse import urlparse, parse_qs
+import uuid
+import requests
+from library_archive import (content_hash, data_folder, default_folder, library_hashes, tar_member, write_json)
+
+STATE_FILE = "sync_state.json"
+TOMBSTONE_FILE = "sync_tombstones.jsonl"
+BATCH_BLOBS = 500     # Articles per upload or download request
+HTTP_TIMEOUT = 60
+
+
+def record_tombstone(folder, name):
+    """Note that the user deleted name; call before removing the file."""
+    try:
+        with open(os.path.join(folder, name), 'rb') as f:
+            digest = content_hash(f.read())
+    except OSError:
+        return
+    with open(os.path.join(data_folder(folder), TOMBSTONE_FILE), 'a', encoding='utf-8') as f:
+        f.write(json.dumps({'name': name, 'deleted': digest, 'time': time.time()}, ensure_ascii=False) + '\n')
+
+
+def pack_blobs(blobs):
+    # {sha256: content} as a gzip-compressed tar, one member per article
+    return gzip.compress(b''.join(tar_member(digest, data, 0) for digest, data in blobs.items()) +
+                         b'\0' * (2 * tarfile.BLOCKSIZE))
+
+
+def unpack_blobs(data):
+    blobs = {}
+    with tarfile.open(fileobj=io.BytesIO(gzip.decompress(data)), mode='r:') as tar:
+        for member in tar:
+            content = tar.extractfile(member).read()
+            if content_hash(content) != member.name:
+                raise ValueError(f"article {member.name} was corrupted in transfer")
+            blobs[member.name] = content
+    return blobs
+
+
+class DirectoryTransport:
+    """Hub in a shared directory: log/<seq>.json.gz per push, blobs/<sha[:2]>/<sha>.gz per article."""
+
+    def __init__(self, root):
+        self.root = root
+        self.log_folder = os.path.join(root, "log")
+        self.blob_folder = os.path.join(root, "blobs")
+        os.makedirs(self.log_folder, exist_ok=True)
+        os.makedirs(self.blob_folder, exist_ok=True)
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def _log_numbers(self):
+        return sorted(int(name[:-len('.json.gz')]) for name in os.listdir(self.log_folder)
+                      if name.endswith('.json.gz'))
+
+    def read_log(self, after):
+        """[(seq, entries)] for every push after seq `after`, oldest first."""
+        result = []
+        for seq in self._log_numbers():
+            if seq > after:
+                with open(os.path.join(self.log_folder, f"{seq:012d}.json.gz"), 'rb') as f:
+                    data = f.read()
+                self.bytes_received += len(data)
+                result.append((seq, json.loads(gzip.decompress(data))))
+        return result
+
+    def append_log(self, entries):
+        data = gzip.compress(json.dumps(entries, ensure_ascii=False).encode('utf-8'))
+        numbers = self._log_numbers()
+        seq = (numbers[-1] if numbers else 0) + 1
+        while True:
+            # Exclusive create claims the number even if another machine pushes at the same moment
+            try:
+                with open(os.path.join(self.log_folder, f"{seq:012d}.json.gz"), 'xb') as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                break
+            except FileExistsError:
+                seq += 1
+        self.bytes_sent += len(data)
+        return seq
+
+    def _blob_path(self, digest):
+        return os.path.join(self.blob_folder, digest[:2], digest + '.gz')
+
+    def missing_blobs(self, digests):
+        return [digest for digest in digests if not os.path.exists(self._blob_path(digest))]
+
+    def put_blobs(self, blobs):
+        for digest, content in blobs.items():
+            path = self._blob_path(digest)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            data = gzip.compress(content)
+            tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            self.bytes_sent += len(data)
+
+    def get_blobs(self, digests):
+        blobs = {}
+        for digest in digests:
+            with open(self._blob_path(digest), 'rb') as f:
+                data = f.read()
+            self.bytes_received += len(data)
+            blobs[digest] = gzip.decompress(data)
+        return blobs
+
+
+class HttpTransport:
+    """Hub behind SyncServer; blobs travel in batches as one compressed pack per request."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+        self.session = requests.Session()
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def _post(self, path, body, content_type='application/json'):
+        response = self.session.post(self.base_url + path, data=body, timeout=HTTP_TIMEOUT,
+                                     headers={'Content-Type': content_type})
+        response.raise_for_status()
+        self.bytes_sent += len(body)
+        self.bytes_received += len(response.content)
+        return response.content
+
+    def read_log(self, after):
+        response = self.session.get(f"{self.base_url}/log", params={'after': after}, timeout=HTTP_TIMEOUT)
+        response.raise_for_status()
+        self.bytes_received += len(response.content)
+        return [tuple(item) for item in json.loads(gzip.decompress(response.content))]
+
+    def append_log(self, entries):
+        body = gzip.compress(json.dumps(entries, ensure_ascii=False).encode('utf-8'))
+        return json.loads(self._post('/log', body, 'application/gzip'))['seq']
+
+    def missing_blobs(self, digests):
+        return json.loads(gzip.decompress(self._post('/blobs/missing', gzip.compress(json.dumps(digests).encode()),
+                                                     'application/gzip')))
+
+    def put_blobs(self, blobs):
+        self._post('/blobs', pack_blobs(blobs), 'application/gzip')
+
+    def get_blobs(self, digests):
+        return unpack_blobs(self._post('/blobs/fetch', gzip.compress(json.dumps(digests).encode()),
+                                       'application/gzip'))
+
+
+def open_transport(hub):
+    if hub.startswith(('http://', 'https://')):
+        return HttpTransport(hub)
+    return DirectoryTransport(hub)
+
+
+class SyncHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def send_body(self, status, body, content_type='application/gzip'):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != '/log':
+            return self.send_body(404, b'not found', 'text/plain')
+        after = int(parse_qs(url.query).get('after', ['0'])[0])
+        with self.server.lock:
+            log = self.server.hub.read_log(after)
+        self.send_body(200, gzip.compress(json.dumps(log, ensure_ascii=False).encode('utf-8')))
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        hub = self.server.hub
+        try:
+            with self.server.lock:
+                if self.path == '/log':
+                    seq = hub.append_log(json.loads(gzip.decompress(body)))
+                    return self.send_body(200, json.dumps({'seq': seq}).encode(), 'application/json')
+                if self.path == '/blobs/missing':
+                    missing = hub.missing_blobs(json.loads(gzip.decompress(body)))
+                    return self.send_body(200, gzip.compress(json.dumps(missing).encode()))
+                if self.path == '/blobs':
+                    hub.put_blobs(unpack_blobs(body))
+                    return self.send_body(200, b'{}', 'application/json')
+                if self.path == '/blobs/fetch':
+                    return self.send_body(200, pack_blobs(hub.get_blobs(json.loads(gzip.decompress(body)))))
+        except (ValueError, OSError, tarfile.TarError) as e:
+            return self.send_body(400, str(e).encode('utf-8'), 'text/plain')
+        self.send_body(404, b'not found', 'text/plain')
+
+
+class SyncServer(ThreadingHTTPServer):
+    """Local HTTP hub over a DirectoryTransport, standing in for a real sync service."""
+
+    daemon_threads = True
+
+    def __init__(self, root, port=0, host='127.0.0.1', verbose=False):
+        super().__init__((host, port), SyncHandler)
+        self.hub = DirectoryTransport(root)
+        self.lock = threading.Lock()
+        self.verbose = verbose
+
+    @property
+    def base_url(self):
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class LibrarySync:
+    """One sync of a library folder against a hub: pull others' changes, then push ours."""
+
+    def __init__(self, folder, transport):
+        self.folder = folder
+        self.transport = transport
+        self.state_path = os.path.join(data_folder(folder), STATE_FILE)
+        self.tombstone_path = os.path.join(data_folder(folder), TOMBSTONE_FILE)
+        self.counts = {'downloaded': 0, 'uploaded': 0, 'deleted_here': 0, 'deleted_there': 0, 'conflicts': 0}
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        # Stops between batches; nothing is recorded, and files already fetched are matched up next time
+        self.cancelled.set()
+
+    def load_state(self):
+        try:
+            with open(self.state_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            # The device id keeps a machine from replaying its own pushes
+            return {'device': uuid.uuid4().hex, 'hub_seq': 0, 'files': {}}
+
+    def load_tombstones(self):
+        tombstones = {}
+        try:
+            with open(self.tombstone_path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    tombstones[entry['name']] = entry
+        except OSError:
+            pass
+        return tombstones
+
+    def run(self):
+        """Returns the counts, or None when cancelled."""
+        started = time.perf_counter()
+        state = self.load_state()
+        synced = state['files']      # name -> hash as of the last sync
+        current = library_hashes(self.folder)
+        tombstones = self.load_tombstones()
+
+        self._pull(state, synced, current)
+        if self.cancelled.is_set():
+            return None
+        self._push(state, synced, current, tombstones)
+
+        state['files'] = current
+        write_json(self.state_path, state)
+        if tombstones:
+            os.remove(self.tombstone_path)
+        library_hashes(self.folder)  # Record downloaded files in the hash cache
+        self.counts['seconds'] = round(time.perf_counter() - started, 2)
+        self.counts['bytes_sent'] = self.transport.bytes_sent
+        self.counts['bytes_received'] = self.transport.bytes_received
+        return self.counts
+
+    def _pull(self, state, synced, current):
+        latest = {}
+        for seq, entries in self.transport.read_log(state['hub_seq']):
+            for entry in entries:
+                if entry['device'] != state['device']:
+                    latest[entry['name']] = entry
+            # Only log entries actually read are skipped next time; pushes that land meanwhile are not
+            state['hub_seq'] = seq
+
+        downloads = {}
+        for name, entry in latest.items():
+            local = current.get(name)
+            changed_here = local != synced.get(name)
+            if entry['sha256'] is None:
+                if local is None:
+                    synced.pop(name, None)
+                elif local == entry['deleted']:
+                    self._delete(name)
+                    current.pop(name)
+                    synced.pop(name, None)
+                    self.counts['deleted_here'] += 1
+                else:
+                    # Edited here after the other machine's copy was deleted: keep it and send it back
+                    synced.pop(name, None)
+                    self.counts['conflicts'] += 1
+            elif local == entry['sha256']:
+                synced[name] = local
+            elif local is None or not changed_here:
+                downloads[name] = entry
+            else:
+                # Changed on both sides: keep ours and add theirs next to it
+                downloads[self._free_name(name, current)] = entry
+                self.counts['conflicts'] += 1
+
+        items = list(downloads.items())
+        for start in range(0, len(items), BATCH_BLOBS):
+            if self.cancelled.is_set():
+                return
+            batch = items[start:start + BATCH_BLOBS]
+            blobs = self.transport.get_blobs(sorted({entry['sha256'] for _, entry in batch}))
+            for name, entry in batch:
+                self._write(name, blobs[entry['sha256']], entry['mtime'])
+                current[name] = entry['sha256']
+                if name in latest:
+                    synced[name] = entry['sha256']
+                self.counts['downloaded'] += 1
+
+    def _push(self, state, synced, current, tombstones):
+        now = time.time()
+        entries = []
+        for name, digest in current.items():
+            if synced.get(name) != digest:
+                entries.append({'name': name, 'sha256': digest, 'device': state['device'], 'time': now,
+                                'mtime': os.path.getmtime(os.path.join(self.folder, name))})
+        deleted = {name: base for name, base in synced.items() if name not in current}
+        for name, tombstone in tombstones.items():
+            if name not in current:
+                deleted.setdefault(name, tombstone['deleted'])
+        for name, base in deleted.items():
+            entries.append({'name': name, 'sha256': None, 'deleted': base, 'device': state['device'], 'time': now})
+        if not entries:
+            return
+
+        needed = sorted({entry['sha256'] for entry in entries if entry['sha256']})
+        by_hash = {entry['sha256']: entry['name'] for entry in entries if entry['sha256']}
+        for start in range(0, len(needed), BATCH_BLOBS):
+            missing = self.transport.missing_blobs(needed[start:start + BATCH_BLOBS])
+            if not missing:
+                continue
+            blobs = {}
+            for digest in missing:
+                with open(os.path.join(self.folder, by_hash[digest]), 'rb') as f:
+                    blobs[digest] = f.read()
+            self.transport.put_blobs(blobs)
+
+        # Contents go up before the log entry that refers to them
+        seq = self.transport.append_log(entries)
+        if seq == state['hub_seq'] + 1:
+            state['hub_seq'] = seq  # Nobody pushed in between, so there is nothing to read back
+        self.counts['uploaded'] += sum(1 for entry in entries if entry['sha256'])
+        self.counts['deleted_there'] += len(deleted)
+
+    def _free_name(self, name, current):
+        stem = name[:-4]
+        counter = 1
+        while f"{stem}_{counter}.txt" in current or os.path.exists(os.path.join(self.folder, f"{stem}_{counter}.txt")):
+            counter += 1
+        return f"{stem}_{counter}.txt"
+
+    def _write(self, name, content, mtime):
+        path = os.path.join(self.folder, name)
+        tmp_path = os.path.join(self.folder, f".{name}.sync")
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.utime(tmp_path, (mtime, mtime))  # The Saved tab dates articles by modification time
+        os.replace(tmp_path, path)
+
+    def _delete(self, name):
+        try:
+            os.remove(os.path.join(self.folder, name))
+        except FileNotFoundError:
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync the News Explorer saved library through a hub")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    sync = subparsers.add_parser('sync', help="sync the library with a hub")
+    sync.add_argument('hub', help="shared directory or http:// URL of a sync server")
+    sync.add_argument('--folder', default=default_folder(), help="saved library folder")
+    serve = subparsers.add_parser('serve', help="run the HTTP hub")
+    serve.add_argument('root', help="directory the hub keeps its log and articles in")
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8766)
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        server = SyncServer(args.root, args.port, args.host, verbose=True)
+        print(f"Serving sync hub on {server.base_url}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return
+
+    os.makedirs(args.folder, exist_ok=True)
+    counts = LibrarySync(args.folder, open_transport(args.hub)).run()
+    print(f"Downloaded {counts['downloaded']}, uploaded {counts['uploaded']}, deleted {counts['deleted_here']} "
+          f"here and {counts['deleted_there']} on the hub, {counts['conflicts']} conflicts; "
+          f"{counts['bytes_sent'] // 1024} KB sent, {counts['bytes_received'] // 1024} KB received "
+          f"in {counts['seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import bisect
+import threading
+
+# Millisecond bucket bounds shared by every latency histogram
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 16, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class Histogram:
+    def __init__(self, bounds=LATENCY_BUCKETS_MS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def percentile(self, fraction):
+        # Upper bound of the bucket holding the given fraction of samples
+        if not self.total:
+            return 0.0
+        target = fraction * self.total
+        running = 0
+        for bound, count in zip(self.bounds, self.counts):
+            running += count
+            if running >= target:
+                return float(bound)
+        return self.max
+
+    def summary(self):
+        mean = self.sum / self.total if self.total else 0.0
+        return (f"n={self.total} mean={mean:.1f} p50≤{self.percentile(0.5):g} "
+                f"p95≤{self.percentile(0.95):g} max={self.max:.1f}")
+
+
+class Metrics:
+    """Thread-safe counters, gauges and histograms shown in the Stats tab."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+
+    def incr(self, name, amount=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def gauge(self, name, read):
+        # Gauges are read lazily through a callable when a snapshot is taken
+        with self.lock:
+            self.gauges[name] = read
+
+    def observe(self, name, value, bounds=LATENCY_BUCKETS_MS):
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram(bounds)
+            histogram.observe(value)
+
+    def buckets(self, name):
+        # [(upper bound, count)] of one histogram, None bounding the overflow bucket
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                return []
+            return list(zip((*histogram.bounds, None), histogram.counts))
+
+    def ratio(self, hits, misses):
+        with self.lock:
+            hit = self.counters.get(hits, 0)
+            total = hit + self.counters.get(misses, 0)
+        return hit / total if total else 0.0
+
+    def snapshot(self):
+        with self.lock:
+            counters = dict(self.counters)
+            gauges = dict(self.gauges)
+            histograms = {name: h.summary() for name, h in self.histograms.items()}
+        values = {}
+        for name, read in gauges.items():
+            try:
+                values[name] = read()
+            except Exception as e:
+                values[name] = f"error: {e}"
+        return {'counters': counters, 'gauges': values, 'histograms': histograms}
@@ -1,21 +1,105 @@
+import sys
+import single_instance
+
+# A second launch hands its command to the running window and exits before the heavy imports
+if __name__ == "__main__" and single_instance.forward(single_instance.parse_command(sys.argv[1:])):
+    sys.exit(0)
+
 from newsapi import NewsApiClient
 import tkinter as tk
-from tkinter import ttk, scrolledtext, messagebox
+from tkinter import ttk, scrolledtext, messagebox, filedialog
 from datetime import datetime, timedelta, timezone
 import webbrowser
 from PIL import Image, ImageTk
-import requests
 from io import BytesIO
 import threading
+import time
 from ttkthemes import ThemedStyle
 import os
 from pathlib import Path
 import json
+import gzip
 import tempfile
+from query_engine import ArticleQueryEngine, article_key
+from news_sources import NewsApiSource, FeedCollection, RebasedSession
+from clustering import StoryClusterer
+from trending import TermTrendStore
+from metrics import Metrics
+from prefetch import LruCache, NeighbourPrefetcher
+from thumbstore import ThumbnailStore
+from progressive import BandwidthEstimator, stream_image
+from ranking import PersonalRanker
+from summarizer import Summarizer
+from entities import EntityIndex, KIND_LABELS
+from archive import ArticleArchive, parse_day_label
+from dispatcher import UiDispatcher
+from virtual_list import VirtualTreeview
+from fuzzy import TrigramIndex
+from profiler import SamplingProfiler
+from session_replay import SessionRecorder
+from bulk_import import ImportJob, read_url_list, normalize_url
+from watchlist import Watchlist
+from library_archive import LibraryExport, LibraryImport
+from library_sync import LibrarySync, open_transport, record_tombstone
+from stall_watchdog import StallWatchdog
 try:
     from config import API_KEY
 except ImportError:
     API_KEY = ''  # or prompt user to enter key
+try:
+    from config import FEEDS
+except ImportError:
+    FEEDS = []  # RSS/Atom feed URLs shown under "📡 Feeds"
+try:
+    from config import API_BASE_URL
+except ImportError:
+    API_BASE_URL = None  # e.g. the local fixture server for soak runs
+try:
+    from config import SYNC_HUB
+except ImportError:
+    SYNC_HUB = None  # Shared folder or library_sync.py server URL; otherwise chosen on first sync
+
+SEARCH_PLACEHOLDER = "Search news..."
+SESSION_FILE = "session.json.gz"
+SESSION_VERSION = 1
+SESSION_SNAPSHOT_INTERVAL_MS = 60000
+DATA_FOLDER = ".newsapp"  # Local indexes and caches inside the save folder
+TRENDING_WINDOWS = {"24 hours": 24, "7 days": 7 * 24}
+IMAGE_CACHE_BYTES = 64 * 1024 * 1024
+THUMBNAIL_STORE_BYTES = 256 * 1024 * 1024
+CARD_THUMB_SIZE = (200, 120)
+PREVIEW_THUMB_SIZE = (750, 400)
+RELATED_PREFETCH_DISTANCE = 1  # Related lookups spend API quota, so only the nearest rows
+STATS_REFRESH_MS = 1000
+STALL_LOG_FILE = "stalls.log"  # Rotating log of event-loop stalls and the stacks behind them
+STALL_BAR_WIDTH = 40
+RELATED_SETTLE_MS = 300  # Related lookups wait until the selection stops moving
+SAVED_SOURCE_CACHE_ITEMS = 5000
+SAVED_HEADER_CHARS = 4096  # Enough of a saved file to reach its source line
+SAVED_FUZZY_LIMIT = 200
+PROFILE_FOLDER = "Profiles"  # Inside the save folder, where users can find captures to attach
+SESSION_FOLDER = "Sessions"  # Recorded sessions for session_replay.py
+IMPORT_FOLDER = "imports"  # Bulk import job logs, kept until the job finishes
+UI_POLL_WHEN_IDLE = False  # Set by headless drivers that pump root.update() instead of mainloop
+
+# Sort option -> (local sort key, NewsAPI sortBy)
+SORT_OPTIONS = {
+    "Newest": ('published', 'publishedAt'),
+    "Relevance": ('relevance', 'relevancy'),
+    "Popular": ('rank', 'popularity'),
+    "For you": ('personal', None)
+}
+MAX_SKIPS_PER_OPEN = 3  # Rows passed over above an opened article that count as skips
+MIN_READ_SECONDS = 1.0  # Shorter selections are keyboard navigation, not reads
+ALL_SOURCES = "All sources"
+ALL_ENTITIES = "All"
+ARCHIVE_LIVE = "Live"
+ALL_AUTHORS = "All authors"
+ANY_TIME = "Any time"
+DATE_RANGES = {
+    "Past 24 hours": 86400,
+    "Past 7 days": 7 * 86400
+}
 
 class NewsApp:
     def __init__(self, root):
@@ -27,13 +111,85 @@ class NewsApp:
         self.font_size_var = tk.StringVar(value="11")
         self.current_font_size = 11
         
+        # Every article loaded this session, for local sorting and filtering
+        self.query_engine = ArticleQueryEngine()
+        self.story_clusterer = StoryClusterer()
+        self.entity_index = EntityIndex()
+        
+        # Typo-tolerant title + source lookup over loaded results and the saved library
+        self.title_index = TrigramIndex()
+        self.saved_index = TrigramIndex()
+        self.saved_index_ready = False
+        
+        # Every fetched article, kept on disk for offline browsing by date
+        self.archive = ArticleArchive(self.get_data_folder('archive'))
+        self.trend_store = TermTrendStore.load(self.get_data_folder())
+        # Keyword rules checked against every fetched batch
+        self.watchlist = Watchlist.load(self.get_data_folder())
+        
+        # Local reading activity and the model trained on it; loaded on first use
+        self.ranker = PersonalRanker(self.get_data_folder())
+        self.reading = None
+        self.opened_urls = set()
+        
+        # Extractive summaries, computed a page at a time off the UI thread
+        self.summarizer = Summarizer()
+        self.detail_article = None
+        self.card_summary_labels = {}
+        self.tooltip_row = None
+        
+        # Caches warmed by the neighbour prefetcher
+        self.metrics = Metrics()
+        # Sampling profiler toggled with Ctrl-Shift-P; user actions are recorded as spans
+        self.profiler = SamplingProfiler(on_truncated=lambda: self.ui.post(self.save_profile))
+        # High-level user actions, recorded with Ctrl-Shift-R for session_replay.py
+        self.recorder = SessionRecorder()
+        self.import_job = None
+        self.library_job = None
+        
+        # Worker threads hand UI updates to the Tk thread through one budgeted queue
+        self.ui = UiDispatcher(self.root, self.metrics, poll_when_idle=UI_POLL_WHEN_IDLE)
+        # Logs what the Tk thread was doing whenever the event loop blocks past 100 ms
+        self.watchdog = StallWatchdog(self.root, os.path.join(self.get_data_folder(), STALL_LOG_FILE), self.metrics)
+        self.watchdog.start()
+        self.image_cache = LruCache(max_items=500, max_bytes=IMAGE_CACHE_BYTES)
+        self.related_cache = LruCache(max_items=200)
+        self.thumbnail_store = ThumbnailStore(self.get_data_folder('thumbnails'), THUMBNAIL_STORE_BYTES)
+        
+        # Download throughput; below a threshold new thumbnails are skipped (lite mode)
+        self.bandwidth = BandwidthEstimator()
+        self.lite_skipped = set()
+        
+        # Selection bursts are coalesced: one detail render per frame, related lookups once settled
+        self.pending_render = None
+        self.select_started = None
+        self.related_after = None
+        self.related_generation = 0
+        # Searches and headline fetches run on a worker; a newer fetch makes older results stale
+        self.fetch_generation = 0
+        self.fetching = False
+        # sortBy the shown search results were fetched with; ranks are only comparable within one
+        self.search_sort_by = None
+        self.prefetcher = NeighbourPrefetcher({
+            'image': (self.prefetch_image, None, False),
+            'related': (self.prefetch_related, RELATED_PREFETCH_DISTANCE, True)
+        }, self.metrics)
+        
         # Configure style
         self.configure_styles()
         
         # Initialize News API
         if not API_KEY:
             self.show_api_key_dialog()
-        self.newsapi = NewsApiClient(api_key=API_KEY)
+        self.newsapi = NewsApiClient(api_key=API_KEY,
+                                     session=RebasedSession(API_BASE_URL) if API_BASE_URL else None)
+        
+        # Pluggable article sources; searches and headlines go to the active one
+        self.sources = {
+            'newsapi': NewsApiSource(self.newsapi),
+            'feeds': FeedCollection(FEEDS)
+        }
+        self.active_source = 'newsapi'
         
         # Create status bar first (moved up)
         self.create_status_bar()
@@ -48,16 +204,26 @@ class NewsApp:
         # Create GUI elements
         self.create_header()
         self.create_search_frame()
+        self.create_toolbar()
         self.create_results_area()
         
         # Initialize page counter
         self.current_page = 1
         
-        # Default view - show top headlines
-        self.show_top_headlines()
+        # Restore the last session instantly, otherwise show top headlines
+        if not self.restore_session():
+            self.show_top_headlines()
         
         # Load settings
+        self.sync_hub = SYNC_HUB
         self.load_settings()
+        
+        # Later launches forward their commands here once start_instance_server is called
+        self.instance_server = None
+        
+        # Snapshot the session periodically and on exit
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.after(SESSION_SNAPSHOT_INTERVAL_MS, self.snapshot_session_periodically)
 
     def configure_styles(self):
         style = ThemedStyle(self.root)
@@ -139,6 +305,8 @@ class NewsApp:
         self.root.bind('<Control-Left>', lambda e: self.previous_page())
         self.root.bind('<Control-Right>', lambda e: self.next_page())
         self.root.bind('<Control-l>', lambda e: self.clear_search())
+        self.root.bind('<Control-P>', lambda e: self.toggle_profiler())
+        self.root.bind('<Control-R>', lambda e: self.toggle_recording())
 
     def focus_search(self):
         search_entry = self.root.focus_get()
@@ -192,11 +360,12 @@ class NewsApp:
                                textvariable=self.search_var,
                                font=('Helvetica', 11),
                                width=50)
-        search_entry.insert(0, "Search news...")
+        search_entry.insert(0, SEARCH_PLACEHOLDER)
         search_entry.bind('<FocusIn>', lambda e: self.on_entry_click(search_entry))
         search_entry.bind('<FocusOut>', lambda e: self.on_focus_out(search_entry))
-        search_entry.bind('<Return>', lambda e: self.search_news())
+        search_entry.bind('<Return>', lambda e: self.submit_search())
         search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.search_entry = search_entry
 
         # Add search suggestions
         self.suggestion_frame = ttk.Frame(search_container)
@@ -209,8 +378,9 @@ class NewsApp:
         button_frame = ttk.Frame(search_frame, style='Surface.TFrame')
         button_frame.pack(side=tk.RIGHT, padx=5, pady=5)
 
-        self.create_action_button(button_frame, "🔍 Search", self.search_news)
-        self.create_action_button(button_frame, "📰 Headlines", self.show_top_headlines)
+        self.create_action_button(button_frame, "🔍 Search", self.submit_search)
+        self.create_action_button(button_frame, "📰 Headlines", lambda: self.select_source('newsapi'))
+        self.create_action_button(button_frame, "📡 Feeds", lambda: self.select_source('feeds'))
         self.create_action_button(button_frame, "⌫ Clear", self.clear_search)
         ttk.Separator(button_frame, orient=tk.VERTICAL).pack(side=tk.LEFT, padx=5, fill=tk.Y)
         self.create_action_button(button_frame, "◀", self.previous_page)
@@ -229,18 +399,53 @@ class NewsApp:
         # List frame with better organization
         list_frame = ttk.Frame(self.paned_window, style='Surface.TFrame')
         self.paned_window.add(list_frame, weight=1)
+        self.list_frame = list_frame
 
         # Add category filter
         filter_frame = ttk.Frame(list_frame, style='Surface.TFrame')
         filter_frame.pack(fill=tk.X, padx=5, pady=5)
         
         ttk.Label(filter_frame, text="Sort by:").pack(side=tk.LEFT)
-        sort_options = ["Newest", "Relevance", "Popular"]
+        sort_options = list(SORT_OPTIONS)
         self.sort_var = tk.StringVar(value=sort_options[0])
         sort_combo = ttk.Combobox(filter_frame, textvariable=self.sort_var, 
                                  values=sort_options, state="readonly", width=15)
         sort_combo.pack(side=tk.LEFT, padx=5)
-        sort_combo.bind('<<ComboboxSelected>>', lambda e: self.refresh_news())
+        sort_combo.bind('<<ComboboxSelected>>', lambda e: self.on_sort_change())
+        
+        # Local filters with facet counts over the loaded articles
+        self.source_filter_var = tk.StringVar(value=ALL_SOURCES)
+        self.source_combo = ttk.Combobox(filter_frame, textvariable=self.source_filter_var,
+                                         values=[ALL_SOURCES], state="readonly", width=18)
+        self.source_combo.pack(side=tk.LEFT, padx=5)
+        self.source_combo.bind('<<ComboboxSelected>>', lambda e: self.show_local_results())
+        
+        self.author_filter_var = tk.StringVar(value=ALL_AUTHORS)
+        self.author_combo = ttk.Combobox(filter_frame, textvariable=self.author_filter_var,
+                                         values=[ALL_AUTHORS], state="readonly", width=18)
+        self.author_combo.pack(side=tk.LEFT, padx=5)
+        self.author_combo.bind('<<ComboboxSelected>>', lambda e: self.show_local_results())
+        
+        self.date_filter_var = tk.StringVar(value=ANY_TIME)
+        self.date_combo = ttk.Combobox(filter_frame, textvariable=self.date_filter_var,
+                                       values=[ANY_TIME, *DATE_RANGES], state="readonly", width=16)
+        self.date_combo.pack(side=tk.LEFT, padx=5)
+        self.date_combo.bind('<<ComboboxSelected>>', lambda e: self.show_local_results())
+        self.facet_labels = {}
+        
+        # Browse the archive as of a past day instead of the live results
+        ttk.Label(filter_frame, text="🗄️").pack(side=tk.LEFT, padx=(5, 0))
+        self.archive_var = tk.StringVar(value=ARCHIVE_LIVE)
+        self.archive_combo = ttk.Combobox(filter_frame, textvariable=self.archive_var,
+                                          values=[ARCHIVE_LIVE], state="readonly", width=12,
+                                          postcommand=lambda: self.archive_combo.configure(
+                                              values=[ARCHIVE_LIVE, *self.archive.days()]))
+        self.archive_combo.pack(side=tk.LEFT, padx=5)
+        self.archive_combo.bind('<<ComboboxSelected>>', lambda e: self.show_local_results())
+        
+        self.group_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(filter_frame, text="Group stories", variable=self.group_var,
+                        command=self.toggle_story_groups).pack(side=tk.LEFT, padx=5)
 
         # Enhanced article list
         self.article_list = ttk.Treeview(list_frame, 
@@ -256,15 +461,21 @@ class NewsApp:
         self.article_list.column("title", width=400, anchor=tk.W)
         self.article_list.column("source", width=100, anchor=tk.W)
         self.article_list.column("published", width=150, anchor=tk.W)
+        self.article_list.column("#0", width=30, stretch=False)
         
         self.article_list.pack(fill=tk.BOTH, expand=True, padx=5)
-        self.article_list.bind('<<TreeviewSelect>>', self.on_article_select)
+        self.article_list.tag_configure('odd', background='#f5f5f5')
+        self.article_list.bind('<Motion>', self.on_article_list_motion)
+        self.article_list.bind('<Leave>', lambda e: self.hide_tooltip())
 
         # Add scrollbar to article list
         list_scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, 
                                      command=self.article_list.yview)
         list_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.article_list.configure(yscrollcommand=list_scrollbar.set)
+        self.list_scrollbar = list_scrollbar
+        
+        # Only the rows around the viewport exist in the tree; the rest come from current_articles
+        self.article_view = VirtualTreeview(self.article_list, list_scrollbar, on_select=self.on_article_select)
 
         # Create detail frame with improved styling
         detail_frame = ttk.Frame(self.paned_window, style='Surface.TFrame')
@@ -335,6 +546,19 @@ class NewsApp:
         # Add saved articles tab
         self.create_saved_articles_frame()
         
+        # Trending terms tab
+        self.create_trending_frame()
+        
+        # People, organizations and places in everything loaded so far
+        self.create_entities_frame()
+        
+        # Watchlist rules and the alerts they raised
+        self.create_alerts_frame()
+        self.detail_notebook.bind('<<NotebookTabChanged>>', lambda e: self.refresh_tabs_if_visible())
+        
+        # Instrumentation tab
+        self.create_stats_frame()
+        
         # Set default font size
         self.current_font_size = 11
 
@@ -344,16 +568,26 @@ class NewsApp:
         self.detail_text.configure(font=('Helvetica', self.current_font_size))
         self.save_settings()
 
+    def get_selected_index(self):
+        # Story parent rows in grouped mode are not articles
+        return self.article_view.selected_index()
+
+    def get_selected_article(self):
+        index = self.get_selected_index()
+        if index is None or index >= len(self.current_articles):
+            return None
+        return self.current_articles[index]
+
     def share_article(self):
-        selection = self.article_list.selection()
-        if not selection:
+        article = self.get_selected_article()
+        if not article:
             return
 
-        article_index = int(selection[0])
-        article = self.current_articles[article_index]
         url = article.get('url', '')
         
         if url:
+            self.record_activity('share', article)
+            
             # Copy to clipboard
             self.root.clipboard_clear()
             self.root.clipboard_append(url)
@@ -379,15 +613,19 @@ class NewsApp:
         self.loading_label.pack(side=tk.LEFT, padx=5)
 
     def on_entry_click(self, entry):
-        if entry.get() == "Search news...":
+        if entry.get() == SEARCH_PLACEHOLDER:
             entry.delete(0, tk.END)
             entry.config(foreground='black')
 
     def on_focus_out(self, entry):
         if entry.get() == "":
-            entry.insert(0, "Search news...")
+            entry.insert(0, SEARCH_PLACEHOLDER)
             entry.config(foreground='grey')
 
+    def submit_search(self):
+        self.recorder.record('search', query=self.current_query(), page=self.current_page)
+        self.search_news()
+
     def search_news(self):
         query = self.search_var.get().strip()
         if not query:
@@ -395,55 +633,90 @@ class NewsApp:
             return
 
         self.show_loading("Searching news...")
-        
-        try:
-            params = {
-                'q': query,
-                'language': 'en',
-                'page': self.current_page,
-                'page_size': 20  # Fixed page size
-            }
-
-            articles = self.newsapi.get_everything(**params)
-            self.total_results = articles.get('totalResults', 0)
-            self.display_articles(articles['articles'])
-
-        except Exception as e:
-            self.show_error(f"Error searching news: {str(e)}")
-        finally:
-            self.hide_loading()
+        source = self.sources[self.active_source]
+        page = self.current_page
+        sort_by = SORT_OPTIONS[self.sort_var.get()][1]
+        scope = self.search_scope(self.active_source, query, sort_by)
+        
+        def show(articles, total):
+            self.total_results = total
+            self.search_sort_by = scope[3]
+            self.ingest_articles(articles, scope, (page - 1) * 20)
+            if not articles and self.show_loaded_matches(query):
+                return
+            self.reset_local_filters()
+            self.display_articles(self.rank_if_personal(articles))
+        
+        def failed(e):
+            if not self.show_loaded_matches(query):
+                self.show_error(f"Error searching news: {str(e)}")
+        
+        self.run_fetch('search', lambda: source.search(query, page=page,
+                                                       page_size=20,  # Fixed page size
+                                                       sort_by=sort_by), show, failed)
 
     def show_top_headlines(self):
         self.show_loading("Fetching headlines...")
-        try:
-            params = {
-                'country': 'us',
-                'language': 'en',
-                'page': self.current_page,
-                'page_size': 20
-            }
-            
-            # Add category if selected
-            if hasattr(self, 'current_category') and self.current_category:
-                params['category'] = self.current_category
-            
-            headlines = self.newsapi.get_top_headlines(**params)
-            self.total_results = headlines.get('totalResults', 0)
-            self.display_articles(headlines['articles'])
+        # Add category if selected
+        category = getattr(self, 'current_category', None)
+        source = self.sources[self.active_source]
+        source_name = self.active_source
+        page = self.current_page
+        
+        def show(headlines, total):
+            self.total_results = total
+            self.ingest_articles(headlines, (source_name, 'headlines', category), (page - 1) * 20)
+            self.reset_local_filters()
+            self.display_articles(self.rank_if_personal(headlines))
             
             # Update category label
-            category = self.current_category.title() if hasattr(self, 'current_category') and self.current_category else "All"
-            self.loading_var.set(f"📰 {category} News - Showing {len(headlines['articles'])} articles")
-            
-        except Exception as e:
+            if source_name == 'feeds':
+                self.loading_var.set(f"📡 Feeds - {self.describe_feed_poll()}")
+            else:
+                label = category.title() if category else "All"
+                self.loading_var.set(f"📰 {label} News - Showing {len(headlines)} articles")
+        
+        def failed(e):
             self.show_error(f"Error fetching headlines: {str(e)}")
-        finally:
-            self.hide_loading()
+        
+        self.run_fetch('headlines', lambda: source.top_headlines(category, page=page, page_size=20), show, failed)
+
+    def run_fetch(self, action, fetch, on_result, on_error):
+        # Sources block on the network (a feed collection polls every feed), so fetch off the Tk thread
+        self.fetch_generation += 1
+        generation = self.fetch_generation
+        self.fetching = True
+        span = self.profiler.begin(action)
+        
+        def finish(callback):
+            self.profiler.end(span)
+            if generation != self.fetch_generation:
+                return  # The user has started another search or page flip since
+            self.fetching = False
+            try:
+                callback()
+            finally:
+                self.hide_loading()
+        
+        def work():
+            try:
+                articles, total = fetch()
+            except Exception as e:
+                error = e  # e itself is cleared when the except block ends
+                self.ui.post(lambda: finish(lambda: on_error(error)))
+                return
+            self.ui.post(lambda: finish(lambda: on_result(articles, total)))
+        
+        threading.Thread(target=work, daemon=True).start()
 
     def display_articles(self, articles):
+        # Queued prefetches and related lookups belong to the old list
+        self.prefetcher.cancel()
+        self.cancel_related_lookup()
+        self.hide_tooltip()
+        
         # Clear existing items
-        for item in self.article_list.get_children():
-            self.article_list.delete(item)
+        self.article_view.set_model(0, None)
         
         if not articles:
             self.show_error("No articles found.")
@@ -458,51 +731,125 @@ class NewsApp:
 
         # Store articles for detail view
         self.current_articles = articles
+        self.request_summaries(articles)
 
         # Get current time in UTC
         now = datetime.now(timezone.utc)
 
-        # Enhanced article display with categories and formatting
-        for i, article in enumerate(articles):
-            title = article.get('title', 'No title')
-            source = article.get('source', {}).get('name', 'Unknown source')
-            published = article.get('publishedAt', '')
-            dt = None
+        if self.is_card_view():
+            self.show_card_view()
+
+        # Rows are formatted as they scroll into view
+        self.article_view.set_model(len(articles), lambda i: self.article_row(articles, i, now))
+        
+        if self.group_var.get():
+            # Clustering runs on the clusterer's worker; the flat list stands in until it is done
+            self.story_clusterer.submit_grouping(articles, lambda stories: self.ui.post(
+                lambda: self.display_story_groups(articles, stories, now), key='stories'))
+
+    def article_row(self, articles, i, now):
+        # Alternate row colors
+        return self.format_article_row(articles[i], now), ('odd',) if i % 2 else ()
+
+    def display_story_groups(self, articles, stories, now):
+        if articles is not getattr(self, 'current_articles', None) or not self.group_var.get():
+            return  # The list or the grouping toggle changed while clustering ran
+        index = self.get_selected_index()
+        # Story groups are nested, so the tree is filled directly
+        self.article_view.pause()
+        # One collapsible parent per story, headed by its most central headline
+        for cluster, indices, lead in stories:
+            if cluster is None or len(indices) == 1:
+                i = indices[0]
+                self.article_list.insert('', 'end', values=self.format_article_row(articles[i], now), iid=i)
+                continue
             
-            # Format date
-            if published:
-                try:
-                    # Parse the ISO format date and make it timezone-aware
-                    dt = datetime.fromisoformat(published.replace('Z', '+00:00'))
-                    published = dt.strftime('%b %d, %Y %H:%M')
-                except:
-                    pass
-                
-            # Add visual indicators for article age
-            if dt and (now - dt).total_seconds() < 86400:  # 24 hours in seconds
-                title = "🆕 " + title
-                
-            self.article_list.insert('', 'end', values=(title, source, published), iid=i)
+            title, _, published = self.format_article_row(articles[lead], now)
+            sources = {articles[i].get('source', {}).get('name') for i in indices}
             
-            # Alternate row colors
-            if i % 2:
-                self.article_list.tag_configure(i, background='#f5f5f5')
+            parent = self.article_list.insert('', 'end', iid=f"story-{cluster}", open=False,
+                                              values=(f"📚 {title}", f"{len(sources)} sources", published))
+            for i in indices:
+                self.article_list.insert(parent, 'end', values=self.format_article_row(articles[i], now), iid=i)
+        if index is not None:
+            self.article_view.select(index)
+
+    def toggle_story_groups(self):
+        self.recorder.record('groups', grouped=self.group_var.get())
+        self.article_list.configure(show="tree headings" if self.group_var.get() else "headings")
+        if getattr(self, 'current_articles', None):
+            index = self.get_selected_index()
+            self.display_articles(self.current_articles)
+            if index is not None:
+                self.article_view.select(index)
+
+    def format_article_row(self, article, now):
+        title = article.get('title', 'No title')
+        source = article.get('source', {}).get('name', 'Unknown source')
+        published = article.get('publishedAt', '')
+        dt = None
+        
+        # Format date
+        if published:
+            try:
+                # Parse the ISO format date and make it timezone-aware
+                dt = datetime.fromisoformat(published.replace('Z', '+00:00'))
+                published = dt.strftime('%b %d, %Y %H:%M')
+            except:
+                pass
+            
+        # Add visual indicators for article age
+        if dt and (now - dt).total_seconds() < 86400:  # 24 hours in seconds
+            title = "🆕 " + title
+        
+        return (title, source, published)
+
+    def update_articles(self, articles):
+        # Swap the model in place; only the rows in the window are re-read
+        self.prefetcher.cancel()
+        old_articles = getattr(self, 'current_articles', [])
+        self.current_articles = articles
+        now = datetime.now(timezone.utc)
+        
+        changed = abs(len(articles) - len(old_articles))
+        changed += sum(1 for old, new in zip(old_articles, articles) if old != new)
+        self.article_view.set_model(len(articles), lambda i: self.article_row(articles, i, now),
+                                    keep_position=True)
+        return changed
 
     def on_article_select(self, event):
-        selection = self.article_list.selection()
-        if not selection:
-            return
+        # Holding an arrow key fires this per row; only the latest selection gets rendered
+        if self.pending_render is None:
+            self.select_started = time.perf_counter()
+            self.pending_render = self.root.after_idle(self.render_selection)
+        else:
+            self.metrics.incr('select.coalesced')
 
-        article_index = int(selection[0])
-        article = self.current_articles[article_index]
+    def render_selection(self):
+        self.pending_render = None
+        article = self.get_selected_article()
+        if not article:
+            return
+        self.recorder.record('select', index=self.get_selected_index())
 
         # Display article details
         self.display_article_details(article)
+        self.start_reading(article, self.get_selected_index())
         
         # Find and display related articles
         self.find_related_articles(article)
+        
+        # Warm the caches for the neighbouring rows
+        self.prefetcher.on_select(self.current_articles, self.get_selected_index())
+        
+        # Redraws are idle callbacks too, so this runs once the new details are painted
+        started = self.select_started
+        self.root.after_idle(lambda: self.metrics.observe('select_latency_ms',
+                                                          (time.perf_counter() - started) * 1000))
 
     def display_article_details(self, article):
+        self.detail_article = article
+        
         # Enable widget temporarily to update content
         self.detail_text.configure(state='normal')
         self.detail_text.delete(1.0, tk.END)
@@ -514,6 +861,8 @@ class NewsApp:
         content = article.get('content', 'No content available')
         url = article.get('url', '')
         published = article.get('publishedAt', '')
+        summary = self.summarizer.cached(article)
+        summary_text = f"🧾 Summary:\n{summary}\n\n" if summary and summary != description else ""
         
         # Format date nicely
         if published:
@@ -531,7 +880,7 @@ class NewsApp:
 ✍️ {author}
 🕒 {published}
 
-📝 Description:
+{summary_text}📝 Description:
 {description}
 
 📄 Content:
@@ -555,8 +904,7 @@ class NewsApp:
     def clear_search(self):
         self.search_var.set("")
         self.detail_text.delete(1.0, tk.END)
-        for item in self.article_list.get_children():
-            self.article_list.delete(item)
+        self.article_view.set_model(0, None)
 
     def show_loading(self, message):
         self.loading_var.set(f"Loading: {message}")
@@ -577,23 +925,27 @@ class NewsApp:
         self.loading_label.configure(foreground=self.colors['text'])
 
     def next_page(self):
+        self.recorder.record('next_page')
         if hasattr(self, 'total_results'):
             page_size = 20  # Fixed page size
             max_pages = (self.total_results + page_size - 1) // page_size
             if self.current_page < max_pages:
                 self.current_page += 1
-                if self.search_var.get().strip():
-                    self.search_news()
-                else:
-                    self.show_top_headlines()
+                with self.profiler.span('page flip'):
+                    if self.search_var.get().strip():
+                        self.search_news()
+                    else:
+                        self.show_top_headlines()
 
     def previous_page(self):
+        self.recorder.record('previous_page')
         if self.current_page > 1:
             self.current_page -= 1
-            if self.search_var.get().strip():
-                self.search_news()
-            else:
-                self.show_top_headlines()
+            with self.profiler.span('page flip'):
+                if self.search_var.get().strip():
+                    self.search_news()
+                else:
+                    self.show_top_headlines()
 
     def refresh_news(self):
         if self.search_var.get().strip():
@@ -601,12 +953,220 @@ class NewsApp:
         else:
             self.show_top_headlines()
 
+    def select_source(self, name):
+        self.recorder.record('source', source=name)
+        if name == 'feeds' and not self.sources['feeds'].feeds:
+            self.show_error("No feeds configured - add FEEDS to config.py")
+            return
+        self.active_source = name
+        self.current_page = 1
+        self.show_top_headlines()
+
+    def describe_feed_poll(self):
+        feeds = self.sources['feeds']
+        unchanged = sum(feed.not_modified for feed in feeds.feeds)
+        summary = f"{len(feeds.feeds)} feeds, {unchanged} not modified"
+        if feeds.errors:
+            summary += f", {len(feeds.errors)} failed"
+        return summary
+
+    def current_scope(self):
+        query = self.current_query()
+        if query:
+            return self.search_scope(self.active_source, query, self.search_sort_by)
+        return (self.active_source, 'headlines', getattr(self, 'current_category', None))
+
+    def search_scope(self, source, query, sort_by):
+        # Only NewsAPI honours sortBy, and each sortBy ranks the results differently
+        return (source, 'search', query, sort_by if source == 'newsapi' else None)
+
+    def ingest_articles(self, articles, scope, rank_offset=0):
+        self.query_engine.add(articles, scope, rank_offset)
+        self.story_clusterer.submit(articles)
+        self.trend_store.add(articles)
+        self.entity_index.add(articles)
+        self.archive.add(articles)
+        self.index_titles(articles)
+        self.check_watchlist(articles)
+        self.refresh_facets()
+        if hasattr(self, 'entities_frame'):
+            self.refresh_tabs_if_visible()
+
+    def index_titles(self, articles):
+        # Follows the query engine, which drops old rows once it is full
+        if len(self.title_index) + len(articles) > self.query_engine.max_articles:
+            self.title_index.clear()
+            articles = self.query_engine.articles
+        self.title_index.add_many((article_key(a), self.title_text(a)) for a in articles)
+
+    def title_text(self, article):
+        return f"{article.get('title') or ''} {(article.get('source') or {}).get('name') or ''}"
+
+    def show_loaded_matches(self, query):
+        # Close matches among the articles loaded this session, for searches that came back empty
+        rows = (self.query_engine.by_url.get(key) for key, score in self.title_index.search(query))
+        articles = [self.query_engine.articles[row] for row in rows if row is not None]
+        if not articles:
+            return False
+        self.reset_local_filters()
+        self.display_articles(articles)
+        self.ui.post(lambda: self.loading_var.set(
+            f"🔎 Nothing found online for \"{query}\" - {len(articles)} close matches in loaded articles"),
+            key='status')
+        return True
+
+    def is_local_set_complete(self, scope):
+        total = getattr(self, 'total_results', 0)
+        return total > 0 and self.query_engine.scope_size(scope) >= total
+
+    def on_sort_change(self):
+        self.recorder.record('sort', sort=self.sort_var.get())
+        scope = self.current_scope()
+        sort_by = SORT_OPTIONS[self.sort_var.get()][1]
+        # Only NewsAPI searches accept sortBy, everything else is sorted locally. Popularity
+        # can't be computed from the loaded articles, so it always comes from the API
+        if (scope[:2] != ('newsapi', 'search') or sort_by is None or sort_by == scope[3] or
+                sort_by != 'popularity' and self.is_local_set_complete(scope)):
+            self.show_local_results()
+        else:
+            self.current_page = 1
+            self.search_news()
+
+    def reset_local_filters(self):
+        self.source_filter_var.set(ALL_SOURCES)
+        self.author_filter_var.set(ALL_AUTHORS)
+        self.date_filter_var.set(ANY_TIME)
+        self.archive_var.set(ARCHIVE_LIVE)
+
+    def refresh_facets(self):
+        engine = self.query_engine
+        facets = engine.facets(engine.build_mask(self.current_scope()))
+        self.facet_labels = {}
+        
+        def labels(counts, limit=50):
+            result = []
+            for key, count in sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:limit]:
+                label = f"{key} ({count})"
+                self.facet_labels[label] = key
+                result.append(label)
+            return result
+        
+        self.source_combo.configure(values=[ALL_SOURCES, *labels(facets['source'])])
+        self.author_combo.configure(values=[ALL_AUTHORS, *labels(facets['author'])])
+        days = sorted(facets['day'].items(), reverse=True)
+        day_labels = []
+        for day, count in days:
+            label = f"{day} ({count})"
+            self.facet_labels[label] = day
+            day_labels.append(label)
+        self.date_combo.configure(values=[ANY_TIME, *DATE_RANGES, *day_labels])
+
+    def get_local_filters(self):
+        source = self.facet_labels.get(self.source_filter_var.get())
+        author = self.facet_labels.get(self.author_filter_var.get())
+        date_label = self.date_filter_var.get()
+        since = until = None
+        if date_label in DATE_RANGES:
+            since = datetime.now(timezone.utc).timestamp() - DATE_RANGES[date_label]
+        elif date_label in self.facet_labels:
+            day = datetime.strptime(self.facet_labels[date_label], '%Y-%m-%d').replace(tzinfo=timezone.utc)
+            since = day.timestamp()
+            until = since + 86400
+        return {
+            'sources': [source] if source else None,
+            'authors': [author] if author else None,
+            'since': since,
+            'until': until
+        }
+
+    def show_local_results(self):
+        if self.archive_var.get() != ARCHIVE_LIVE:
+            self.show_archive_results()
+            return
+        scope = self.current_scope()
+        sort_key = SORT_OPTIONS[self.sort_var.get()][0]
+        if sort_key == 'personal' or sort_key == 'rank' and scope[1:2] + scope[3:] != ('search', 'popularity'):
+            # Fetch order is only a popularity ranking when the API was asked for one
+            sort = (('published', True),)
+        else:
+            # Popularity follows the API's own ranking; the other keys sort descending
+            sort = ((sort_key, sort_key != 'rank'), ('published', True))
+        results = self.query_engine.query(scope=scope, sort=sort, query=self.current_query(),
+                                          **self.get_local_filters())
+        self.display_articles(self.rank_if_personal(results))
+        if results:
+            self.loading_var.set(f"Showing {len(results)} of {self.query_engine.scope_size(scope)} loaded articles")
+
+    def show_archive_results(self):
+        # Reads straight from the on-disk archive; no network involved
+        label = self.archive_var.get()
+        since = parse_day_label(label) * 86400
+        filters = self.get_local_filters()
+        query = self.current_query()
+        self.loading_var.set(f"🗄️ Reading archive for {label}...")
+        
+        def scan():
+            try:
+                results = self.archive.scan(since=since, until=since + 86400, sources=filters['sources'],
+                                            authors=filters['authors'], query=query)
+            except Exception as e:
+                message = f"Error reading archive: {str(e)}"  # e is cleared when the except block ends
+                self.ui.post(lambda: self.show_error(message), key='status')
+                return
+            self.ui.post(lambda: self.display_archive_results(label, results), key='archive')
+        
+        threading.Thread(target=scan, daemon=True).start()
+
+    def display_archive_results(self, label, results):
+        if self.archive_var.get() != label:
+            return  # Another day or live results were picked meanwhile
+        self.display_articles(self.rank_if_personal(results))
+        if results:
+            self.loading_var.set(f"🗄️ {label} - {len(results)} archived articles (offline)")
+
+    def rank_if_personal(self, articles):
+        if SORT_OPTIONS[self.sort_var.get()][0] != 'personal':
+            return articles
+        return self.ranker.rank(articles, self.current_category_for_ranking())
+
+    def current_category_for_ranking(self):
+        scope = self.current_scope()
+        return scope[2] if scope[1] == 'headlines' else None
+
+    def record_activity(self, event_type, article, **extra):
+        try:
+            self.ranker.record(event_type, article, self.current_category_for_ranking(), **extra)
+        except Exception as e:
+            print(f"Error recording activity: {e}")
+
+    def start_reading(self, article, index):
+        self.finish_reading()
+        self.reading = (article, index, self.current_articles, time.monotonic())
+
+    def finish_reading(self):
+        if not self.reading:
+            return
+        article, index, articles, started = self.reading
+        self.reading = None
+        seconds = time.monotonic() - started
+        if seconds < MIN_READ_SECONDS:
+            return  # Passed over while moving through the list
+        
+        self.record_activity('open', article)
+        self.record_activity('dwell', article, seconds=round(min(seconds, 600), 1))
+        
+        # Rows above the opened one that were never opened count against their features
+        for skipped in articles[max(0, index - MAX_SKIPS_PER_OPEN):index]:
+            if skipped.get('url') not in self.opened_urls:
+                self.record_activity('skip', skipped)
+        self.opened_urls.add(article.get('url'))
+
     def open_in_browser(self):
-        selection = self.article_list.selection()
-        if selection:
-            article = self.current_articles[int(selection[0])]
+        article = self.get_selected_article()
+        if article:
             url = article.get('url', '')
             if url:
+                self.record_activity('browser', article)
                 webbrowser.open(url)
                 self.show_success("Article opened in browser")
 
@@ -651,18 +1211,36 @@ class NewsApp:
                 loading_label = ttk.Label(content, text="Loading image...")
                 loading_label.pack()
                 
-                # Load image in background
-                def load_image():
-                    response = requests.get(article.get('urlToImage'))
-                    img_data = Image.open(BytesIO(response.content))
-                    img_data.thumbnail((750, 400))
+                img_label = ttk.Label(content)
+                
+                def show_image(img_data):
+                    if not img_label.winfo_exists():
+                        return
                     photo = ImageTk.PhotoImage(img_data)
-                    
-                    # Update UI in main thread
-                    loading_label.destroy()
-                    img_label = ttk.Label(content, image=photo)
+                    if loading_label.winfo_exists():
+                        loading_label.destroy()
+                        img_label.pack(pady=10, before=meta_frame)
+                    img_label.configure(image=photo)
                     img_label.image = photo
-                    img_label.pack(pady=10)
+                
+                def show_partial(img_data):
+                    # Low-resolution scans are scaled up and sharpen as more bytes arrive
+                    img_data = img_data.convert('RGB')
+                    scale = min(PREVIEW_THUMB_SIZE[0] / img_data.width, PREVIEW_THUMB_SIZE[1] / img_data.height)
+                    img_data = img_data.resize((max(1, int(img_data.width * scale)),
+                                                max(1, int(img_data.height * scale))))
+                    self.ui.post(lambda: show_image(img_data), key='preview')
+                
+                # Load image in background
+                def load_image():
+                    try:
+                        img_data = self.load_thumbnail(article.get('urlToImage'), PREVIEW_THUMB_SIZE,
+                                                       on_preview=show_partial)
+                        img_data.load()
+                    except Exception as e:
+                        print(f"Error loading preview image: {e}")
+                        return
+                    self.ui.post(lambda: show_image(img_data), key='preview')
                 
                 threading.Thread(target=load_image, daemon=True).start()
             except:
@@ -744,44 +1322,87 @@ class NewsApp:
     def use_suggestion(self, suggestion):
         self.search_var.set(suggestion)
         self.suggestion_frame.pack_forget()
-        self.search_news()
+        self.submit_search()
 
     def show_card_view(self):
         # Hide treeview
         self.article_list.pack_forget()
+        self.list_scrollbar.pack_forget()
         
-        # Create or show card frame
+        # The card container is built once and reused; only the cards are rebuilt
         if not hasattr(self, 'card_frame'):
-            self.card_frame = ttk.Frame(self.paned_window)
-            self.paned_window.add(self.card_frame, weight=1)
-        else:
-            self.card_frame.pack(fill=tk.BOTH, expand=True)
+            self.card_frame = ttk.Frame(self.list_frame)
+            
+            # Create canvas for scrolling
+            self.card_canvas = tk.Canvas(self.card_frame, bg=self.colors['background'])
+            scrollbar = ttk.Scrollbar(self.card_frame, orient=tk.VERTICAL, command=self.card_canvas.yview)
+            self.card_container = ttk.Frame(self.card_canvas)
+            
+            self.card_container.bind(
+                "<Configure>",
+                lambda e: self.card_canvas.configure(scrollregion=self.card_canvas.bbox("all"))
+            )
+            
+            self.card_canvas.create_window((0, 0), window=self.card_container, anchor="nw")
+            self.card_canvas.configure(yscrollcommand=scrollbar.set)
+            
+            self.card_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+            scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+            
+            self.card_images = []
+            self.cards_for = None
+        self.card_frame.pack(fill=tk.BOTH, expand=True)
         
-        # Clear existing cards
-        for widget in self.card_frame.winfo_children():
+        # Nothing to rebuild if the cards already show this list
+        articles = getattr(self, 'current_articles', [])
+        if self.cards_for is articles:
+            return
+        self.cards_for = articles
+        
+        # Clear existing cards and release their images
+        for widget in self.card_container.winfo_children():
             widget.destroy()
+        self.card_images.clear()
+        self.card_summary_labels.clear()
+        self.card_canvas.yview_moveto(0)
+
+        # Cards are built through the dispatcher so a long list spreads over several frames;
+        # thumbnails not on disk yet are fetched on a worker and attached as they arrive
+        missing = []
+        span = self.profiler.begin('card view')
+        self.ui.post_batch([lambda article=article, i=i: self.cards_for is articles and
+                            self.create_article_card(self.card_container, article, i, missing)
+                            for i, article in enumerate(articles)])
+        self.ui.post(lambda: self.cards_for is articles and self.load_card_thumbnails(articles, missing))
+        self.ui.post(lambda: self.profiler.end(span))
+
+    def load_card_thumbnails(self, articles, missing):
+        if not missing:
+            return
         
-        # Create canvas for scrolling
-        canvas = tk.Canvas(self.card_frame, bg=self.colors['background'])
-        scrollbar = ttk.Scrollbar(self.card_frame, orient=tk.VERTICAL, command=canvas.yview)
-        scrollable_frame = ttk.Frame(canvas)
-
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-
-        # Create cards for articles
-        for i, article in enumerate(self.current_articles):
-            self.create_article_card(scrollable_frame, article, i)
+        def load():
+            for url, card, title in missing:
+                if self.cards_for is not articles:
+                    return
+                try:
+                    img_data = self.load_thumbnail(url, CARD_THUMB_SIZE)
+                    img_data.load()
+                except Exception as e:
+                    print(f"Error loading card image: {e}")
+                    continue
+                self.ui.post(lambda img_data=img_data, card=card, title=title:
+                             self.cards_for is articles and self.attach_card_image(card, title, img_data))
+        
+        threading.Thread(target=load, daemon=True).start()
 
-        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+    def attach_card_image(self, card, title, img_data):
+        if not card.winfo_exists():
+            return
+        photo = ImageTk.PhotoImage(img_data)
+        self.card_images.append(photo)
+        ttk.Label(card, image=photo).pack(pady=5, before=title)
 
-    def create_article_card(self, parent, article, index):
+    def create_article_card(self, parent, article, index, missing=None):
         # Card frame with hover effect
         card = ttk.Frame(parent, style='Card.TFrame', cursor='hand2')
         card.pack(fill=tk.X, padx=10, pady=5)
@@ -791,19 +1412,6 @@ class NewsApp:
         card.bind('<Leave>', lambda e: self.on_card_hover(card, False))
         card.bind('<Button-1>', lambda e: self.on_card_click(article))
         
-        # Image
-        if article.get('urlToImage'):
-            try:
-                response = requests.get(article.get('urlToImage'))
-                img_data = Image.open(BytesIO(response.content))
-                img_data.thumbnail((200, 120))
-                photo = ImageTk.PhotoImage(img_data)
-                img_label = ttk.Label(card, image=photo)
-                img_label.image = photo
-                img_label.pack(pady=5)
-            except:
-                pass
-
         # Title
         title = ttk.Label(card, 
                           text=article.get('title', ''),
@@ -811,6 +1419,19 @@ class NewsApp:
                           wraplength=300)
         title.pack(fill=tk.X, padx=10, pady=5)
         
+        # Image; thumbnails on disk are shown at once, the rest are queued for a worker.
+        # In lite mode only thumbnails already on disk are shown
+        url = article.get('urlToImage')
+        if url and self.thumbnail_store.contains(url, CARD_THUMB_SIZE):
+            try:
+                self.attach_card_image(card, title, self.load_thumbnail(url, CARD_THUMB_SIZE))
+            except Exception as e:
+                print(f"Error loading card image: {e}")
+        elif url and self.bandwidth.lite:
+            self.note_lite_skip(url)
+        elif url and missing is not None:
+            missing.append((url, card, title))
+        
         # Source and date
         info_frame = ttk.Frame(card)
         info_frame.pack(fill=tk.X, padx=10)
@@ -824,13 +1445,14 @@ class NewsApp:
                  text=f"🕒 {article.get('publishedAt', '')}",
                  font=('Helvetica', 9)).pack(side=tk.RIGHT)
         
-        # Description
+        # Summary, or the description until the summary is ready
         if article.get('description'):
             desc = ttk.Label(card,
-                            text=article.get('description'),
+                            text=self.summarizer.cached(article) or article.get('description'),
                             wraplength=300,
                             font=('Helvetica', 9))
             desc.pack(fill=tk.X, padx=10, pady=5)
+            self.card_summary_labels[article.get('url')] = desc
         
         # Action buttons
         btn_frame = ttk.Frame(card)
@@ -849,11 +1471,16 @@ class NewsApp:
     def show_list_view(self):
         if hasattr(self, 'card_frame'):
             self.card_frame.pack_forget()
+        self.list_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.article_list.pack(fill=tk.BOTH, expand=True, padx=5)
 
+    def is_card_view(self):
+        return hasattr(self, 'view_var') and self.view_var.get() == "cards"
+
     def share_specific_article(self, article):
         url = article.get('url', '')
         if url:
+            self.record_activity('share', article)
             self.root.clipboard_clear()
             self.root.clipboard_append(url)
             self.show_success("Article URL copied to clipboard!")
@@ -868,18 +1495,26 @@ class NewsApp:
         self.show_article_preview(article)
 
     def save_article(self):
-        selection = self.article_list.selection()
-        if not selection:
+        article = self.get_selected_article()
+        if not article:
             return
+        self.recorder.record('save', index=self.get_selected_index())
         
-        article = self.current_articles[int(selection[0])]
-        
-        # Create saves directory in user's Documents folder
-        documents_path = str(Path.home() / "Documents")
-        save_folder = os.path.join(documents_path, "NewsApp_Saved_Articles")
-        
-        if not os.path.exists(save_folder):
-            os.makedirs(save_folder)
+        # Save to file with better formatting
+        try:
+            full_path = self.write_saved_article(article)
+            self.record_activity('save', article)
+            self.saved_index.add(full_path, self.title_text(article))
+            self.entity_index.add([{**article, 'path': full_path}])
+            
+            # Show success message with option to open folder
+            self.show_save_success(os.path.dirname(full_path), full_path)
+        except Exception as e:
+            self.show_error(f"Error saving article: {str(e)}")
+
+    def write_saved_article(self, article):
+        # Writes the saved-article layout and returns the new file's path; safe off the Tk thread
+        save_folder = self.get_save_folder()
         
         # Clean and format the title for filename
         title = article.get('title', 'Untitled')
@@ -891,35 +1526,31 @@ class NewsApp:
         
         # Add date to filename
         date = datetime.now().strftime("%Y%m%d")
-        filename = f"{date}_{clean_title}.txt"
-        full_path = os.path.join(save_folder, filename)
-        
-        # Ensure filename is unique
-        counter = 1
-        while os.path.exists(full_path):
-            filename = f"{date}_{clean_title}_{counter}.txt"
-            full_path = os.path.join(save_folder, filename)
-            counter += 1
         
-        # Save to file with better formatting
-        try:
-            with open(full_path, "w", encoding='utf-8') as f:
-                f.write(f"{'='*50}\n")
-                f.write(f"Title: {article.get('title', '')}\n")
-                f.write(f"{'='*50}\n\n")
-                f.write(f"📰 Source: {article.get('source', {}).get('name', '')}\n")
-                f.write(f"✍️ Author: {article.get('author', 'Unknown')}\n")
-                f.write(f"🕒 Date: {article.get('publishedAt', '')}\n")
-                f.write(f"🌐 URL: {article.get('url', '')}\n\n")
-                f.write(f"Description:\n{'-'*20}\n")
-                f.write(f"{article.get('description', '')}\n\n")
-                f.write(f"Content:\n{'-'*20}\n")
-                f.write(f"{article.get('content', '')}\n")
-            
-            # Show success message with option to open folder
-            self.show_save_success(save_folder, full_path)
-        except Exception as e:
-            self.show_error(f"Error saving article: {str(e)}")
+        # Ensure filename is unique; exclusive create so a concurrent import can't take the same name
+        counter = 0
+        while True:
+            suffix = f"_{counter}" if counter else ""
+            full_path = os.path.join(save_folder, f"{date}_{clean_title}{suffix}.txt")
+            try:
+                f = open(full_path, "x", encoding='utf-8')
+                break
+            except FileExistsError:
+                counter += 1
+        
+        with f:
+            f.write(f"{'='*50}\n")
+            f.write(f"Title: {article.get('title', '')}\n")
+            f.write(f"{'='*50}\n\n")
+            f.write(f"📰 Source: {article.get('source', {}).get('name', '')}\n")
+            f.write(f"✍️ Author: {article.get('author', 'Unknown')}\n")
+            f.write(f"🕒 Date: {article.get('publishedAt', '')}\n")
+            f.write(f"🌐 URL: {article.get('url', '')}\n\n")
+            f.write(f"Description:\n{'-'*20}\n")
+            f.write(f"{article.get('description', '')}\n\n")
+            f.write(f"Content:\n{'-'*20}\n")
+            f.write(f"{article.get('content', '')}\n")
+        return full_path
 
     def show_save_success(self, folder_path, file_path):
         # Create success dialog
@@ -962,7 +1593,45 @@ class NewsApp:
                    command=dialog.destroy,
                    style='Action.TButton').pack(side=tk.RIGHT, padx=5)
 
+    def cancel_related_lookup(self):
+        # Drop any lookup still waiting for, or running on behalf of, an earlier row
+        self.related_generation += 1
+        if self.related_after:
+            self.root.after_cancel(self.related_after)
+            self.related_after = None
+
     def find_related_articles(self, article):
+        self.cancel_related_lookup()
+        related = self.related_cache.get(article.get('url'))
+        self.metrics.incr('prefetch.related.hits' if related is not None else 'prefetch.related.misses')
+        self.display_related_articles(related or [])
+        
+        # Neighbours' related lookups wait for the same settle as this row's own
+        generation = self.related_generation
+        self.related_after = self.root.after(RELATED_SETTLE_MS,
+                                             lambda: self.on_selection_settled(article, generation, related is None))
+
+    def on_selection_settled(self, article, generation, load):
+        self.related_after = None
+        index = self.get_selected_index()
+        if index is not None:
+            self.prefetcher.on_settle(self.current_articles, index)
+        if load:
+            self.load_related_articles(article, generation)
+
+    def load_related_articles(self, article, generation):
+        def fetch():
+            try:
+                related = self.fetch_related(article)
+            except Exception as e:
+                print(f"Error finding related articles: {e}")
+                return
+            self.ui.post(lambda: generation == self.related_generation and
+                         self.display_related_articles(related), key='related')
+        
+        threading.Thread(target=fetch, daemon=True).start()
+
+    def display_related_articles(self, related):
         # Clear existing items
         self.related_list.delete(*self.related_list.get_children())
         
@@ -973,40 +1642,100 @@ class NewsApp:
         self.related_list.column("title", width=300, anchor=tk.W)
         self.related_list.column("source", width=100, anchor=tk.W)
         
+        # Display related articles
+        for rel_article in related:
+            title = rel_article.get('title', '')
+            source = rel_article.get('source', {}).get('name', '')
+            self.related_list.insert('', 'end', values=(title, source))
+        
+        # Add click handler for related articles
+        self.related_list.bind('<Double-1>', self.on_related_article_click)
+
+    def fetch_related(self, article):
         # Get keywords from title and description
-        keywords = []
-        title = article.get('title', '').lower()
-        desc = article.get('description', '').lower()
+        title = (article.get('title') or '').lower()
+        desc = (article.get('description') or '').lower()
         
         # Extract meaningful words (longer than 3 chars)
         words = set((title + " " + desc).split())
         keywords = [w for w in words if len(w) > 3 and w not in {'this', 'that', 'with', 'from'}]
         
+        related = []
         if keywords:
-            try:
-                # Search for related articles
-                query = ' OR '.join(keywords[:5])  # Use top 5 keywords
-                params = {
-                    'q': query,
-                    'language': 'en',
-                    'page': 1,
-                    'page_size': 10
-                }
-                
-                related = self.newsapi.get_everything(**params)
-                
-                # Display related articles
-                for rel_article in related.get('articles', []):
-                    if rel_article.get('url') != article.get('url'):  # Skip current article
-                        title = rel_article.get('title', '')
-                        source = rel_article.get('source', {}).get('name', '')
-                        self.related_list.insert('', 'end', values=(title, source))
-            
-                # Add click handler for related articles
-                self.related_list.bind('<Double-1>', self.on_related_article_click)
-                                                  
-            except Exception as e:
-                print(f"Error finding related articles: {e}")
+            # Search for related articles
+            query = ' OR '.join(keywords[:5])  # Use top 5 keywords
+            params = {
+                'q': query,
+                'language': 'en',
+                'page': 1,
+                'page_size': 10
+            }
+            response = self.newsapi.get_everything(**params)
+            related = [rel_article for rel_article in response.get('articles', [])
+                       if rel_article.get('url') != article.get('url')]  # Skip current article
+        
+        self.related_cache.put(article.get('url'), related)
+        return related
+
+    def fetch_image(self, url, prefetch=False, on_preview=None, preview_size=None):
+        data = self.image_cache.get(url)
+        if not prefetch:
+            self.metrics.incr('prefetch.image.hits' if data is not None else 'prefetch.image.misses')
+        if data is not None:
+            return Image.open(BytesIO(data))
+        was_lite = self.bandwidth.lite
+        # The download already decoded the full image; reuse it instead of decoding again
+        data, image = stream_image(url, self.bandwidth, on_preview, preview_size)
+        self.image_cache.put(url, data)
+        if self.bandwidth.lite != was_lite:
+            self.ui.post(self.on_bandwidth_change, key='status')
+        return image
+
+    def on_bandwidth_change(self):
+        if self.bandwidth.lite:
+            self.loading_var.set(f"🐢 Slow connection ({self.bandwidth.describe()}) - lite mode, new thumbnails paused")
+        else:
+            self.show_success(f"Connection recovered ({self.bandwidth.describe()}) - thumbnails back on")
+
+    def note_lite_skip(self, url):
+        # Skipped downloads are costed at the running average image size
+        if url in self.lite_skipped:
+            return
+        if len(self.lite_skipped) > 5000:
+            self.lite_skipped.clear()
+        self.lite_skipped.add(url)
+        self.metrics.incr('lite.images_skipped')
+        self.metrics.incr('lite.bytes_saved', int(self.bandwidth.average_image_bytes or 0))
+
+    def load_thumbnail(self, url, size, prefetch=False, on_preview=None):
+        # Resized thumbnails are kept on disk so cards and previews skip download and decode
+        data = self.thumbnail_store.get(url, size)
+        if data is not None:
+            return Image.open(BytesIO(data))
+        
+        img_data = self.fetch_image(url, prefetch, on_preview, size)
+        img_data.thumbnail(size)
+        output = BytesIO()
+        if img_data.mode in ('RGBA', 'LA', 'P'):
+            img_data.save(output, format='PNG', optimize=True)
+        else:
+            img_data.convert('RGB').save(output, format='JPEG', quality=85)
+        self.thumbnail_store.put(url, size, output.getvalue())
+        return img_data
+
+    def prefetch_image(self, article):
+        url = article.get('urlToImage')
+        if url and self.bandwidth.lite:
+            if not self.thumbnail_store.contains(url, CARD_THUMB_SIZE):
+                self.note_lite_skip(url)
+        elif url:
+            for size in (CARD_THUMB_SIZE, PREVIEW_THUMB_SIZE):
+                if not self.thumbnail_store.contains(url, size):
+                    self.load_thumbnail(url, size, prefetch=True)
+
+    def prefetch_related(self, article):
+        if article.get('url') and article.get('url') not in self.related_cache:
+            self.fetch_related(article)
 
     def on_related_article_click(self, event):
         selection = self.related_list.selection()
@@ -1041,12 +1770,14 @@ class NewsApp:
         cat_frame = ttk.Frame(cat_canvas)
         cat_canvas.create_window((0, 0), window=cat_frame, anchor='nw')
         
+        self.category_buttons = []
         for name, icon, cat, tooltip in categories:
             btn = ttk.Button(cat_frame, 
                             text=f"{icon} {name}", 
                             command=lambda c=cat: self.filter_category(c),
                             style='Category.TButton')
             btn.pack(side=tk.LEFT, padx=2)
+            self.category_buttons.append(btn)
             
             # Create tooltip
             self.create_tooltip(btn, tooltip)
@@ -1065,33 +1796,65 @@ class NewsApp:
                         command=self.toggle_view).pack(side=tk.LEFT)
 
     def create_tooltip(self, widget, text):
-        def enter(event):
-            tooltip = tk.Toplevel()
-            tooltip.wm_overrideredirect(True)
-            tooltip.wm_geometry(f"+{event.x_root+10}+{event.y_root+10}")
-            
-            label = ttk.Label(tooltip, text=text, 
-                             background=self.colors['primary_dark'],
-                             foreground='white',
-                             padding=5)
-            label.pack()
-            
-            widget.tooltip = tooltip
+        widget.bind('<Enter>', lambda e: self.show_tooltip(text, e.x_root, e.y_root))
+        widget.bind('<Leave>', lambda e: self.hide_tooltip())
+
+    def show_tooltip(self, text, x, y):
+        # One shared tooltip window is moved and relabelled instead of a new one per hover
+        if not hasattr(self, 'tooltip_window'):
+            self.tooltip_window = tk.Toplevel(self.root)
+            self.tooltip_window.wm_overrideredirect(True)
+            self.tooltip_label = ttk.Label(self.tooltip_window,
+                                           background=self.colors['primary_dark'],
+                                           foreground='white',
+                                           wraplength=400,
+                                           padding=5)
+            self.tooltip_label.pack()
+        self.tooltip_label.configure(text=text)
+        self.tooltip_window.wm_geometry(f"+{x+10}+{y+10}")
+        self.tooltip_window.deiconify()
+        self.tooltip_window.lift()
+
+    def hide_tooltip(self):
+        self.tooltip_row = None
+        if hasattr(self, 'tooltip_window'):
+            self.tooltip_window.withdraw()
+
+    def on_article_list_motion(self, event):
+        row = self.article_list.identify_row(event.y)
+        if row == self.tooltip_row:
+            return
+        articles = getattr(self, 'current_articles', [])
+        if not row.isdigit() or int(row) >= len(articles):
+            self.hide_tooltip()
+            return
+        article = articles[int(row)]
+        text = self.summarizer.cached(article) or article.get('description')
+        if not text:
+            self.hide_tooltip()
+            return
+        self.show_tooltip(text, event.x_root, event.y_root)
+        self.tooltip_row = row
 
-        def leave(event):
-            if hasattr(widget, 'tooltip'):
-                widget.tooltip.destroy()
-                del widget.tooltip
+    def request_summaries(self, articles):
+        self.summarizer.submit(articles, lambda results: self.ui.post(lambda: self.apply_summaries(results)))
 
-        widget.bind('<Enter>', enter)
-        widget.bind('<Leave>', leave)
+    def apply_summaries(self, results):
+        for url, summary in results.items():
+            label = self.card_summary_labels.get(url)
+            if label is not None and label.winfo_exists():
+                label.configure(text=summary)
+        if self.detail_article is not None and self.detail_article.get('url') in results:
+            self.display_article_details(self.detail_article)
 
     def filter_category(self, category):
+        self.recorder.record('category', category=category)
         self.current_category = category
         self.current_page = 1
         self.show_top_headlines()
 
     def toggle_view(self):
+        self.recorder.record('view', view=self.view_var.get())
         if self.view_var.get() == "cards":
             self.show_card_view()
         else:
@@ -1113,6 +1876,16 @@ class NewsApp:
         # Refresh button
         self.create_action_button(left_controls, "🔄 Refresh", self.refresh_saved_articles)
         
+        # Bulk import from a URL list or bookmarks export
+        self.create_action_button(left_controls, "📥 Import URLs", self.import_urls)
+        
+        # Whole library to and from one .tar.gz, for backups and moving machines
+        self.create_action_button(left_controls, "📦 Export", self.export_library)
+        self.create_action_button(left_controls, "📦 Restore", self.restore_library)
+        
+        # Exchange changes with the user's other machines through a shared hub
+        self.create_action_button(left_controls, "🔁 Sync", self.sync_library)
+        
         # Open saved folder button
         self.create_action_button(left_controls, "📁 Open Folder", 
                                 lambda: os.startfile(self.get_save_folder()))
@@ -1123,7 +1896,7 @@ class NewsApp:
         
         ttk.Label(search_frame, text="🔍").pack(side=tk.LEFT)
         self.saved_search_var = tk.StringVar()
-        self.saved_search_var.trace('w', self.filter_saved_articles)
+        self.saved_search_var.trace('w', self.on_saved_search_change)
         search_entry = ttk.Entry(search_frame, textvariable=self.saved_search_var, width=20)
         search_entry.pack(side=tk.LEFT, padx=5)
         
@@ -1141,10 +1914,13 @@ class NewsApp:
         self.saved_list.column("date", width=150, anchor=tk.W)
         self.saved_list.column("source", width=150, anchor=tk.W)
         
-        # Add scrollbar
-        scrollbar = ttk.Scrollbar(saved_frame, orient=tk.VERTICAL, 
-                                 command=self.saved_list.yview)
-        self.saved_list.configure(yscrollcommand=scrollbar.set)
+        # Add scrollbar; only the visible window of saved files is kept in the tree
+        scrollbar = ttk.Scrollbar(saved_frame, orient=tk.VERTICAL)
+        self.saved_view = VirtualTreeview(self.saved_list, scrollbar)
+        self.saved_files = []
+        self.saved_keys = []
+        self.shown_saved_files = []
+        self.saved_sources = LruCache(max_items=SAVED_SOURCE_CACHE_ITEMS)
         
         # Pack widgets
         self.saved_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -1165,6 +1941,8 @@ class NewsApp:
         
         # Initial load of saved articles
         self.refresh_saved_articles()
+        threading.Thread(target=self.index_saved_articles, daemon=True).start()
+        threading.Thread(target=self.resume_imports, daemon=True).start()
 
     def get_save_folder(self):
         documents_path = str(Path.home() / "Documents")
@@ -1173,41 +1951,348 @@ class NewsApp:
             os.makedirs(save_folder)
         return save_folder
 
-    def refresh_saved_articles(self):
-        # Clear existing items
-        for item in self.saved_list.get_children():
-            self.saved_list.delete(item)
+    def get_data_folder(self, *parts):
+        data_folder = os.path.join(self.get_save_folder(), DATA_FOLDER, *parts)
+        if not os.path.exists(data_folder):
+            os.makedirs(data_folder)
+        return data_folder
+
+    def create_trending_frame(self):
+        trending_frame = ttk.Frame(self.detail_notebook)
+        self.detail_notebook.add(trending_frame, text="📈 Trending")
+        self.trending_frame = trending_frame
         
+        toolbar = ttk.Frame(trending_frame, style='Surface.TFrame')
+        toolbar.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Label(toolbar, text="Rising in the last:").pack(side=tk.LEFT, padx=(0, 5))
+        self.trending_window_var = tk.StringVar(value=next(iter(TRENDING_WINDOWS)))
+        for label in TRENDING_WINDOWS:
+            ttk.Radiobutton(toolbar, text=label, value=label,
+                            variable=self.trending_window_var,
+                            command=self.refresh_trending).pack(side=tk.LEFT)
+        self.create_action_button(toolbar, "🔄 Refresh", self.refresh_trending)
+        
+        self.trending_list = ttk.Treeview(trending_frame,
+                                          columns=("term", "mentions", "change"),
+                                          show="headings",
+                                          style='Article.Treeview')
+        self.trending_list.heading("term", text="Term", anchor=tk.W)
+        self.trending_list.heading("mentions", text="Mentions", anchor=tk.W)
+        self.trending_list.heading("change", text="vs. baseline", anchor=tk.W)
+        self.trending_list.column("term", width=250, anchor=tk.W)
+        self.trending_list.column("mentions", width=100, anchor=tk.W)
+        self.trending_list.column("change", width=120, anchor=tk.W)
+        self.trending_list.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        # Clicking a term searches for it
+        self.trending_list.bind('<<TreeviewSelect>>', self.on_trending_term_click)
+
+    def create_stats_frame(self):
+        stats_frame = ttk.Frame(self.detail_notebook)
+        self.detail_notebook.add(stats_frame, text="📊 Stats")
+        self.stats_tab = stats_frame
+        
+        self.stats_text = scrolledtext.ScrolledText(stats_frame,
+                                                    wrap=tk.NONE,
+                                                    font=('Courier', 10),
+                                                    padx=10,
+                                                    pady=10,
+                                                    state='disabled')
+        self.stats_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        self.metrics.gauge('prefetch.image.hit_rate',
+                           lambda: f"{self.metrics.ratio('prefetch.image.hits', 'prefetch.image.misses'):.0%}")
+        self.metrics.gauge('prefetch.related.hit_rate',
+                           lambda: f"{self.metrics.ratio('prefetch.related.hits', 'prefetch.related.misses'):.0%}")
+        self.metrics.gauge('prefetch.distance', lambda: self.prefetcher.distance)
+        self.metrics.gauge('prefetch.queued', lambda: self.prefetcher.queue.qsize())
+        self.metrics.gauge('cache.images', lambda: f"{len(self.image_cache)} ({self.image_cache.size // 1024} KB)")
+        self.metrics.gauge('cache.related', lambda: len(self.related_cache))
+        self.metrics.gauge('cache.thumbnails',
+                           lambda: f"{len(self.thumbnail_store)} ({self.thumbnail_store.disk_bytes // 1024} KB on disk)")
+        self.metrics.gauge('cache.thumbnails.hit_rate',
+                           lambda: f"{self.thumbnail_store.hits / max(1, self.thumbnail_store.hits + self.thumbnail_store.misses):.0%}")
+        self.metrics.gauge('network.bandwidth', self.bandwidth.describe)
+        self.metrics.gauge('cache.card_images', lambda: len(getattr(self, 'card_images', [])))
+        self.metrics.gauge('tk.widgets', self.count_widgets)
+        self.metrics.gauge('tk.images', lambda: len(self.root.image_names()))
+        self.metrics.gauge('engine.articles', lambda: len(self.query_engine))
+        self.metrics.gauge('ui.queued', lambda: len(self.ui))
+        self.metrics.gauge('ui.longest_stall_ms', lambda: f"{self.watchdog.longest_ms:.0f}")
+        self.metrics.gauge('watchlist.rules', lambda: len(self.watchlist))
+        self.metrics.gauge('profiler.samples', lambda: len(self.profiler.samples) if self.profiler.running else "off")
+        
+        self.root.after(STATS_REFRESH_MS, self.refresh_stats)
+
+    def count_widgets(self):
+        count = 0
+        pending = [self.root]
+        while pending:
+            widget = pending.pop()
+            count += 1
+            pending.extend(widget.winfo_children())
+        return count
+
+    def refresh_stats(self):
+        if self.detail_notebook.select() == str(self.stats_tab):
+            snapshot = self.metrics.snapshot()
+            lines = []
+            for section in ('gauges', 'counters', 'histograms'):
+                lines.append(section.title())
+                for name, value in sorted(snapshot[section].items()):
+                    lines.append(f"  {name:<36} {value}")
+                lines.append("")
+            lines.extend(self.stall_histogram_lines())
+            
+            self.stats_text.configure(state='normal')
+            self.stats_text.delete(1.0, tk.END)
+            self.stats_text.insert(tk.END, "\n".join(lines))
+            self.stats_text.configure(state='disabled')
+        self.root.after(STATS_REFRESH_MS, self.refresh_stats)
+
+    def stall_histogram_lines(self):
+        buckets = self.metrics.buckets('ui.stall_ms')
+        lines = ["UI stalls"]
+        if not buckets:
+            lines.append("  none yet")
+        peak = max((count for _, count in buckets), default=0)
+        previous = None
+        for bound, count in buckets:
+            label = f"≤{bound:g} ms" if bound is not None else f">{previous:g} ms"
+            previous = bound
+            bar = '█' * (-(-count * STALL_BAR_WIDTH // peak) if peak else 0)
+            lines.append(f"  {label:>10} {count:>6} {bar}")
+        lines.append(f"  stacks logged to {self.watchdog.log_path}")
+        return lines
+
+    def refresh_tabs_if_visible(self):
+        self.refresh_trending_if_visible()
+        self.refresh_entities_if_visible()
+        self.refresh_alerts_if_visible()
+
+    def refresh_trending_if_visible(self):
+        if self.detail_notebook.select() == str(self.trending_frame):
+            self.refresh_trending()
+
+    def create_entities_frame(self):
+        entities_frame = ttk.Frame(self.detail_notebook)
+        self.detail_notebook.add(entities_frame, text="🏷️ Entities")
+        self.entities_frame = entities_frame
+        self.entities_shown = None
+        
+        toolbar = ttk.Frame(entities_frame, style='Surface.TFrame')
+        toolbar.pack(fill=tk.X, padx=5, pady=5)
+        
+        self.entity_kind_var = tk.StringVar(value=ALL_ENTITIES)
+        for label in (ALL_ENTITIES, *KIND_LABELS.values()):
+            ttk.Radiobutton(toolbar, text=label, value=label,
+                            variable=self.entity_kind_var,
+                            command=self.refresh_entities).pack(side=tk.LEFT)
+        
+        search_frame = ttk.Frame(toolbar)
+        search_frame.pack(side=tk.RIGHT, padx=5)
+        ttk.Label(search_frame, text="🔍").pack(side=tk.LEFT)
+        self.entity_search_var = tk.StringVar()
+        self.entity_search_var.trace('w', lambda *args: self.refresh_entities())
+        ttk.Entry(search_frame, textvariable=self.entity_search_var, width=20).pack(side=tk.LEFT, padx=5)
+        
+        self.entity_list = ttk.Treeview(entities_frame,
+                                        columns=("entity", "kind", "articles"),
+                                        show="headings",
+                                        style='Article.Treeview')
+        self.entity_list.heading("entity", text="Name", anchor=tk.W)
+        self.entity_list.heading("kind", text="Type", anchor=tk.W)
+        self.entity_list.heading("articles", text="Articles", anchor=tk.W)
+        self.entity_list.column("entity", width=250, anchor=tk.W)
+        self.entity_list.column("kind", width=120, anchor=tk.W)
+        self.entity_list.column("articles", width=80, anchor=tk.W)
+        self.entity_list.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        # Clicking a name lists its articles straight from the local index
+        self.entity_list.bind('<<TreeviewSelect>>', self.on_entity_click)
+
+    def refresh_entities_if_visible(self):
+        if self.detail_notebook.select() == str(self.entities_frame):
+            self.refresh_entities()
+
+    def refresh_entities(self):
+        kind = next((k for k, label in KIND_LABELS.items() if label == self.entity_kind_var.get()), None)
+        key = (self.entity_index.version, kind, self.entity_search_var.get())
+        if key == self.entities_shown:
+            return
+        self.entities_shown = key
+        self.entity_list.delete(*self.entity_list.get_children())
+        for name, entity_kind, count in self.entity_index.top(kind, self.entity_search_var.get().strip()):
+            self.entity_list.insert('', 'end', iid=name, values=(name, KIND_LABELS[entity_kind], count))
+
+    def on_entity_click(self, event):
+        selection = self.entity_list.selection()
+        if not selection:
+            return
+        articles = self.entity_index.articles_for(selection[0])
+        self.display_articles(articles)
+        self.loading_var.set(f"🏷️ {selection[0]} - {len(articles)} articles")
+
+    def create_alerts_frame(self):
+        alerts_frame = ttk.Frame(self.detail_notebook)
+        self.detail_notebook.add(alerts_frame, text="🔔 Alerts")
+        self.alerts_frame = alerts_frame
+        
+        toolbar = ttk.Frame(alerts_frame, style='Surface.TFrame')
+        toolbar.pack(fill=tk.X, padx=5, pady=5)
+        
+        # Rules are typed as "Name: term, another phrase, -excluded"
+        ttk.Label(toolbar, text="Watch:").pack(side=tk.LEFT, padx=(0, 5))
+        self.watch_rule_var = tk.StringVar()
+        rule_entry = ttk.Entry(toolbar, textvariable=self.watch_rule_var, width=40)
+        rule_entry.pack(side=tk.LEFT, padx=5)
+        rule_entry.bind('<Return>', lambda e: self.add_watch_rule())
+        self.create_action_button(toolbar, "➕ Add", self.add_watch_rule)
+        self.create_action_button(toolbar, "🧹 Clear Alerts", self.clear_alerts)
+        
+        panes = ttk.PanedWindow(alerts_frame, orient=tk.VERTICAL)
+        panes.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        self.rule_list = ttk.Treeview(panes,
+                                      columns=("name", "terms", "excluded"),
+                                      show="headings",
+                                      height=5,
+                                      style='Article.Treeview')
+        self.rule_list.heading("name", text="Rule", anchor=tk.W)
+        self.rule_list.heading("terms", text="Any of", anchor=tk.W)
+        self.rule_list.heading("excluded", text="Unless", anchor=tk.W)
+        self.rule_list.column("name", width=120, anchor=tk.W)
+        self.rule_list.column("terms", width=250, anchor=tk.W)
+        self.rule_list.column("excluded", width=120, anchor=tk.W)
+        self.rule_list.bind('<Delete>', lambda e: self.remove_watch_rule())
+        panes.add(self.rule_list, weight=1)
+        
+        self.alert_list = ttk.Treeview(panes,
+                                       columns=("time", "rule", "title", "source"),
+                                       show="headings",
+                                       style='Article.Treeview')
+        self.alert_list.heading("time", text="Seen", anchor=tk.W)
+        self.alert_list.heading("rule", text="Rule", anchor=tk.W)
+        self.alert_list.heading("title", text="Title", anchor=tk.W)
+        self.alert_list.heading("source", text="Source", anchor=tk.W)
+        self.alert_list.column("time", width=110, anchor=tk.W)
+        self.alert_list.column("rule", width=100, anchor=tk.W)
+        self.alert_list.column("title", width=350, anchor=tk.W)
+        self.alert_list.column("source", width=120, anchor=tk.W)
+        panes.add(self.alert_list, weight=3)
+        
+        # Double-clicking an alert opens its article
+        self.alert_list.bind('<Double-1>', self.on_alert_open)
+        
+        self.refresh_rules()
+        self.refresh_alerts()
+
+    def check_watchlist(self, articles):
+        started = time.perf_counter()
+        alerts = self.watchlist.scan(articles)
+        self.metrics.observe('watchlist.scan_ms', (time.perf_counter() - started) * 1000)
+        if not alerts:
+            return
+        self.metrics.incr('watchlist.alerts', len(alerts))
+        names = sorted({alert['name'] for alert in alerts})
+        text = f"🔔 {len(alerts)} new alert{'s' if len(alerts) > 1 else ''}: {', '.join(names[:5])}"
+        if len(names) > 5:
+            text += f" and {len(names) - 5} more"
+        # Posted, so it shows after the status line of the fetch that found them
+        self.ui.post(lambda: self.loading_var.set(text), key='status')
+        self.update_alerts_tab_title()
+
+    def update_alerts_tab_title(self):
+        unread = self.watchlist.unread
+        self.detail_notebook.tab(self.alerts_frame, text=f"🔔 Alerts ({unread})" if unread else "🔔 Alerts")
+
+    def refresh_alerts_if_visible(self):
+        if self.detail_notebook.select() == str(self.alerts_frame):
+            self.watchlist.unread = 0
+            self.refresh_alerts()
+        self.update_alerts_tab_title()
+
+    def refresh_alerts(self):
+        self.alert_list.delete(*self.alert_list.get_children())
+        for i, alert in enumerate(self.watchlist.recent()):
+            article = alert['article']
+            seen = datetime.fromtimestamp(alert['time']).strftime('%Y-%m-%d %H:%M')
+            self.alert_list.insert('', 'end', iid=str(i),
+                                   values=(seen, alert['name'], article.get('title') or '',
+                                           (article.get('source') or {}).get('name') or ''))
+
+    def refresh_rules(self):
+        self.rule_list.delete(*self.rule_list.get_children())
+        for rule in self.watchlist.rules:
+            self.rule_list.insert('', 'end', iid=str(rule['id']),
+                                  values=(rule['name'], ', '.join(rule['include']), ', '.join(rule['exclude'])))
+
+    def add_watch_rule(self):
+        text = self.watch_rule_var.get().strip()
+        if not text:
+            return
+        try:
+            rule = self.watchlist.add_rule(text)
+        except ValueError as e:
+            self.show_error(f"Error adding rule: {str(e)}")
+            return
+        self.watch_rule_var.set("")
+        self.refresh_rules()
+        # Check what is already loaded, so a new rule doesn't have to wait for the next fetch
+        self.check_watchlist(self.query_engine.articles)
+        self.refresh_alerts_if_visible()
+        self.loading_var.set(f"🔔 Watching for {', '.join(rule['include'])}")
+
+    def remove_watch_rule(self):
+        for iid in self.rule_list.selection():
+            self.watchlist.remove_rule(int(iid))
+        self.refresh_rules()
+
+    def clear_alerts(self):
+        self.watchlist.clear_alerts()
+        self.refresh_alerts()
+        self.update_alerts_tab_title()
+
+    def on_alert_open(self, event):
+        selection = self.alert_list.selection()
+        if not selection:
+            return
+        alert = self.watchlist.recent()[int(selection[0])]
+        self.display_articles([alert['article']])
+        self.loading_var.set(f"🔔 {alert['name']}: matched {', '.join(alert['terms'])}")
+
+    def refresh_trending(self):
+        self.trending_list.delete(*self.trending_list.get_children())
+        window = TRENDING_WINDOWS[self.trending_window_var.get()]
+        for term, mentions, ratio, score in self.trend_store.rising(window):
+            self.trending_list.insert('', 'end', iid=term, values=(term, mentions, f"×{ratio:.1f}"))
+
+    def on_trending_term_click(self, event):
+        selection = self.trending_list.selection()
+        if not selection:
+            return
+        self.search_entry.delete(0, tk.END)
+        self.search_entry.insert(0, selection[0])
+        self.current_page = 1
+        self.submit_search()
+
+    def refresh_saved_articles(self):
+        with self.profiler.span('saved rescan'):
+            self.list_saved_articles()
+
+    def list_saved_articles(self):
         save_folder = self.get_save_folder()
         
         try:
-            # Get all text files in the save folder
+            # File names carry the date prefix and title, so listing the folder is enough;
+            # dates and sources are read only for rows scrolled into view
             files = [f for f in os.listdir(save_folder) if f.endswith('.txt')]
-            
-            for file in sorted(files, reverse=True):
-                # Get file creation/modification time
-                file_path = os.path.join(save_folder, file)
-                timestamp = os.path.getmtime(file_path)
-                date_str = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M')
-                
-                # Get title from filename (remove date prefix and .txt)
-                title = file[9:-4].replace('_', ' ')  # Remove YYYYMMDD_ prefix
-                
-                # Get source from file content
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        # Look for the line starting with "📰 Source:"
-                        for line in content.split('\n'):
-                            if '📰 Source:' in line:
-                                source = line.split('📰 Source:')[1].strip()
-                                break
-                        else:
-                            source = "Unknown"
-                except:
-                    source = "Unknown"
-                
-                self.saved_list.insert('', 'end', values=(title, date_str, source), tags=(file_path,))
+            self.saved_files = [os.path.join(save_folder, f) for f in sorted(files, reverse=True)]
+            self.saved_keys = [self.saved_title(path).lower() for path in self.saved_files]
+            if self.saved_index_ready:
+                self.sync_saved_index()
+            self.filter_saved_articles()
             
             # Update status
             self.loading_var.set(f"📂 Found {len(files)} saved articles")
@@ -1215,6 +2300,101 @@ class NewsApp:
         except Exception as e:
             self.show_error(f"Error loading saved articles: {str(e)}")
 
+    def sync_saved_index(self):
+        # Files added or removed outside the app; new ones are indexed by file name until read
+        listed = set(self.saved_files)
+        for path in self.saved_index.keys():
+            if path not in listed:
+                self.saved_index.remove(path)
+                self.entity_index.remove_saved(path)
+        for path in listed:
+            if path not in self.saved_index:
+                self.saved_index.add(path, f"{self.saved_title(path)} {self.saved_sources.get(path) or ''}")
+
+    def saved_title(self, file_path):
+        return os.path.basename(file_path)[9:-4].replace('_', ' ')  # Remove YYYYMMDD_ prefix and .txt
+
+    def saved_row(self, files, index):
+        file_path = files[index]
+        try:
+            date_str = datetime.fromtimestamp(os.path.getmtime(file_path)).strftime('%Y-%m-%d %H:%M')
+        except OSError:
+            date_str = ""
+        return (self.saved_title(file_path), date_str, self.saved_source(file_path)), ()
+
+    def saved_source(self, file_path):
+        source = self.saved_sources.get(file_path)
+        if source is not None:
+            return source
+        source = "Unknown"
+        try:
+            # The source line sits in the header, so the start of the file is enough
+            with open(file_path, 'r', encoding='utf-8') as f:
+                for line in f.read(SAVED_HEADER_CHARS).split('\n'):
+                    if '📰 Source:' in line:
+                        source = line.split('📰 Source:')[1].strip()
+                        break
+        except (OSError, UnicodeDecodeError):
+            pass
+        self.saved_sources.put(file_path, source)
+        return source
+
+    def read_saved_article(self, file_path):
+        # Parse the layout written by save_article back into an article dict
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        
+        article = {'path': file_path, 'source': {'name': ''}}
+        fields = {'Title:': 'title', '✍️ Author:': 'author', '🕒 Date:': 'publishedAt', '🌐 URL:': 'url'}
+        lines = content.split('\n')
+        section = None
+        sections = {'description': [], 'content': []}
+        for i, line in enumerate(lines):
+            if line.startswith('📰 Source:'):
+                article['source'] = {'name': line[len('📰 Source:'):].strip()}
+                continue
+            for prefix, key in fields.items():
+                if line.startswith(prefix) and key not in article:
+                    article[key] = line[len(prefix):].strip()
+                    break
+            else:
+                if line in ('Description:', 'Content:') and i + 1 < len(lines) and lines[i + 1].startswith('-'):
+                    section = line[:-1].lower()
+                elif section and not line.startswith('-' * 20):
+                    sections[section].append(line)
+        article['description'] = '\n'.join(sections['description']).strip()
+        article['content'] = '\n'.join(sections['content']).strip()
+        return article
+
+    def index_saved_articles(self):
+        # Runs on a worker: saved files are parsed and added to the entity and title indexes
+        with self.profiler.span('saved index'):
+            self.read_saved_library()
+
+    def read_saved_library(self):
+        save_folder = self.get_save_folder()
+        articles = []
+        try:
+            for file in os.listdir(save_folder):
+                if file.endswith('.txt'):
+                    try:
+                        articles.append(self.read_saved_article(os.path.join(save_folder, file)))
+                    except (OSError, UnicodeDecodeError):
+                        continue
+            self.entity_index.add(articles)
+            self.saved_index.add_many((a['path'], self.title_text(a)) for a in articles)
+        except Exception as e:
+            print(f"Error indexing saved articles: {e}")
+            return
+        self.ui.post(self.refresh_entities_if_visible, key='entities')
+        self.ui.post(self.on_saved_index_ready)
+
+    def on_saved_index_ready(self):
+        self.saved_index_ready = True
+        self.sync_saved_index()
+        if self.saved_search_var.get().strip():
+            self.filter_saved_articles()
+
     def open_selected_saved(self):
         file_path = self.get_selected_saved_path()
         if file_path:
@@ -1228,58 +2408,219 @@ class NewsApp:
         if file_path:
             if messagebox.askyesno("Delete Article", "Are you sure you want to delete this saved article?"):
                 try:
+                    # Lets a later sync delete the copies on other machines too
+                    record_tombstone(os.path.dirname(file_path), os.path.basename(file_path))
                     os.remove(file_path)
+                    self.saved_index.remove(file_path)
+                    self.entity_index.remove_saved(file_path)
                     self.refresh_saved_articles()
                     self.show_success("Article deleted successfully")
                 except Exception as e:
                     self.show_error(f"Error deleting file: {str(e)}")
 
-    def filter_saved_articles(self, *args):
-        search_term = self.saved_search_var.get().lower()
+    def import_urls(self):
+        if self.import_job is not None:
+            if messagebox.askyesno("Import URLs", "Pause the running import? It resumes on the next start."):
+                self.import_job.cancel()
+            return
+        path = filedialog.askopenfilename(
+            title="Import URLs",
+            filetypes=[("URL lists and bookmarks", "*.txt *.html *.htm *.json"), ("All files", "*")])
+        if not path:
+            return
+        try:
+            urls = read_url_list(path)
+        except (OSError, ValueError) as e:
+            self.show_error(f"Error reading {os.path.basename(path)}: {str(e)}")
+            return
+        if not urls:
+            self.show_error("No web addresses found in that file")
+            return
+        folder = self.get_data_folder(IMPORT_FOLDER)
+        self.start_import(ImportJob.log_path_for(folder, urls), urls)
+
+    def resume_imports(self):
+        # Runs on a worker: jobs cut short by a restart pick up where their log stops
+        try:
+            unfinished = ImportJob.unfinished(self.get_data_folder(IMPORT_FOLDER))
+        except OSError as e:
+            print(f"Error looking for unfinished imports: {e}")
+            return
+        if unfinished:
+            self.ui.post(lambda: self.start_import(unfinished[0]))
+
+    def start_import(self, log_path, urls=None):
+        if self.import_job is not None:
+            return
+        self.loading_var.set("📥 Starting import...")
+        self.import_job = ImportJob(log_path, self.write_imported_article, [],
+                                    on_progress=self.on_import_progress, on_done=self.on_import_done)
         
-        # Clear and reload list
-        for item in self.saved_list.get_children():
-            self.saved_list.delete(item)
+        def run():
+            # Existing saves are read here rather than on the Tk thread
+            self.import_job.existing.update(normalize_url(url) for url in self.saved_urls())
+            self.import_job.run(urls)
         
+        threading.Thread(target=run, name="bulk-import", daemon=True).start()
+
+    def saved_urls(self):
+        urls = []
         save_folder = self.get_save_folder()
-        files = [f for f in os.listdir(save_folder) if f.endswith('.txt')]
+        for file in os.listdir(save_folder):
+            if not file.endswith('.txt'):
+                continue
+            try:
+                with open(os.path.join(save_folder, file), 'r', encoding='utf-8') as f:
+                    for line in f.read(SAVED_HEADER_CHARS).split('\n'):
+                        if line.startswith('🌐 URL:'):
+                            urls.append(line[len('🌐 URL:'):].strip())
+                            break
+            except (OSError, UnicodeDecodeError):
+                continue
+        return urls
+
+    def write_imported_article(self, article):
+        # Called from the import's writer thread
+        full_path = self.write_saved_article(article)
+        self.saved_index.add(full_path, self.title_text(article))
+        self.entity_index.add([{**article, 'path': full_path}])
+        return full_path
+
+    def on_import_progress(self, job):
+        counts = dict(job.counts)
+        text = (f"📥 Importing {job.done}/{job.total}: {counts['saved']} saved, "
+                f"{counts['duplicate']} already saved, {counts['failed']} failed")
+        self.ui.post(lambda: self.loading_var.set(text), key='status')
+        self.ui.post(self.refresh_saved_articles, key='saved')
+
+    def on_import_done(self, job):
+        def finish():
+            self.import_job = None
+            self.refresh_saved_articles()
+            counts = job.counts
+            if 'error' in counts:
+                self.show_error(f"Import stopped: {counts['error']}")
+            elif job.cancelled.is_set():
+                self.loading_var.set(f"⏸ Import paused at {job.done}/{job.total}")
+            else:
+                self.show_success(f"Imported {counts['saved']} articles "
+                                  f"({counts['duplicate']} already saved, {counts['failed']} failed)")
+        self.ui.post(finish, key='status')
+
+    def export_library(self):
+        if self.library_job is not None:
+            self.show_error("A library export or restore is already running")
+            return
+        path = filedialog.asksaveasfilename(
+            title="Export Saved Library",
+            defaultextension=".tar.gz",
+            initialfile=f"NewsApp_Library_{datetime.now().strftime('%Y%m%d')}.tar.gz",
+            filetypes=[("Library archive", "*.tar.gz")])
+        if not path:
+            return
+        job = LibraryExport(self.get_save_folder(), path, on_progress=lambda job: self.ui.post(
+            lambda: self.loading_var.set(f"📦 Exporting {job.state['files']}/{job.total} articles..."),
+            key='status'))
+        self.run_library_job(job, lambda job: f"Exported {job.state['files']} articles to {path}")
+
+    def restore_library(self):
+        if self.library_job is not None:
+            self.show_error("A library export or restore is already running")
+            return
+        path = filedialog.askopenfilename(title="Restore Saved Library",
+                                          filetypes=[("Library archive", "*.tar.gz"), ("All files", "*")])
+        if not path:
+            return
+        job = LibraryImport(self.get_save_folder(), path, on_progress=lambda job: self.ui.post(
+            lambda: self.loading_var.set(
+                f"📦 Restoring {job.done_bytes * 100 // max(1, job.total_bytes)}%: "
+                f"{job.state['imported']} added, {job.state['duplicates']} already saved"), key='status'))
+        self.run_library_job(job, lambda job: (f"Restored {job.state['imported']} articles "
+                                               f"({job.state['duplicates']} already saved, "
+                                               f"{job.state['renamed']} renamed)"))
+
+    def run_library_job(self, job, describe):
+        # Export, restore and sync all pick up where they stopped when run again
+        self.library_job = job
+        self.loading_var.set("📦 Starting...")
+        
+        def run():
+            try:
+                finished = job.run() is not None
+                if isinstance(job, LibraryImport) and job.imported_paths:
+                    articles = []
+                    for path in job.imported_paths:
+                        try:
+                            articles.append(self.read_saved_article(path))
+                        except (OSError, UnicodeDecodeError):
+                            continue
+                    self.entity_index.add(articles)
+                    self.saved_index.add_many((a['path'], self.title_text(a)) for a in articles)
+            except Exception as e:
+                error = e  # e itself is cleared when the except block ends
+                self.ui.post(lambda: self.finish_library_job(error=error))
+                return
+            self.ui.post(lambda: self.finish_library_job(describe(job) if finished else None))
         
-        for file in sorted(files, reverse=True):
-            title = file[9:-4].replace('_', ' ')  # Remove date prefix and .txt
-            
-            # Only add if search term is in title
-            if search_term in title.lower():
-                file_path = os.path.join(save_folder, file)
-                timestamp = os.path.getmtime(file_path)
-                date_str = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M')
-                
-                # Get source from file content - improved parsing
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        # Look for the line starting with "📰 Source:"
-                        for line in content.split('\n'):
-                            if '📰 Source:' in line:
-                                source = line.split('📰 Source:')[1].strip()
-                                break
-                        else:
-                            source = "Unknown"
-                except:
-                    source = "Unknown"
-                
-                self.saved_list.insert('', 'end', values=(title, date_str, source), tags=(file_path,))
+        threading.Thread(target=run, name="library-archive", daemon=True).start()
+
+    def sync_library(self):
+        if self.library_job is not None:
+            self.show_error("A library export, restore or sync is already running")
+            return
+        if not self.sync_hub:
+            hub = filedialog.askdirectory(title="Choose a shared folder to sync the library through")
+            if not hub:
+                return
+            self.sync_hub = hub
+            self.save_settings()
+        job = LibrarySync(self.get_save_folder(), open_transport(self.sync_hub))
+        self.run_library_job(job, lambda job: (
+            f"Synced: {job.counts['downloaded']} received, {job.counts['uploaded']} sent, "
+            f"{job.counts['deleted_here'] + job.counts['deleted_there']} deleted, "
+            f"{job.counts['conflicts']} kept as copies"))
+        self.loading_var.set(f"🔁 Syncing with {self.sync_hub}...")
+
+    def finish_library_job(self, message=None, error=None):
+        self.library_job = None
+        self.refresh_saved_articles()
+        if error is not None:
+            self.show_error(f"Library archive failed: {str(error)}")
+        elif message:
+            self.show_success(message)
+        else:
+            self.loading_var.set("⏸ Stopped - run it again on the same archive to resume")
+
+    def on_saved_search_change(self, *args):
+        self.recorder.record('saved_filter', term=self.saved_search_var.get())
+        self.filter_saved_articles()
+
+    def filter_saved_articles(self, *args):
+        search_term = self.saved_search_var.get().lower()
+        
+        # Only titles are matched, so filtering never touches the files. Exact matches keep
+        # their date order; close matches from the trigram index follow, best first
+        files = [path for path, key in zip(self.saved_files, self.saved_keys) if search_term in key]
+        if search_term.strip() and self.saved_index_ready:
+            exact = set(files)
+            files += [path for path, score in self.saved_index.search(search_term, limit=SAVED_FUZZY_LIMIT)
+                      if path not in exact]
+        self.saved_view.set_model(len(files), lambda i: self.saved_row(files, i))
+        self.shown_saved_files = files
 
     def show_saved_context_menu(self, event):
         try:
-            self.saved_list.selection_set(self.saved_list.identify_row(event.y))
+            index = self.saved_view.index_at(event.y)
+            if index is not None:
+                self.saved_view.select(index)
             self.saved_context_menu.tk_popup(event.x_root, event.y_root)
         finally:
             self.saved_context_menu.grab_release()
 
     def get_selected_saved_path(self):
-        selection = self.saved_list.selection()
-        if selection:
-            return self.saved_list.item(selection[0])['tags'][0]
+        index = self.saved_view.selected_index()
+        if index is not None and index < len(self.shown_saved_files):
+            return self.shown_saved_files[index]
         return None
 
     def load_settings(self):
@@ -1290,13 +2631,15 @@ class NewsApp:
                     settings = json.load(f)
                     self.font_size_var.set(settings.get('font_size', '11'))
                     self.current_font_size = int(self.font_size_var.get())
+                    self.sync_hub = SYNC_HUB or settings.get('sync_hub')
         except:
             pass
 
     def save_settings(self):
         try:
             settings = {
-                'font_size': self.font_size_var.get()
+                'font_size': self.font_size_var.get(),
+                'sync_hub': getattr(self, 'sync_hub', None)
             }
             settings_path = os.path.join(self.get_save_folder(), "settings.json")
             with open(settings_path, 'w') as f:
@@ -1304,6 +2647,254 @@ class NewsApp:
         except:
             pass
 
+    def current_query(self):
+        query = self.search_var.get().strip()
+        return "" if query == SEARCH_PLACEHOLDER else query
+
+    def get_session_path(self):
+        return os.path.join(self.get_save_folder(), SESSION_FILE)
+
+    def build_session_snapshot(self):
+        view = self.view_var.get() if hasattr(self, 'view_var') else "list"
+        return {
+            'version': SESSION_VERSION,
+            'source': self.active_source,
+            'query': self.current_query(),
+            'category': getattr(self, 'current_category', None),
+            'page': getattr(self, 'current_page', 1),
+            'sort': self.sort_var.get(),
+            'sort_by': self.search_sort_by,
+            'view': view,
+            'grouped': self.group_var.get(),
+            'total_results': getattr(self, 'total_results', 0),
+            'articles': getattr(self, 'current_articles', []),
+            'selected': self.get_selected_index(),
+            'scroll': self.article_view.fraction()
+        }
+
+    def save_session(self):
+        try:
+            snapshot = self.build_session_snapshot()
+            data = json.dumps(snapshot, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+            
+            # Skip the disk write when nothing changed since the last snapshot
+            if data == getattr(self, '_session_data', None):
+                return
+            
+            # Write to a temp file and swap it in so a crash never leaves a torn snapshot
+            session_path = self.get_session_path()
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(session_path), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(gzip.compress(data, compresslevel=6))
+                os.replace(tmp_path, session_path)
+            except:
+                os.remove(tmp_path)
+                raise
+            self._session_data = data
+        except Exception as e:
+            print(f"Error saving session: {e}")
+
+    def load_session(self):
+        try:
+            with open(self.get_session_path(), 'rb') as f:
+                snapshot = json.loads(gzip.decompress(f.read()).decode('utf-8'))
+            if snapshot.get('version') == SESSION_VERSION:
+                return snapshot
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error loading session: {e}")
+        return None
+
+    def restore_session(self):
+        snapshot = self.load_session()
+        if not snapshot or not snapshot.get('articles'):
+            return False
+        
+        # Restore query state before rendering
+        if snapshot.get('query'):
+            self.search_entry.delete(0, tk.END)
+            self.search_entry.insert(0, snapshot['query'])
+        if snapshot.get('source') in self.sources:
+            self.active_source = snapshot['source']
+        self.current_category = snapshot.get('category')
+        self.current_page = snapshot.get('page', 1)
+        self.total_results = snapshot.get('total_results', 0)
+        self.sort_var.set(snapshot.get('sort', self.sort_var.get()))
+        self.search_sort_by = snapshot.get('sort_by', SORT_OPTIONS.get(self.sort_var.get(), (None, None))[1])
+        self.group_var.set(snapshot.get('grouped', False))
+        self.article_list.configure(show="tree headings" if self.group_var.get() else "headings")
+        self.update_stats()
+        
+        # Render the cached articles straight away
+        self.ingest_articles(snapshot['articles'], self.current_scope(), (self.current_page - 1) * 20)
+        self.display_articles(snapshot['articles'])
+        selected = snapshot.get('selected')
+        if selected is not None and selected < len(snapshot['articles']):
+            self.article_view.select(selected)
+        self.root.after_idle(lambda: self.article_view.yview('moveto', snapshot.get('scroll', 0)))
+        
+        if snapshot.get('view') == "cards":
+            self.view_var.set("cards")
+            self.toggle_view()
+        
+        # Revalidate against the network in the background
+        self.revalidate_session()
+        return True
+
+    def revalidate_session(self):
+        source = self.sources[self.active_source]
+        query = self.current_query()
+        category = getattr(self, 'current_category', None)
+        page = self.current_page
+        sort_by = self.search_sort_by  # Refetch in the order the shown results were ranked by
+        state = (self.active_source, query, category, page)
+        
+        def revalidate():
+            try:
+                if query:
+                    articles, total = source.search(query, page=page, page_size=20, sort_by=sort_by)
+                else:
+                    articles, total = source.top_headlines(category, page=page, page_size=20)
+            except Exception as e:
+                print(f"Error revalidating session: {e}")
+                return
+            self.ui.post(lambda: self.apply_revalidated(state, articles, total), key='revalidate')
+        
+        threading.Thread(target=revalidate, daemon=True).start()
+
+    def apply_revalidated(self, state, articles, total):
+        # Drop stale results if the user has navigated away in the meantime
+        if state != (self.active_source, self.current_query(), getattr(self, 'current_category', None), self.current_page):
+            return
+        if not articles:
+            return
+        
+        selected_before = self.get_selected_article()
+        
+        self.total_results = total
+        self.update_stats()
+        self.ingest_articles(articles, self.current_scope(), (self.current_page - 1) * 20)
+        if self.group_var.get():
+            # Story groups may have changed shape, so regroup the whole page
+            index = self.get_selected_index()
+            self.display_articles(articles)
+            changed = len(articles)
+            if index is not None and index < len(articles):
+                self.article_view.select(index)
+        else:
+            changed = self.update_articles(articles)
+        
+        selected_after = self.get_selected_article()
+        if selected_after and selected_after != selected_before:
+            self.display_article_details(selected_after)
+        if changed:
+            self.loading_var.set(f"🔄 Updated {changed} articles")
+
+    def save_local_state(self):
+        self.save_session()
+        try:
+            self.trend_store.save(self.get_data_folder())
+        except Exception as e:
+            print(f"Error saving trending terms: {e}")
+        try:
+            self.watchlist.save(self.get_data_folder())
+        except Exception as e:
+            print(f"Error saving watchlist: {e}")
+        self.archive.flush()
+        try:
+            self.ranker.flush()
+        except Exception as e:
+            print(f"Error saving reading activity: {e}")
+        try:
+            self.thumbnail_store.flush()
+        except Exception as e:
+            print(f"Error saving thumbnail index: {e}")
+
+    def snapshot_session_periodically(self):
+        self.save_local_state()
+        self.root.after(SESSION_SNAPSHOT_INTERVAL_MS, self.snapshot_session_periodically)
+
+    def on_close(self):
+        self.finish_reading()
+        if self.import_job is not None:
+            self.import_job.cancel()
+        if self.library_job is not None:
+            self.library_job.cancel()
+        self.recorder.stop()
+        self.save_local_state()
+        self.archive.flush(wait=True)
+        self.thumbnail_store.close()
+        if self.instance_server:
+            self.instance_server.close()
+        self.watchdog.stop()
+        self.ui.stop()
+        self.root.destroy()
+
+    def toggle_profiler(self):
+        if not self.profiler.running:
+            self.profiler.start()
+            self.loading_var.set("⏺ Profiling all threads - press Ctrl+Shift+P again to stop and save")
+            return
+        
+        self.profiler.stop()
+        self.save_profile()
+
+    def save_profile(self):
+        self.loading_var.set("💾 Writing profile...")
+        folder = os.path.join(self.get_save_folder(), PROFILE_FOLDER)
+        
+        def write():
+            try:
+                os.makedirs(folder, exist_ok=True)
+                speedscope_path, _ = self.profiler.write(folder)
+            except Exception as e:
+                message = f"Error writing profile: {str(e)}"  # e is cleared when the except block ends
+                self.ui.post(lambda: self.show_error(message), key='status')
+                return
+            self.ui.post(lambda: self.show_success(
+                f"Profile saved to {speedscope_path} (open it at speedscope.app)"), key='status')
+        
+        threading.Thread(target=write, daemon=True).start()
+
+    def toggle_recording(self):
+        if self.recorder.active:
+            path = self.recorder.stop()
+            self.show_success(f"Session saved to {path} - replay it with session_replay.py")
+            return
+        folder = os.path.join(self.get_save_folder(), SESSION_FOLDER)
+        try:
+            os.makedirs(folder, exist_ok=True)
+            self.recorder.start(os.path.join(folder, f"session-{datetime.now().strftime('%Y%m%d-%H%M%S')}.jsonl"))
+        except OSError as e:
+            self.show_error(f"Error starting session recording: {str(e)}")
+            return
+        self.loading_var.set("⏺ Recording session - press Ctrl+Shift+R again to stop")
+
+    def start_instance_server(self):
+        server = single_instance.InstanceServer(lambda command: self.ui.post(lambda: self.run_command(command)))
+        try:
+            if server.start():
+                self.instance_server = server
+        except OSError as e:
+            print(f"Error starting single-instance listener: {e}")
+
+    def run_command(self, command):
+        # Commands from the command line or from a later launch, run against this window's state
+        self.root.deiconify()
+        self.root.lift()
+        self.root.focus_force()
+        action = command.get('action')
+        if action == 'search' and command.get('query'):
+            self.search_entry.delete(0, tk.END)
+            self.search_entry.insert(0, command['query'])
+            self.search_entry.config(foreground='black')
+            self.current_page = 1
+            self.search_news()
+        elif action == 'headlines':
+            self.filter_category(command.get('category'))
+
     def show_api_key_dialog(self):
         dialog = tk.Toplevel(self.root)
         dialog.title("API Key Required")
@@ -1330,8 +2921,13 @@ class NewsApp:
         ttk.Button(frame, text="Save", command=save_key).pack()
 
 def main():
+    command = single_instance.parse_command(sys.argv[1:])
     root = tk.Tk()
     app = NewsApp(root)
+    if not command['new_instance']:
+        app.start_instance_server()
+    if command['action'] != 'show':
+        root.after_idle(lambda: app.run_command(command))
     root.mainloop()
 
 if __name__ == "__main__":
@@ -0,0 +1,289 @@
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import html
+import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+import requests
+
+# Every source returns articles in the NewsAPI shape consumed by
+# display_articles and save_article:
+# {'source': {'id', 'name'}, 'author', 'title', 'description', 'url',
+#  'urlToImage', 'publishedAt', 'content'}
+
+FEED_TIMEOUT = 15
+FEED_POLL_INTERVAL = 60  # Seconds between polls of the same feed
+FEED_MAX_ITEMS = 500     # Items kept per feed
+FEED_WORKERS = 8
+NEWSAPI_BASE_URL = "https://newsapi.org"
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+RSS1 = '{http://purl.org/rss/1.0/}'
+DC = '{http://purl.org/dc/elements/1.1/}'
+CONTENT = '{http://purl.org/rss/1.0/modules/content/}'
+MEDIA = '{http://search.yahoo.com/mrss/}'
+
+ITEM_TAGS = {'item', RSS1 + 'item', ATOM + 'entry'}
+CHANNEL_TITLE_TAGS = {'title', RSS1 + 'title', ATOM + 'title'}
+
+TAG_RE = re.compile(r'<[^>]+>')
+SPACE_RE = re.compile(r'\s+')
+
+
+class RebasedSession(requests.Session):
+    # Sends NewsApiClient traffic to another host, e.g. the local fixture server
+    def __init__(self, base_url):
+        super().__init__()
+        self.base_url = base_url.rstrip('/')
+
+    def request(self, method, url, *args, **kwargs):
+        if url.startswith(NEWSAPI_BASE_URL):
+            url = self.base_url + url[len(NEWSAPI_BASE_URL):]
+        return super().request(method, url, *args, **kwargs)
+
+
+class NewsSource(ABC):
+    name = "source"
+
+    @abstractmethod
+    def top_headlines(self, category=None, page=1, page_size=20):
+        """Returns (articles, total results)."""
+
+    @abstractmethod
+    def search(self, query, page=1, page_size=20, sort_by=None):
+        """Returns (articles, total results)."""
+
+
+class NewsApiSource(NewsSource):
+    name = "newsapi"
+
+    def __init__(self, client):
+        self.client = client
+
+    def top_headlines(self, category=None, page=1, page_size=20):
+        params = {
+            'country': 'us',
+            'language': 'en',
+            'page': page,
+            'page_size': page_size
+        }
+        if category:
+            params['category'] = category
+        response = self.client.get_top_headlines(**params)
+        return response.get('articles', []), response.get('totalResults', 0)
+
+    def search(self, query, page=1, page_size=20, sort_by=None):
+        params = {
+            'q': query,
+            'language': 'en',
+            'page': page,
+            'page_size': page_size
+        }
+        if sort_by:
+            params['sort_by'] = sort_by
+        response = self.client.get_everything(**params)
+        return response.get('articles', []), response.get('totalResults', 0)
+
+
+def clean_text(value):
+    if not value:
+        return ''
+    return SPACE_RE.sub(' ', html.unescape(TAG_RE.sub(' ', value))).strip()
+
+
+def normalize_date(value):
+    if not value:
+        return ''
+    value = value.strip()
+    try:
+        dt = parsedate_to_datetime(value)  # RSS 2.0 (RFC 822)
+    except (TypeError, ValueError):
+        try:
+            dt = datetime.fromisoformat(value.replace('Z', '+00:00'))  # Atom / Dublin Core
+        except ValueError:
+            return ''
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _text(elem, *tags):
+    for tag in tags:
+        child = elem.find(tag)
+        if child is not None and (child.text or '').strip():
+            return child.text.strip()
+    return ''
+
+
+def _link(elem):
+    link = _text(elem, 'link', RSS1 + 'link')
+    if link:
+        return link
+    fallback = ''
+    for child in elem.findall(ATOM + 'link'):
+        rel = child.get('rel', 'alternate')
+        if rel == 'alternate':
+            return child.get('href', '')
+        fallback = fallback or child.get('href', '')
+    return fallback or _text(elem, 'guid', ATOM + 'id')
+
+
+def _image(elem):
+    for tag in (MEDIA + 'thumbnail', MEDIA + 'content'):
+        for child in elem.iter(tag):
+            if child.get('url') and child.get('medium', 'image') == 'image':
+                return child.get('url')
+    for child in elem.findall('enclosure') + elem.findall(ATOM + 'link'):
+        if child.get('type', '').startswith('image/'):
+            return child.get('url') or child.get('href')
+    return None
+
+
+def _author(elem):
+    author = _text(elem, DC + 'creator', 'author')
+    if not author:
+        atom_author = elem.find(ATOM + 'author')
+        if atom_author is not None:
+            author = _text(atom_author, ATOM + 'name')
+    return author or None
+
+
+def normalize_item(elem, feed_title, feed_url):
+    description = clean_text(_text(elem, 'description', RSS1 + 'description', ATOM + 'summary'))
+    content = clean_text(_text(elem, CONTENT + 'encoded', ATOM + 'content')) or description
+    return {
+        'source': {'id': feed_url, 'name': feed_title or feed_url},
+        'author': _author(elem),
+        'title': clean_text(_text(elem, 'title', RSS1 + 'title', ATOM + 'title')),
+        'description': description,
+        'url': _link(elem),
+        'urlToImage': _image(elem),
+        'publishedAt': normalize_date(_text(elem, 'pubDate', ATOM + 'published', ATOM + 'updated', DC + 'date')),
+        'content': content
+    }
+
+
+def parse_feed(chunks, feed_url):
+    # Incremental parse: items are emitted as soon as their end tag arrives
+    # and cleared right away, so memory stays flat for large feeds
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    feed_title = ''
+    depth = 0
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, elem in parser.read_events():
+            if event == 'start':
+                if elem.tag in ITEM_TAGS:
+                    depth += 1
+                continue
+            if elem.tag in ITEM_TAGS:
+                depth -= 1
+                yield normalize_item(elem, feed_title, feed_url)
+                elem.clear()
+            elif not feed_title and depth == 0 and elem.tag in CHANNEL_TITLE_TAGS:
+                feed_title = clean_text(elem.text)
+    parser.close()
+
+
+class FeedSource:
+    # One polled feed; FeedCollection is the NewsSource built on top of these
+    name = "feed"
+
+    def __init__(self, url, session=None):
+        self.url = url
+        self.session = session or requests.Session()
+        self.etag = None
+        self.last_modified = None
+        self.items = []
+        self.last_poll = 0
+        self.polls = 0
+        self.not_modified = 0
+        self.lock = threading.Lock()
+
+    def poll(self, force=False):
+        # Returns True when the feed changed since the last poll
+        if not force and time.time() - self.last_poll < FEED_POLL_INTERVAL:
+            return False
+
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+
+        with self.session.get(self.url, headers=headers, timeout=FEED_TIMEOUT, stream=True) as response:
+            self.last_poll = time.time()
+            self.polls += 1
+            if response.status_code == 304:
+                self.not_modified += 1
+                return False
+            response.raise_for_status()
+
+            items = []
+            for item in parse_feed(response.iter_content(chunk_size=16384), self.url):
+                if item['title'] and item['url']:
+                    items.append(item)
+                if len(items) >= FEED_MAX_ITEMS:
+                    break
+
+            with self.lock:
+                self.items = items
+                self.etag = response.headers.get('ETag')
+                self.last_modified = response.headers.get('Last-Modified')
+        return True
+
+
+class FeedCollection(NewsSource):
+    name = "feeds"
+
+    def __init__(self, urls, session=None):
+        self.session = session or requests.Session()
+        self.feeds = [FeedSource(url, self.session) for url in urls]
+        self.errors = {}
+
+    def poll_all(self, force=False):
+        # Poll every feed concurrently; unchanged feeds cost a single 304
+        def poll(feed):
+            try:
+                changed = feed.poll(force)
+                self.errors.pop(feed.url, None)
+                return changed
+            except Exception as e:
+                self.errors[feed.url] = str(e)
+                return False
+
+        if not self.feeds:
+            return 0
+        with ThreadPoolExecutor(max_workers=min(FEED_WORKERS, len(self.feeds))) as pool:
+            return sum(pool.map(poll, self.feeds))
+
+    def articles(self):
+        seen = set()
+        articles = []
+        for feed in self.feeds:
+            with feed.lock:
+                items = list(feed.items)
+            for item in items:
+                if item['url'] not in seen:
+                    seen.add(item['url'])
+                    articles.append(item)
+        articles.sort(key=lambda a: a.get('publishedAt') or '', reverse=True)
+        return articles
+
+    def _page(self, articles, page, page_size):
+        start = (page - 1) * page_size
+        return articles[start:start + page_size], len(articles)
+
+    def top_headlines(self, category=None, page=1, page_size=20):
+        self.poll_all()
+        return self._page(self.articles(), page, page_size)
+
+    def search(self, query, page=1, page_size=20, sort_by=None):
+        self.poll_all()
+        terms = query.lower().split()
+        matches = [a for a in self.articles()
+                   if all(t in f"{a['title']} {a['description']}".lower() for t in terms)]
+        return self._page(matches, page, page_size)
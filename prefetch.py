@@ -0,0 +1,178 @@
+from collections import OrderedDict
+import itertools
+import queue
+import threading
+import time
+
+MIN_DISTANCE = 1
+MAX_DISTANCE = 6
+FAST_INTERVAL = 0.15   # Seconds between selections that count as scrolling
+SLOW_INTERVAL = 1.0
+WORKERS = 2
+
+
+class LruCache:
+    def __init__(self, max_items=256, max_bytes=None):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.items = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def __contains__(self, key):
+        with self.lock:
+            return key in self.items
+
+    def __len__(self):
+        with self.lock:
+            return len(self.items)
+
+    def get(self, key, default=None):
+        with self.lock:
+            if key not in self.items:
+                return default
+            self.items.move_to_end(key)
+            return self.items[key]
+
+    def put(self, key, value):
+        with self.lock:
+            if key in self.items:
+                self.size -= self._sizeof(self.items.pop(key))
+            self.items[key] = value
+            self.size += self._sizeof(value)
+            while self.items and (len(self.items) > self.max_items or
+                                  (self.max_bytes and self.size > self.max_bytes)):
+                _, evicted = self.items.popitem(last=False)
+                self.size -= self._sizeof(evicted)
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+            self.size = 0
+
+    def _sizeof(self, value):
+        return len(value) if self.max_bytes and isinstance(value, (bytes, bytearray)) else 0
+
+
+class NeighbourPrefetcher:
+    """Warms caches for the rows around the selection at low priority.
+
+    The look-ahead distance follows the selection speed: holding an arrow key
+    widens it (biased in the direction of travel), reading one article at a
+    time narrows it back down. Work queued for an older list, or for a row
+    that has fallen out of the current look-ahead window, is dropped; rows
+    still ahead of a held arrow key keep their queued work. Loaders marked
+    settle (the ones that spend API quota) are queued only through on_settle
+    once the selection has stopped moving, and dropped as soon as it moves.
+    """
+
+    def __init__(self, loaders, metrics=None, workers=WORKERS):
+        # loaders: name -> (function(article), max distance or None, settle)
+        self.loaders = loaders
+        self.metrics = metrics
+        self.queue = queue.PriorityQueue()
+        self.sequence = itertools.count()
+        self.generation = 0
+        self.selection = 0
+        self.window = (0, -1)    # Rows the current selection wants warmed
+        self.queued = {}         # (generation, name, row) -> sequence of its newest queue entry
+        self.last_index = None
+        self.last_time = 0.0
+        self.interval = SLOW_INTERVAL
+        self.distance = MIN_DISTANCE
+        for i in range(workers):
+            threading.Thread(target=self._work, name=f"prefetch-{i}", daemon=True).start()
+
+    def adapt(self, index):
+        now = time.monotonic()
+        elapsed = now - self.last_time if self.last_time else SLOW_INTERVAL
+        # Exponentially weighted inter-selection interval
+        self.interval = 0.6 * self.interval + 0.4 * min(elapsed, SLOW_INTERVAL)
+        if self.interval <= FAST_INTERVAL:
+            self.distance = MAX_DISTANCE
+        elif self.interval >= SLOW_INTERVAL:
+            self.distance = MIN_DISTANCE
+        else:
+            span = (SLOW_INTERVAL - self.interval) / (SLOW_INTERVAL - FAST_INTERVAL)
+            self.distance = MIN_DISTANCE + round(span * (MAX_DISTANCE - MIN_DISTANCE))
+
+        direction = 0
+        if self.last_index is not None and index != self.last_index:
+            direction = 1 if index > self.last_index else -1
+        self.last_index = index
+        self.last_time = now
+        return direction
+
+    def on_select(self, articles, index):
+        # Queued work for rows outside the new window goes stale, the rest is kept
+        self.selection += 1
+        direction = self.adapt(index)
+        self.window = (index - self.distance, index + self.distance)
+        self._schedule(articles, index, direction, settle=False)
+
+    def on_settle(self, articles, index):
+        # The selection has stayed on index long enough for the expensive loaders
+        self._schedule(articles, index, 0, settle=True)
+
+    def _schedule(self, articles, index, direction, settle):
+        generation = self.generation
+        selection = self.selection
+        for offset in range(1, self.distance + 1):
+            for step in (1, -1):
+                neighbour = index + step * offset
+                if not 0 <= neighbour < len(articles):
+                    continue
+                # Rows ahead of the direction of travel go first
+                priority = offset - (0.5 if step == direction else 0)
+                for name, (loader, max_distance, settled) in self.loaders.items():
+                    if settled != settle or max_distance is not None and offset > max_distance:
+                        continue
+                    # Requeuing a waiting row supersedes its entry, so it moves up with the selection
+                    sequence = next(self.sequence)
+                    self.queued[(generation, name, neighbour)] = sequence
+                    self.queue.put((priority, sequence, generation, selection, name,
+                                    neighbour, articles[neighbour]))
+        if self.metrics:
+            self.metrics.incr('prefetch.scheduled')
+
+    def cancel(self):
+        # Called whenever the article list changes
+        self.generation += 1
+        self.last_index = None
+        self.window = (0, -1)
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                break
+        self.queued.clear()
+
+    def _wanted(self, generation, selection, name, row):
+        if generation != self.generation:
+            return False
+        if self.loaders[name][2]:
+            return selection == self.selection
+        lo, hi = self.window
+        return lo <= row <= hi and row != self.last_index  # The selected row is loaded by the app itself
+
+    def _work(self):
+        while True:
+            self._run(self.queue.get())
+
+    def _run(self, entry):
+        priority, sequence, generation, selection, name, row, article = entry
+        key = (generation, name, row)
+        if self.queued.get(key) != sequence:
+            return  # A later selection queued this row again
+        del self.queued[key]
+        if not self._wanted(generation, selection, name, row):
+            if self.metrics:
+                self.metrics.incr('prefetch.cancelled')
+            return
+        try:
+            self.loaders[name][0](article)
+            if self.metrics:
+                self.metrics.incr(f'prefetch.{name}.loaded')
+        except Exception:
+            if self.metrics:
+                self.metrics.incr(f'prefetch.{name}.errors')
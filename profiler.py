@@ -0,0 +1,232 @@
+from contextlib import contextmanager
+from datetime import datetime
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+
+SAMPLE_INTERVAL = 0.01   # Seconds between stack samples (100 Hz)
+MAX_SAMPLES = 500000     # Sampling stops by itself past this many thread stacks
+SPAN_PREFIX = "⏱ "       # Root frame marking the user actions active during a sample
+
+
+class SamplingProfiler:
+    """Low-overhead sampling profiler over every Python thread.
+
+    A daemon thread reads sys._current_frames() at a fixed interval and
+    keeps interned stacks, so the threads being profiled are never touched.
+    Actions (search, page flip, ...) are recorded as spans and prefixed to
+    the stacks sampled while they were open. Captures are written as a
+    speedscope JSON file plus collapsed stacks for flamegraph.pl.
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL, on_truncated=None):
+        self.interval = interval
+        self.on_truncated = on_truncated   # Called from the sampling thread after an automatic stop
+        self.lock = threading.Lock()
+        self.running = False
+        self.thread = None
+        self.span_ids = itertools.count()
+        self._reset()
+
+    def _reset(self):
+        self.frames = {}        # code object or span name -> frame index
+        self.frame_info = []    # frame index -> (name, file, line)
+        self.stacks = {}        # tuple of frame indices -> stack id
+        self.samples = []       # (seconds since start, thread name, stack id)
+        self.spans = []         # [name, start, end]
+        self.open_spans = {}    # span id -> index into self.spans
+        self.started = None
+        self.stopped = None
+        self.truncated = False
+
+    def start(self):
+        with self.lock:
+            if self.running:
+                return
+            self._reset()
+            self.started = time.perf_counter()
+            self.running = True
+        self.thread = threading.Thread(target=self._sample_loop, name="profiler", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        with self.lock:
+            if not self.running:
+                return
+            self._finish(time.perf_counter())
+        self.thread.join()
+
+    def _finish(self, now):
+        # Called with the lock held
+        self.running = False
+        self.stopped = now
+        for index in self.open_spans.values():
+            self.spans[index][2] = now
+        self.open_spans.clear()
+
+    def begin(self, name):
+        # Returns a token for end(); None while not profiling, so spans cost nothing then
+        if not self.running:
+            return None
+        with self.lock:
+            if not self.running:
+                return None
+            span_id = next(self.span_ids)
+            self.open_spans[span_id] = len(self.spans)
+            self.spans.append([name, time.perf_counter(), None])
+            return span_id
+
+    def end(self, token):
+        if token is None:
+            return
+        with self.lock:
+            index = self.open_spans.pop(token, None)
+            if index is not None:
+                self.spans[index][2] = time.perf_counter()
+
+    @contextmanager
+    def span(self, name):
+        token = self.begin(name)
+        try:
+            yield
+        finally:
+            self.end(token)
+
+    def _frame(self, key, name, file, line):
+        index = self.frames.get(key)
+        if index is None:
+            index = self.frames[key] = len(self.frame_info)
+            self.frame_info.append((name, file, line))
+        return index
+
+    def _sample_loop(self):
+        own = threading.get_ident()
+        next_sample = time.perf_counter()
+        while self.running:
+            frames = sys._current_frames()
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            now = time.perf_counter()
+            with self.lock:
+                if not self.running:
+                    return
+                active = [self.spans[i][0] for i in sorted(self.open_spans.values())]
+                prefix = [self._frame(('span', name), SPAN_PREFIX + name, '', 0) for name in active]
+                for ident, frame in frames.items():
+                    if ident == own:
+                        continue
+                    stack = []
+                    while frame is not None:
+                        code = frame.f_code
+                        stack.append(self._frame(code, code.co_name, code.co_filename, code.co_firstlineno))
+                        frame = frame.f_back
+                    stack.extend(reversed(prefix))
+                    stack.reverse()
+                    key = tuple(stack)
+                    stack_id = self.stacks.get(key)
+                    if stack_id is None:
+                        stack_id = self.stacks[key] = len(self.stacks)
+                    self.samples.append((now - self.started, names.get(ident, str(ident)), stack_id))
+                if len(self.samples) >= MAX_SAMPLES:
+                    self.truncated = True
+                    self._finish(now)
+                    break
+            del frames
+            # A slow sample delays the next one rather than triggering a burst to catch up
+            next_sample = max(next_sample + self.interval, now)
+            time.sleep(max(0.0, next_sample - time.perf_counter()))
+        else:
+            return
+        # Stopped by the sample cap rather than by stop(): nobody else will save this capture
+        if self.on_truncated:
+            self.on_truncated()
+
+    def frame_label(self, index):
+        name, file, line = self.frame_info[index]
+        if not file:
+            return name
+        return f"{name} ({os.path.basename(file)}:{line})"
+
+    def write(self, folder):
+        """Write the last capture; returns (speedscope path, collapsed path)."""
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        base = os.path.join(folder, f"profile-{stamp}")
+        with self.lock:
+            stacks = {stack_id: stack for stack, stack_id in self.stacks.items()}
+            samples = list(self.samples)
+            spans = [tuple(span) for span in self.spans if span[2] is not None]
+            duration = ((self.stopped or time.perf_counter()) - self.started) if self.started else 0.0
+            truncated = self.truncated
+
+        with open(base + '.speedscope.json', 'w', encoding='utf-8') as f:
+            json.dump(self._speedscope(stacks, samples, spans, duration, truncated), f)
+        with open(base + '.collapsed.txt', 'w', encoding='utf-8') as f:
+            f.writelines(self._collapsed(stacks, samples))
+        return base + '.speedscope.json', base + '.collapsed.txt'
+
+    def _collapsed(self, stacks, samples):
+        counts = {}
+        for _, thread, stack_id in samples:
+            key = (thread, stack_id)
+            counts[key] = counts.get(key, 0) + 1
+        for (thread, stack_id), count in sorted(counts.items()):
+            names = [thread] + [self.frame_label(i).replace(';', ',') for i in stacks[stack_id]]
+            yield f"{';'.join(names)} {count}\n"
+
+    def _speedscope(self, stacks, samples, spans, duration, truncated):
+        frames = [{'name': name, 'file': file, 'line': line} if file else {'name': name}
+                  for name, file, line in self.frame_info]
+        by_thread = {}
+        for at, thread, stack_id in samples:
+            by_thread.setdefault(thread, []).append((at, stack_id))
+        profiles = []
+        for thread, thread_samples in sorted(by_thread.items()):
+            # Each sample stands for the time since the previous one on that thread
+            weights = []
+            previous = 0.0
+            for at, _ in thread_samples:
+                weights.append(round((at - previous) * 1000, 3))
+                previous = at
+            profiles.append({
+                'type': 'sampled',
+                'name': thread,
+                'unit': 'milliseconds',
+                'startValue': 0,
+                'endValue': round(duration * 1000, 3),
+                'samples': [list(stacks[stack_id]) for _, stack_id in thread_samples],
+                'weights': weights
+            })
+
+        # Spans become an evented profile per action; speedscope needs them properly nested,
+        # so overlapping spans of the same action are merged
+        for name in sorted({span[0] for span in spans}):
+            frame = len(frames)
+            frames.append({'name': SPAN_PREFIX + name})
+            events = []
+            for _, start, end in sorted(s for s in spans if s[0] == name):
+                start = round((start - self.started) * 1000, 3)
+                end = round((end - self.started) * 1000, 3)
+                if events and start <= events[-1]['at']:
+                    events[-1]['at'] = max(events[-1]['at'], end)
+                    continue
+                events.append({'type': 'O', 'frame': frame, 'at': start})
+                events.append({'type': 'C', 'frame': frame, 'at': end})
+            profiles.append({
+                'type': 'evented',
+                'name': f"action: {name}",
+                'unit': 'milliseconds',
+                'startValue': 0,
+                'endValue': round(duration * 1000, 3),
+                'events': events
+            })
+
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': f"News Explorer profile{' (truncated)' if truncated else ''}",
+            'exporter': 'News Explorer',
+            'activeProfileIndex': 0,
+            'shared': {'frames': frames},
+            'profiles': profiles
+        }
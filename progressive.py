@@ -0,0 +1,110 @@
+from io import BytesIO
+import threading
+import time
+from PIL import Image, ImageFile
+import requests
+
+CHUNK_SIZE = 16384
+PREVIEW_INTERVAL = 0.15      # Seconds between low-resolution redraws
+PREVIEW_MIN_BYTES = 8192     # New bytes needed before another redraw
+JPEG_EOI = b'\xff\xd9'
+
+LITE_ENTER_BPS = 150 * 1024  # Throughput that switches lite mode on...
+LITE_EXIT_BPS = 400 * 1024   # ...and the higher one needed to switch it back off
+MIN_SAMPLE_BYTES = 32 * 1024  # Smaller transfers are mostly latency, not bandwidth
+
+
+def decode_partial(data, size):
+    # A truncated JPEG closed with an end-of-image marker decodes to whatever
+    # scans have arrived: a blurry full frame for progressive files, the top
+    # rows for baseline ones. draft() lets libjpeg decode at reduced scale.
+    if not data.startswith(b'\xff\xd8'):
+        return None
+    try:
+        stream = BytesIO()  # One copy of the bytes so far; data itself keeps growing
+        stream.write(data)
+        stream.write(JPEG_EOI)
+        stream.seek(0)
+        image = Image.open(stream)
+        image.draft('RGB', size)
+        image.load()
+        return image
+    except (OSError, SyntaxError, ValueError):
+        return None
+
+
+class BandwidthEstimator:
+    """Exponentially weighted download throughput with a hysteresis switch."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.bytes_per_second = None
+        self.average_image_bytes = None
+        self.lite = False
+
+    def observe(self, nbytes, seconds):
+        with self.lock:
+            if self.average_image_bytes is None:
+                self.average_image_bytes = nbytes
+            else:
+                self.average_image_bytes = 0.8 * self.average_image_bytes + 0.2 * nbytes
+            if nbytes < MIN_SAMPLE_BYTES or seconds <= 0:
+                return self.lite
+            rate = nbytes / seconds
+            if self.bytes_per_second is None:
+                self.bytes_per_second = rate
+            else:
+                self.bytes_per_second = 0.7 * self.bytes_per_second + 0.3 * rate
+            if self.lite and self.bytes_per_second > LITE_EXIT_BPS:
+                self.lite = False
+            elif not self.lite and self.bytes_per_second < LITE_ENTER_BPS:
+                self.lite = True
+            return self.lite
+
+    def describe(self):
+        if self.bytes_per_second is None:
+            return "unknown"
+        return f"{self.bytes_per_second / 1024:.0f} KB/s{' (lite)' if self.lite else ''}"
+
+
+def stream_image(url, estimator=None, on_preview=None, preview_size=None, timeout=15):
+    """Download an image in chunks, reporting low-resolution previews on the way.
+
+    Returns (bytes, decoded image). ImageFile.Parser picks up the format and
+    dimensions from the first chunks; on_preview(image) is called from this
+    thread with partial JPEG decodes while the rest is still arriving.
+    """
+    started = time.monotonic()
+    parser = ImageFile.Parser()
+    header = None
+    data = bytearray()
+    last_preview = started
+    previewed_bytes = 0
+
+    with requests.get(url, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            data += chunk
+            if header is None:
+                # The parser re-concatenates everything it is fed, so it only sees the header
+                try:
+                    parser.feed(chunk)
+                except OSError:
+                    pass  # Not every format parses incrementally; the full bytes still decode
+                header = parser.image
+            if not on_preview or header is None or header.format != 'JPEG':
+                continue
+            now = time.monotonic()
+            if now - last_preview >= PREVIEW_INTERVAL and len(data) - previewed_bytes >= PREVIEW_MIN_BYTES:
+                image = decode_partial(data, preview_size or header.size)
+                if image is not None:
+                    on_preview(image)
+                last_preview = now
+                previewed_bytes = len(data)
+
+    if estimator:
+        estimator.observe(len(data), time.monotonic() - started)
+    data = bytes(data)
+    image = Image.open(BytesIO(data))
+    image.load()
+    return data, image
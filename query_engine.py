@@ -0,0 +1,251 @@
+from datetime import datetime, timezone
+import re
+
+# Rows are addressed by integer ids; every index is a Python int used as a
+# bitset (bit i set means row i matches), so AND/OR/popcount stay in C.
+
+MAX_ARTICLES = 50000
+UNKNOWN = "Unknown"
+
+
+def parse_published(value):
+    if not value:
+        return 0.0
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return 0.0
+
+
+def bits_from_ids(ids, size):
+    # Building the bit string once is O(n), unlike OR-ing 1 << i per row
+    if not ids:
+        return 0
+    flags = bytearray(b'0' * size)
+    for i in ids:
+        flags[size - 1 - i] = 49  # ord('1')
+    return int(flags, 2)
+
+
+def article_key(article):
+    # Articles without a URL are told apart by title and publish time
+    return article.get('url') or f"{article.get('title', '')}|{article.get('publishedAt', '')}"
+
+
+def ids_from_bits(mask, size):
+    flags = bin(mask)[:1:-1]
+    return [i for i, flag in enumerate(flags[:size]) if flag == '1']
+
+
+class ArticleQueryEngine:
+    def __init__(self, max_articles=MAX_ARTICLES):
+        self.max_articles = max_articles
+        self.clear()
+
+    def clear(self):
+        self.articles = []
+        self.by_url = {}
+        # Precomputed sort key columns
+        self.published = []
+        self.source_keys = []
+        self.author_keys = []
+        self.title_keys = []
+        self.ranks = []          # Row -> {scope: position in that scope's results}
+        self.search_text = []
+        # Bitset indexes
+        self.source_bits = {}
+        self.author_bits = {}
+        self.day_bits = {}
+        self.scope_bits = {}
+        self.all_bits = 0
+        self._order_cache = {}
+        self._relevance_cache = {}
+
+    def __len__(self):
+        return len(self.articles)
+
+    def add(self, articles, scope=None, rank_offset=0):
+        if len(self.articles) + len(articles) > self.max_articles:
+            self._compact(self.max_articles // 2)
+
+        ids = []
+        for position, article in enumerate(articles):
+            url = article_key(article)
+            row = self.by_url.get(url)
+            if row is None:
+                row = self._append(article, url, {scope: rank_offset + position})
+            else:
+                self._replace(row, article, scope, rank_offset + position)
+            ids.append(row)
+
+        if scope is not None:
+            self.scope_bits[scope] = self.scope_bits.get(scope, 0) | bits_from_ids(ids, len(self.articles))
+        return ids
+
+    def _facet_keys(self, article):
+        source = (article.get('source') or {}).get('name') or UNKNOWN
+        author = article.get('author') or UNKNOWN
+        published = parse_published(article.get('publishedAt'))
+        day = datetime.fromtimestamp(published, timezone.utc).strftime('%Y-%m-%d') if published else UNKNOWN
+        return source, author, published, day
+
+    def _append(self, article, url, ranks):
+        row = len(self.articles)
+        self.articles.append(article)
+        self.by_url[url] = row
+        self.published.append(0.0)
+        self.source_keys.append('')
+        self.author_keys.append('')
+        self.title_keys.append('')
+        self.ranks.append(ranks)
+        self.search_text.append('')
+        self._index_row(row, article)
+        self.all_bits |= 1 << row
+        return row
+
+    def _replace(self, row, article, scope, rank):
+        # A refetched article keeps its row but may have new fields and a new place in this scope
+        self.ranks[row][scope] = rank
+        old_source, old_author, _, old_day = self._facet_keys(self.articles[row])
+        bit = 1 << row
+        for index, key in ((self.source_bits, old_source), (self.author_bits, old_author),
+                           (self.day_bits, old_day)):
+            bits = index[key] & ~bit
+            if bits:
+                index[key] = bits
+            else:
+                del index[key]
+        self.articles[row] = article
+        self._index_row(row, article)
+
+    def _index_row(self, row, article):
+        bit = 1 << row
+        source, author, published, day = self._facet_keys(article)
+
+        self.published[row] = published
+        self.source_keys[row] = source.lower()
+        self.author_keys[row] = author.lower()
+        self.title_keys[row] = (article.get('title') or '').lower()
+        self.search_text[row] = f"{article.get('title') or ''} {article.get('description') or ''}".lower()
+
+        self.source_bits[source] = self.source_bits.get(source, 0) | bit
+        self.author_bits[author] = self.author_bits.get(author, 0) | bit
+        self.day_bits[day] = self.day_bits.get(day, 0) | bit
+
+        # Changed rows invalidate cached orderings
+        self._order_cache.clear()
+        self._relevance_cache.clear()
+
+    def _compact(self, keep):
+        # Keep the most recently added rows and rebuild every index
+        articles = self.articles[-keep:]
+        ranks = self.ranks[-keep:]
+        first_kept = len(self.articles) - len(articles)
+        scopes = {scope: [i - first_kept for i in ids_from_bits(bits, len(self.articles)) if i >= first_kept]
+                  for scope, bits in self.scope_bits.items()}
+
+        self.clear()
+        for article, article_ranks in zip(articles, ranks):
+            url = article_key(article)
+            self._append(article, url, article_ranks)
+        for scope, ids in scopes.items():
+            if ids:
+                self.scope_bits[scope] = bits_from_ids(ids, len(self.articles))
+
+    def scope_size(self, scope):
+        return self.scope_bits.get(scope, 0).bit_count()
+
+    def build_mask(self, scope=None, sources=None, authors=None, since=None, until=None):
+        mask = self.scope_bits.get(scope, 0) if scope is not None else self.all_bits
+        if sources:
+            mask &= self._union(self.source_bits, sources)
+        if authors:
+            mask &= self._union(self.author_bits, authors)
+        if since is not None or until is not None:
+            mask &= self._date_range_bits(since, until)
+        return mask
+
+    def _union(self, index, keys):
+        bits = 0
+        for key in keys:
+            bits |= index.get(key, 0)
+        return bits
+
+    def _date_range_bits(self, since, until):
+        lo = since if since is not None else float('-inf')
+        hi = until if until is not None else float('inf')
+        ids = [i for i, published in enumerate(self.published) if lo <= published < hi]
+        return bits_from_ids(ids, len(self.articles))
+
+    def _relevance(self, query):
+        scores = self._relevance_cache.get(query)
+        if scores is None:
+            terms = [t for t in re.findall(r'\w+', query.lower()) if len(t) > 1]
+            titles = self.title_keys
+            scores = []
+            for i, text in enumerate(self.search_text):
+                score = 0
+                for term in terms:
+                    score += text.count(term) + titles[i].count(term)
+                scores.append(score)
+            self._relevance_cache[query] = scores
+        return scores
+
+    def _rank_column(self, scope):
+        # Rows outside the scope are masked out anyway; unscoped queries use the first rank seen
+        if scope is None:
+            return [next(iter(ranks.values())) for ranks in self.ranks]
+        return [ranks.get(scope, float('inf')) for ranks in self.ranks]
+
+    def _column(self, field, query, scope=None):
+        if field == 'published':
+            return self.published
+        if field == 'source':
+            return self.source_keys
+        if field == 'author':
+            return self.author_keys
+        if field == 'title':
+            return self.title_keys
+        if field == 'rank':
+            return self._rank_column(scope)
+        if field == 'relevance':
+            return self._relevance(query or '')
+        raise ValueError(f"Unknown sort field: {field}")
+
+    def _order(self, sort, query=None, scope=None):
+        fields = [field for field, _ in sort]
+        key = (tuple(sort), query if 'relevance' in fields else None, scope if 'rank' in fields else None)
+        order = self._order_cache.get(key)
+        if order is None:
+            order = list(range(len(self.articles)))
+            # Stable sorts applied from the least to the most significant key
+            for field, descending in reversed(sort):
+                order.sort(key=self._column(field, query, scope).__getitem__, reverse=descending)
+            self._order_cache[key] = order
+        return order
+
+    def query(self, scope=None, sources=None, authors=None, since=None, until=None,
+              sort=(('published', True),), query=None):
+        mask = self.build_mask(scope, sources, authors, since, until)
+        if not mask:
+            return []
+        flags = bin(mask)[:1:-1]
+        size = len(flags)
+        return [self.articles[i] for i in self._order(sort, query, scope) if i < size and flags[i] == '1']
+
+    def facets(self, mask=None):
+        if mask is None:
+            mask = self.all_bits
+        return {
+            'source': self._counts(self.source_bits, mask),
+            'author': self._counts(self.author_bits, mask),
+            'day': self._counts(self.day_bits, mask)
+        }
+
+    def _counts(self, index, mask):
+        counts = {}
+        for key, bits in index.items():
+            count = (bits & mask).bit_count()
+            if count:
+                counts[key] = count
+        return counts
@@ -0,0 +1,188 @@
+import json
+import os
+import threading
+import time
+import numpy as np
+from textutil import tokenize, stable_hash
+
+N_FEATURES = 1 << 16
+LEARNING_RATE = 0.3
+L2 = 1e-5
+LOG_FILE = "activity.jsonl"
+MODEL_FILE = "ranking.npy"
+LOG_MAX_BYTES = 2 * 1024 * 1024   # Oldest half is dropped past this
+LOG_BATCH = 20                     # Events buffered before a write and a training pass
+FEATURE_CACHE = 5000
+
+# Event -> (label, weight). Dwell is labelled by its length, see dwell_label.
+EVENTS = {
+    'open': (1, 0.5),
+    'skip': (0, 0.3),
+    'browser': (1, 1.5),
+    'save': (1, 2.0),
+    'share': (1, 2.0),
+}
+SHORT_DWELL = 4    # Seconds; a quick bounce counts against the article
+LONG_DWELL = 20
+
+
+def dwell_label(seconds):
+    if seconds < SHORT_DWELL:
+        return 0, 0.5
+    if seconds >= LONG_DWELL:
+        return 1, min(seconds / 60, 2.0)
+    return None
+
+
+def article_features(source, category, title):
+    keys = ['bias', f"source={source or ''}".lower()]
+    if category:
+        keys.append(f"category={category}")
+    keys.extend(f"term={term}" for term in set(tokenize(title or '')))
+    return np.fromiter((stable_hash(key) % N_FEATURES for key in keys), dtype=np.int64, count=len(keys))
+
+
+class ActivityLog:
+    # Append-only JSON lines, written in batches and trimmed from the front when too big
+
+    def __init__(self, path, max_bytes=LOG_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.pending = []
+
+    def append(self, event):
+        self.pending.append(event)
+        return len(self.pending) >= LOG_BATCH
+
+    def flush(self):
+        if not self.pending:
+            return
+        lines = ''.join(json.dumps(event, ensure_ascii=False) + '\n' for event in self.pending)
+        self.pending = []
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(lines)
+        if os.path.getsize(self.path) > self.max_bytes:
+            self.trim()
+
+    def trim(self):
+        with open(self.path, encoding='utf-8') as f:
+            lines = f.readlines()
+        keep = lines[len(lines) // 2:]
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.writelines(keep)
+        os.replace(tmp_path, self.path)
+
+    def events(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue  # Torn last line after a crash
+        except OSError:
+            return
+
+
+class PersonalRanker:
+    """On-device logistic model over hashed source, category and title terms.
+
+    Reading activity is logged locally and trains the model in small
+    batches. Nothing is loaded until the first event or ranking request,
+    and a missing or damaged model is rebuilt by replaying the log.
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.log = ActivityLog(os.path.join(folder, LOG_FILE))
+        self.weights = None
+        self.features = {}   # (url, category) -> feature ids, for pages being re-ranked
+        self.dirty = False
+        self.lock = threading.Lock()
+
+    def _ensure_loaded(self):
+        if self.weights is not None:
+            return
+        try:
+            weights = np.load(os.path.join(self.folder, MODEL_FILE))
+            if weights.shape != (N_FEATURES,):
+                raise ValueError("model shape changed")
+            self.weights = weights.astype(np.float32)
+        except (OSError, ValueError):
+            self.weights = np.zeros(N_FEATURES, dtype=np.float32)
+            self._train(list(self.log.events()))
+            self.dirty = True
+
+    def _train(self, events):
+        weights = self.weights
+        for event in events:
+            if event.get('type') == 'dwell':
+                labelled = dwell_label(event.get('seconds', 0))
+            else:
+                labelled = EVENTS.get(event.get('type'))
+            if not labelled:
+                continue
+            label, weight = labelled
+            ids = article_features(event.get('source'), event.get('category'), event.get('title'))
+            scale = 1.0 / np.sqrt(len(ids))
+            margin = float(weights[ids].sum()) * scale
+            prediction = 1.0 / (1.0 + np.exp(-margin))
+            step = LEARNING_RATE * weight * (label - prediction) * scale
+            weights[ids] = weights[ids] * (1 - L2) + step
+
+    def record(self, event_type, article, category=None, **extra):
+        event = {
+            'type': event_type,
+            'time': int(time.time()),
+            'url': article.get('url'),
+            'source': (article.get('source') or {}).get('name'),
+            'category': category,
+            'title': article.get('title'),
+            **extra
+        }
+        with self.lock:
+            if self.log.append(event):
+                self._flush_locked()
+
+    def _flush_locked(self):
+        events = self.log.pending
+        if not events:
+            return
+        # Load first: with no saved model the log is replayed, and it must not hold this batch yet
+        self._ensure_loaded()
+        self.log.flush()
+        self._train(events)
+        self.dirty = True
+
+    def flush(self):
+        with self.lock:
+            self._flush_locked()
+            if self.dirty and self.weights is not None:
+                tmp_path = os.path.join(self.folder, "ranking.tmp.npy")
+                np.save(tmp_path, self.weights)
+                os.replace(tmp_path, os.path.join(self.folder, MODEL_FILE))
+                self.dirty = False
+
+    def rank(self, articles, category=None):
+        # Stable: ties keep the order the source returned
+        if len(articles) < 2:
+            return list(articles)
+        with self.lock:
+            self._ensure_loaded()
+            if len(self.features) > FEATURE_CACHE:
+                self.features.clear()
+            id_lists = []
+            for article in articles:
+                key = (article.get('url'), category)
+                ids = self.features.get(key)
+                if ids is None:
+                    ids = article_features((article.get('source') or {}).get('name'), category,
+                                           article.get('title'))
+                    self.features[key] = ids
+                id_lists.append(ids)
+            lengths = np.fromiter((len(ids) for ids in id_lists), dtype=np.int64, count=len(id_lists))
+            starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+            scores = np.add.reduceat(self.weights[np.concatenate(id_lists)], starts) / np.sqrt(lengths)
+        order = np.argsort(-scores, kind='stable')
+        return [articles[i] for i in order]
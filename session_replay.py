@@ -0,0 +1,346 @@
+"""Recorded-session replay for News Explorer.
+
+Sessions are recorded from the app with Ctrl+Shift+R (press again to stop)
+as JSON lines under Sessions/ in the save folder: searches, category and
+source clicks, page flips, view and grouping toggles, sort changes,
+selections, saves and saved-tab filtering.
+
+The replayer drives a real NewsApp (under Xvfb when no display is
+available) against the local fixture server and times every action until
+its effects are painted: the handler has returned, the UI dispatcher has
+drained and idle redraws are done.
+
+    python session_replay.py session.jsonl --speed 4 --report before.json
+    python session_replay.py session.jsonl --workers 4 --report after.json --compare before.json
+
+--speed scales the recorded pauses (0 replays back to back), --workers
+runs that many app processes against the same fixture server at once.
+Reports carry the commit and per-action percentiles; --compare exits
+non-zero when an action's p95 regressed past --max-regression.
+"""
+import argparse
+from datetime import datetime
+import hashlib
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+FORMAT_VERSION = 1
+SETTLE_TIMEOUT = 10.0       # Seconds an action may take to settle before it is reported as such
+NOISE_FLOOR_MS = 5.0        # Smaller p95 differences are not counted as regressions
+
+
+class SessionRecorder:
+    """Appends the user's high-level actions to a JSON-lines file while active."""
+
+    def __init__(self):
+        self.file = None
+        self.path = None
+        self.started = None
+
+    @property
+    def active(self):
+        return self.file is not None
+
+    def start(self, path):
+        self.file = open(path, 'w', encoding='utf-8', buffering=1)  # Line buffered: survives a crash
+        self.path = path
+        self.started = time.monotonic()
+        self._write({'type': 'header', 'version': FORMAT_VERSION,
+                     'recorded': datetime.now().isoformat(timespec='seconds')})
+
+    def record(self, action, **args):
+        if self.file is None:
+            return
+        self._write({'t': round(time.monotonic() - self.started, 3), 'action': action, **args})
+
+    def stop(self):
+        if self.file is None:
+            return None
+        self.file.close()
+        self.file = None
+        return self.path
+
+    def _write(self, entry):
+        try:
+            self.file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        except OSError as e:
+            print(f"Error recording session: {e}")
+
+
+def load_session(path):
+    with open(path, encoding='utf-8') as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+    if not entries or entries[0].get('type') != 'header':
+        raise ValueError(f"{path} is not a recorded session")
+    if entries[0].get('version') != FORMAT_VERSION:
+        raise ValueError(f"{path} has session format {entries[0].get('version')}, expected {FORMAT_VERSION}")
+    return entries[1:]
+
+
+class Replayer:
+    def __init__(self, app):
+        self.app = app
+        self.root = app.root
+        self.handlers = {
+            'search': self.search,
+            'source': lambda step: self.app.select_source(step['source']),
+            'category': lambda step: self.app.filter_category(step.get('category')),
+            'next_page': lambda step: self.app.next_page(),
+            'previous_page': lambda step: self.app.previous_page(),
+            'view': self.view,
+            'groups': self.groups,
+            'sort': self.sort,
+            'select': self.select,
+            'save': self.save,
+            'saved_filter': lambda step: self.app.saved_search_var.set(step.get('term', ''))
+        }
+
+    def search(self, step):
+        self.app.search_entry.delete(0, 'end')
+        self.app.search_entry.insert(0, step['query'])
+        self.app.current_page = step.get('page', 1)
+        self.app.search_news()
+
+    def view(self, step):
+        self.app.view_var.set(step['view'])
+        self.app.toggle_view()
+
+    def groups(self, step):
+        self.app.group_var.set(step['grouped'])
+        self.app.toggle_story_groups()
+
+    def sort(self, step):
+        self.app.sort_var.set(step['sort'])
+        self.app.on_sort_change()
+
+    def select(self, step):
+        if step['index'] >= len(getattr(self.app, 'current_articles', [])):
+            return False  # The canned data has fewer rows than the live session did
+        self.app.article_view.select(step['index'])
+
+    def save(self, step):
+        if self.select(step) is False:
+            return False
+        self.settle()
+        before = set(self.root.winfo_children())
+        self.app.save_article()
+        # Close the confirmation dialog so it doesn't pile up
+        tooltip = getattr(self.app, 'tooltip_window', None)
+        for widget in set(self.root.winfo_children()) - before:
+            if widget.winfo_class() == 'Toplevel' and widget is not tooltip:
+                widget.destroy()
+
+    def busy(self):
+        return (len(self.app.ui) or self.app.pending_render is not None or self.app.fetching
+                or self.app.story_clusterer.pending())
+
+    def settle(self, timeout=SETTLE_TIMEOUT):
+        # Pump events until nothing is queued for the Tk thread, then flush pending redraws
+        deadline = time.perf_counter() + timeout
+        self.root.update()
+        while self.busy():
+            if time.perf_counter() > deadline:
+                return False
+            time.sleep(0.001)
+            self.root.update()
+        self.root.update_idletasks()
+        return True
+
+    def wait(self, seconds):
+        # Keep the app responsive through the recorded pause
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            self.root.update()
+            time.sleep(min(0.005, max(0.0, deadline - time.perf_counter())))
+
+    def run(self, steps, speed=1.0):
+        results = []
+        previous = 0.0
+        for step in steps:
+            if speed > 0:
+                self.wait((step['t'] - previous) / speed)
+            previous = step['t']
+            handler = self.handlers.get(step['action'])
+            if handler is None:
+                results.append({'action': step['action'], 'skipped': True})
+                continue
+            started = time.perf_counter()
+            if handler(step) is False:
+                results.append({'action': step['action'], 'skipped': True})
+                continue
+            settled = self.settle()
+            results.append({'action': step['action'], 'ms': round((time.perf_counter() - started) * 1000, 3),
+                            'settled': settled})
+        return results
+
+
+def percentile(values, fraction):
+    # Nearest-rank percentile over the raw samples
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered), math.ceil(fraction * len(ordered))) - 1)]
+
+
+def summarize(values):
+    return {
+        'count': len(values),
+        'mean_ms': round(sum(values) / len(values), 2),
+        'p50_ms': round(percentile(values, 0.5), 2),
+        'p95_ms': round(percentile(values, 0.95), 2),
+        'max_ms': round(max(values), 2)
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_report(args, results):
+    timed = [r for r in results if 'ms' in r]
+    by_action = {}
+    for result in timed:
+        by_action.setdefault(result['action'], []).append(result['ms'])
+    with open(args.session, 'rb') as f:
+        session_hash = hashlib.sha1(f.read()).hexdigest()
+    return {
+        'commit': git_commit(),
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'session': os.path.basename(args.session),
+        'session_sha1': session_hash,
+        'speed': args.speed,
+        'workers': args.workers,
+        'api_latency': args.api_latency,
+        'python': sys.version.split()[0],
+        'steps': len(results),
+        'skipped': sum(1 for r in results if r.get('skipped')),
+        'unsettled': sum(1 for r in timed if not r['settled']),
+        'total': summarize([r['ms'] for r in timed]) if timed else None,
+        'actions': {name: summarize(values) for name, values in sorted(by_action.items())}
+    }
+
+
+def compare(old, new, max_regression):
+    if old.get('session_sha1') != new.get('session_sha1'):
+        print("Warning: the reports replayed different sessions")
+    print(f"\n{'action':<15} {'p50 before':>11} {'p50 after':>10} {'p95 before':>11} {'p95 after':>10}  change")
+    regressions = []
+    for name in sorted(set(old['actions']) | set(new['actions'])):
+        before, after = old['actions'].get(name), new['actions'].get(name)
+        if not before or not after:
+            print(f"{name:<15} {'only in ' + ('after' if after else 'before'):>46}")
+            continue
+        change = (after['p95_ms'] - before['p95_ms']) / max(before['p95_ms'], 0.001)
+        regressed = change > max_regression and after['p95_ms'] - before['p95_ms'] > NOISE_FLOOR_MS
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<15} {before['p50_ms']:>11.1f} {after['p50_ms']:>10.1f} {before['p95_ms']:>11.1f} "
+              f"{after['p95_ms']:>10.1f}  {change:+.0%}{'  REGRESSION' if regressed else ''}")
+    print(f"\nCommits: {old.get('commit')} -> {new.get('commit')}")
+    return regressions
+
+
+def replay(args, server_url):
+    # One app in this process against an already running fixture server
+    home = tempfile.mkdtemp(prefix="newsapp-replay-")
+    os.environ['HOME'] = home  # Keep saves, caches and snapshots out of the real profile
+
+    import tkinter as tk
+    import news_app
+
+    news_app.API_KEY = 'replay'
+    news_app.API_BASE_URL = server_url
+    news_app.FEEDS = [f"{server_url}/feeds/world.rss", f"{server_url}/feeds/tech.atom"]
+    news_app.UI_POLL_WHEN_IDLE = True
+
+    root = tk.Tk()
+    app = news_app.NewsApp(root)
+    try:
+        replayer = Replayer(app)
+        replayer.settle()
+        return replayer.run(load_session(args.session), args.speed)
+    finally:
+        app.on_close()
+        shutil.rmtree(home, ignore_errors=True)
+
+
+def run_workers(args, server_url):
+    # Each worker is a separate process with its own app, all sharing the fixture server
+    outputs = []
+    for i in range(args.workers):
+        with tempfile.NamedTemporaryFile(prefix=f"newsapp-replay-{i}-", suffix='.json', delete=False) as f:
+            outputs.append(f.name)
+    processes = [subprocess.Popen([sys.executable, os.path.abspath(__file__), args.session,
+                                   '--speed', str(args.speed), '--server-url', server_url, '--output', output])
+                 for output in outputs]
+    results = []
+    for process, output in zip(processes, outputs):
+        if process.wait() != 0:
+            sys.exit(f"Replay worker failed with exit code {process.returncode}")
+        with open(output) as f:
+            results.extend(json.load(f))
+        os.remove(output)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded News Explorer session and time each action")
+    parser.add_argument('session', help="session recorded with Ctrl+Shift+R")
+    parser.add_argument('--speed', type=float, default=1.0, help="pause multiplier; 0 replays back to back")
+    parser.add_argument('--workers', type=int, default=1, help="app processes replaying at the same time")
+    parser.add_argument('--api-latency', type=float, default=0.0, help="seconds added to each fixture API response")
+    parser.add_argument('--report', help="write the report as JSON")
+    parser.add_argument('--compare', help="earlier report to compare against")
+    parser.add_argument('--max-regression', type=float, default=0.2, help="allowed p95 growth per action")
+    parser.add_argument('--server-url', help=argparse.SUPPRESS)  # Set for worker processes
+    parser.add_argument('--output', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    from soak_test import start_display
+    display = start_display()
+    try:
+        if args.server_url:
+            with open(args.output, 'w') as f:
+                json.dump(replay(args, args.server_url), f)
+            return
+
+        from fixture_server import FixtureServer
+        server = FixtureServer(latency=args.api_latency).start()
+        try:
+            if args.workers > 1:
+                results = run_workers(args, server.base_url)
+            else:
+                results = replay(args, server.base_url)
+        finally:
+            server.shutdown()
+    finally:
+        if display:
+            display.terminate()
+
+    report = build_report(args, results)
+    print(f"Replayed {report['steps']} steps ({report['skipped']} skipped, {report['unsettled']} unsettled) "
+          f"at commit {report['commit']}")
+    for name, stats in report['actions'].items():
+        print(f"  {name:<15} n={stats['count']:<5} mean={stats['mean_ms']:.1f} p50={stats['p50_ms']:.1f} "
+              f"p95={stats['p95_ms']:.1f} max={stats['max_ms']:.1f} ms")
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), report, args.max_regression)
+        if regressions:
+            sys.exit(f"p95 regressed for: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
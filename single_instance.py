@@ -0,0 +1,113 @@
+import argparse
+import json
+import os
+import socket
+import tempfile
+import threading
+
+# Only the standard library here: this module runs before news_app's heavy imports
+
+FORWARD_TIMEOUT = 0.5   # Seconds to wait for the running instance to acknowledge
+MAX_COMMAND_BYTES = 65536
+CATEGORIES = ("business", "entertainment", "general", "health", "science", "sports", "technology")
+
+
+def socket_path():
+    folder = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    user = os.getuid() if hasattr(os, 'getuid') else os.environ.get('USERNAME', 'user')
+    return os.path.join(folder, f"newsapp-{user}.sock")
+
+
+def parse_command(argv):
+    parser = argparse.ArgumentParser(description="News Explorer")
+    parser.add_argument('--search', metavar="QUERY", help="search for QUERY")
+    parser.add_argument('--headlines', action='store_true', help="show top headlines")
+    parser.add_argument('--category', choices=CATEGORIES, help="show top headlines for a category")
+    parser.add_argument('--new-instance', action='store_true',
+                        help="start a separate window instead of reusing a running one")
+    args = parser.parse_args(argv)
+
+    if args.search:
+        command = {'action': 'search', 'query': args.search}
+    elif args.headlines or args.category:
+        command = {'action': 'headlines', 'category': args.category}
+    else:
+        command = {'action': 'show'}
+    command['new_instance'] = args.new_instance
+    return command
+
+
+def forward(command, path=None, timeout=FORWARD_TIMEOUT):
+    """Send command to a running instance; True once it has been accepted."""
+    if not hasattr(socket, 'AF_UNIX') or command.get('new_instance'):
+        return False
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(path or socket_path())
+            client.sendall(json.dumps(command).encode('utf-8') + b'\n')
+            return client.makefile('rb').readline().strip() == b'ok'
+    except OSError:
+        return False  # Nobody listening, or a socket left behind by a crash
+
+
+class InstanceServer:
+    """Unix-socket listener that hands commands from later launches to handler.
+
+    handler(command) runs on the listener thread; commands are one JSON
+    object per connection, acknowledged with "ok".
+    """
+
+    def __init__(self, handler, path=None):
+        self.handler = handler
+        self.path = path or socket_path()
+        self.sock = None
+
+    def start(self):
+        if not hasattr(socket, 'AF_UNIX'):
+            return False
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.bind(self.path)
+        except OSError:
+            # Only take over the path if nothing answers on it
+            if forward({'action': 'ping'}, self.path):
+                sock.close()
+                return False
+            os.unlink(self.path)
+            sock.bind(self.path)
+        os.chmod(self.path, 0o600)
+        sock.listen(4)
+        self.sock = sock
+        threading.Thread(target=self._serve, name="instance-server", daemon=True).start()
+        return True
+
+    def _serve(self):
+        while self.sock is not None:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return  # Closed
+            with conn:
+                try:
+                    conn.settimeout(FORWARD_TIMEOUT)
+                    command = json.loads(conn.makefile('rb').readline(MAX_COMMAND_BYTES))
+                    if command.get('action') != 'ping':
+                        self.handler(command)
+                    conn.sendall(b'ok\n')
+                except (OSError, ValueError, AttributeError) as e:
+                    print(f"Error reading forwarded command: {e}")
+
+    def close(self):
+        sock, self.sock = self.sock, None
+        if sock is None:
+            return
+        try:
+            sock.shutdown(socket.SHUT_RDWR)  # Wakes the blocked accept()
+        except OSError:
+            pass
+        sock.close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
@@ -0,0 +1,249 @@
+"""Long-session soak test for News Explorer.
+
+Drives a real NewsApp window (under Xvfb when no display is available)
+against the local fixture server through thousands of searches, page
+flips, view toggles, selections and hovers, sampling RSS, Tk widget and
+image counts and tracemalloc totals along the way:
+
+    python soak_test.py --iterations 5000
+
+Exits non-zero when growth after the warm-up exceeds the budgets.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+SEARCH_TERMS = ["fed rates", "tesla", "elections", "climate", "chips", "vaccines", "world cup", "ai"]
+CATEGORIES = [None, "business", "technology", "sports", "health", "science", "entertainment"]
+
+
+def start_display():
+    # Reuse an existing display, otherwise start a private Xvfb server
+    if os.environ.get('DISPLAY'):
+        return None
+    xvfb = shutil.which('Xvfb')
+    if not xvfb:
+        sys.exit("No DISPLAY and Xvfb is not installed")
+    for number in range(99, 120):
+        if not os.path.exists(f"/tmp/.X11-unix/X{number}"):
+            break
+    process = subprocess.Popen([xvfb, f":{number}", "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 10
+    while not os.path.exists(f"/tmp/.X11-unix/X{number}"):
+        if time.time() > deadline or process.poll() is not None:
+            process.kill()
+            sys.exit("Xvfb did not start")
+        time.sleep(0.05)
+    os.environ['DISPLAY'] = f":{number}"
+    return process
+
+
+def rss_kb():
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class SoakDriver:
+    def __init__(self, app, rng, sort_options):
+        self.app = app
+        self.sort_options = list(sort_options)
+        self.root = app.root
+        self.rng = rng
+        self.actions = [
+            (self.search, 3),
+            (self.next_page, 3),
+            (self.previous_page, 2),
+            (self.headlines, 1),
+            (self.category, 2),
+            (self.toggle_view, 2),
+            (self.toggle_groups, 1),
+            (self.change_sort, 1),
+            (self.select, 6),
+            (self.hover, 6),
+            (self.filter_saved, 1),
+        ]
+        self.weights = [weight for _, weight in self.actions]
+        self.counts = {}
+
+    def step(self):
+        action = self.rng.choices(self.actions, self.weights)[0][0]
+        action()
+        self.counts[action.__name__] = self.counts.get(action.__name__, 0) + 1
+        self.root.update()
+
+    def search(self):
+        self.app.search_entry.delete(0, 'end')
+        self.app.search_entry.insert(0, self.rng.choice(SEARCH_TERMS))
+        self.app.current_page = 1
+        self.app.search_news()
+
+    def next_page(self):
+        self.app.next_page()
+
+    def previous_page(self):
+        self.app.previous_page()
+
+    def headlines(self):
+        self.app.search_entry.delete(0, 'end')
+        self.app.select_source('newsapi')
+
+    def category(self):
+        self.app.filter_category(self.rng.choice(CATEGORIES))
+
+    def toggle_view(self):
+        self.app.view_var.set("list" if self.app.is_card_view() else "cards")
+        self.app.toggle_view()
+
+    def toggle_groups(self):
+        self.app.group_var.set(not self.app.group_var.get())
+        self.app.toggle_story_groups()
+
+    def change_sort(self):
+        self.app.sort_var.set(self.rng.choice(self.sort_options))
+        self.app.on_sort_change()
+
+    def select(self):
+        rows = [row for row in self.app.article_list.get_children() if row.isdigit()]
+        if rows:
+            self.app.article_list.selection_set(self.rng.choice(rows))
+
+    def hover(self):
+        widgets = list(self.app.category_buttons)
+        if self.app.is_card_view() and hasattr(self.app, 'card_container'):
+            widgets.extend(self.app.card_container.winfo_children())
+        if widgets:
+            widget = self.rng.choice(widgets)
+            widget.event_generate('<Enter>', x=5, y=5, rootx=100, rooty=100)
+            self.root.update()
+            widget.event_generate('<Leave>', x=5, y=5, rootx=100, rooty=100)
+
+    def filter_saved(self):
+        self.app.saved_search_var.set(self.rng.choice(["", "a", "story", "zzz"]))
+
+
+def take_sample(app, iteration, started):
+    traced, _ = tracemalloc.get_traced_memory()
+    return {
+        'iteration': iteration,
+        'elapsed': round(time.time() - started, 2),
+        'rss_kb': rss_kb(),
+        'widgets': app.count_widgets(),
+        'images': len(app.root.image_names()),
+        'traced_kb': traced // 1024
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Long-session soak test for News Explorer")
+    parser.add_argument('--iterations', type=int, default=5000)
+    parser.add_argument('--sample-every', type=int, default=100)
+    parser.add_argument('--warmup', type=float, default=0.1, help="fraction of iterations before the baseline")
+    parser.add_argument('--rss-budget-mb', type=float, default=40)
+    parser.add_argument('--traced-budget-mb', type=float, default=20)
+    parser.add_argument('--widget-budget', type=int, default=50)
+    parser.add_argument('--image-budget', type=int, default=10)
+    parser.add_argument('--api-latency', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--report', help="write samples and the verdict as JSON")
+    args = parser.parse_args()
+
+    display = start_display()
+    home = tempfile.mkdtemp(prefix="newsapp-soak-")
+    os.environ['HOME'] = home  # Keep saves, caches and snapshots out of the real profile
+
+    from fixture_server import FixtureServer
+    import tkinter as tk
+    import news_app
+
+    server = FixtureServer(latency=args.api_latency).start()
+    news_app.API_KEY = 'soak'
+    news_app.API_BASE_URL = server.base_url
+    news_app.FEEDS = [server.feed_url('world'), server.feed_url('tech', 'atom')]
+    news_app.UI_POLL_WHEN_IDLE = True
+
+    tracemalloc.start(10)
+    root = tk.Tk()
+    app = news_app.NewsApp(root)
+    driver = SoakDriver(app, random.Random(args.seed), news_app.SORT_OPTIONS)
+
+    samples = []
+    started = time.time()
+    warmup = int(args.iterations * args.warmup)
+    baseline_snapshot = None
+    try:
+        for iteration in range(1, args.iterations + 1):
+            driver.step()
+            if iteration == warmup:
+                baseline_snapshot = tracemalloc.take_snapshot()
+            if iteration % args.sample_every == 0 or iteration in (warmup, args.iterations):
+                samples.append(take_sample(app, iteration, started))
+                print(json.dumps(samples[-1]), flush=True)
+        final_snapshot = tracemalloc.take_snapshot()
+        histograms = app.metrics.snapshot()['histograms']
+    finally:
+        app.on_close()
+        server.shutdown()
+        if display:
+            display.terminate()
+        shutil.rmtree(home, ignore_errors=True)
+
+    baseline = next(s for s in samples if s['iteration'] >= warmup)
+    final = samples[-1]
+    growth = {
+        'rss_mb': (final['rss_kb'] - baseline['rss_kb']) / 1024,
+        'traced_mb': (final['traced_kb'] - baseline['traced_kb']) / 1024,
+        'widgets': final['widgets'] - baseline['widgets'],
+        'images': final['images'] - baseline['images']
+    }
+    budgets = {
+        'rss_mb': args.rss_budget_mb,
+        'traced_mb': args.traced_budget_mb,
+        'widgets': args.widget_budget,
+        'images': args.image_budget
+    }
+    failures = [name for name, value in growth.items() if value > budgets[name]]
+
+    top = []
+    if baseline_snapshot is not None:
+        for stat in final_snapshot.compare_to(baseline_snapshot, 'lineno')[:10]:
+            top.append(f"{stat.traceback[0].filename}:{stat.traceback[0].lineno} "
+                       f"{stat.size_diff / 1024:+.1f} KB ({stat.count_diff:+d} blocks)")
+
+    print("\nActions:", json.dumps(driver.counts))
+    print("Growth after warm-up:")
+    for name, value in growth.items():
+        status = "FAIL" if name in failures else "ok"
+        print(f"  {name:<10} {value:+10.1f}  budget {budgets[name]:g}  {status}")
+    print("Latency:")
+    for name, summary in sorted(histograms.items()):
+        print(f"  {name:<20} {summary}")
+    print("Top allocators since warm-up:")
+    for line in top:
+        print(f"  {line}")
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump({'samples': samples, 'growth': growth, 'budgets': budgets,
+                       'failures': failures, 'top_allocators': top, 'actions': driver.counts,
+                       'histograms': histograms}, f, indent=2)
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
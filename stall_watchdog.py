@@ -0,0 +1,110 @@
+from collections import Counter
+import logging
+from logging.handlers import RotatingFileHandler
+import queue
+import sys
+import threading
+import time
+import traceback
+
+HEARTBEAT_MS = 20
+STALL_THRESHOLD_MS = 100
+STALL_BUCKETS_MS = (100, 150, 250, 500, 1000, 2500, 5000, 10000)
+MAX_STACKS_PER_STALL = 50    # Samples kept while one stall lasts
+LOG_BYTES = 1024 * 1024
+LOG_BACKUPS = 3
+
+
+class StallWatchdog:
+    """Detects stalls of the Tk event loop and records what the Tk thread was doing.
+
+    The Tk thread stamps a heartbeat every HEARTBEAT_MS through root.after.
+    A daemon thread watches the stamp; while it is overdue it samples the Tk
+    thread's stack with sys._current_frames(). When the next heartbeat
+    shows the loop was blocked past the threshold, the stall's length and
+    its most common stacks go to a rotating log, and the length into the
+    ui.stall_ms histogram.
+    """
+
+    def __init__(self, root, log_path, metrics=None, threshold_ms=STALL_THRESHOLD_MS,
+                 heartbeat_ms=HEARTBEAT_MS):
+        self.root = root
+        self.metrics = metrics
+        self.threshold = threshold_ms / 1000
+        self.interval = heartbeat_ms / 1000
+        self.heartbeat_ms = heartbeat_ms
+        self.log_path = log_path
+        self.tk_thread = threading.get_ident()  # Created on the Tk thread
+        self.last_beat = time.perf_counter()
+        self.stalls = queue.Queue()   # (start, end) of each finished stall, from the Tk thread
+        self.samples = []             # (time, stack) taken while the heartbeat was overdue
+        self.longest_ms = 0.0
+        self.running = False
+        self.after_id = None
+
+        self.logger = logging.getLogger('newsapp.stalls')
+        self.logger.propagate = False
+        self.handler = RotatingFileHandler(log_path, maxBytes=LOG_BYTES, backupCount=LOG_BACKUPS,
+                                           encoding='utf-8')
+        self.handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+        self.logger.addHandler(self.handler)
+        self.logger.setLevel(logging.INFO)
+
+    def start(self):
+        self.running = True
+        self.last_beat = time.perf_counter()
+        self.after_id = self.root.after(self.heartbeat_ms, self._beat)
+        threading.Thread(target=self._watch, name="stall-watchdog", daemon=True).start()
+
+    def stop(self):
+        self.running = False
+        if self.after_id is not None:
+            try:
+                self.root.after_cancel(self.after_id)
+            except Exception:
+                pass  # Tk already gone
+            self.after_id = None
+        self.logger.removeHandler(self.handler)
+        self.handler.close()
+
+    def _beat(self):
+        # Tk thread: as cheap as possible, the watcher does the rest
+        now = time.perf_counter()
+        if now - self.last_beat - self.interval > self.threshold:
+            self.stalls.put((self.last_beat, now))
+        self.last_beat = now
+        if self.running:
+            self.after_id = self.root.after(self.heartbeat_ms, self._beat)
+
+    def _watch(self):
+        # Sampling starts well before the threshold, so stalls just over it still get a stack
+        poll = min(self.interval, self.threshold / 5)
+        while self.running:
+            time.sleep(poll)
+            now = time.perf_counter()
+            # _beat queues a stall before moving last_beat, so every stall ending by `beat` is queued
+            beat = self.last_beat
+            if now - beat > 2 * self.interval and len(self.samples) < MAX_STACKS_PER_STALL:
+                frame = sys._current_frames().get(self.tk_thread)
+                if frame is not None:
+                    self.samples.append((now, ''.join(traceback.format_stack(frame))))
+                del frame
+            while not self.stalls.empty():
+                start, end = self.stalls.get()
+                self._report((end - start - self.interval) * 1000,
+                             [stack for at, stack in self.samples if start <= at <= end])
+            # Older samples were reported above or came from a hiccup under the threshold
+            self.samples = [(at, stack) for at, stack in self.samples if at > beat]
+
+    def _report(self, stall_ms, stacks):
+        self.longest_ms = max(self.longest_ms, stall_ms)
+        if self.metrics is not None:
+            self.metrics.incr('ui.stalls')
+            self.metrics.observe('ui.stall_ms', stall_ms, bounds=STALL_BUCKETS_MS)
+        lines = [f"UI stalled for {stall_ms:.0f} ms ({len(stacks)} stack samples)"]
+        if not stacks:
+            lines.append("  stack not captured")
+        for stack, count in Counter(stacks).most_common(3):
+            lines.append(f"  {count}/{len(stacks)} samples in:")
+            lines.append(stack.rstrip())
+        self.logger.info('\n'.join(lines))
@@ -0,0 +1,146 @@
+import hashlib
+import queue
+import re
+import threading
+import numpy as np
+from prefetch import LruCache
+from textutil import strip_truncation, tokenize
+
+SUMMARY_SENTENCES = 2
+DAMPING = 0.85
+ITERATIONS = 30
+MIN_SENTENCE_CHARS = 25
+CACHE_ITEMS = 5000
+BATCH_ARTICLES = 20  # Similarity matrices grow with the square of the batch's sentences
+
+SENTENCE_RE = re.compile(r'(?<=[.!?])["\')\]]?\s+(?=[A-Z0-9"\'(\[])')
+
+
+def split_sentences(text):
+    sentences = []
+    seen = set()
+    for sentence in SENTENCE_RE.split(text):
+        sentence = sentence.strip()
+        key = sentence.lower()
+        if len(sentence) >= MIN_SENTENCE_CHARS and key not in seen:
+            seen.add(key)
+            sentences.append(sentence)
+    return sentences
+
+
+def summary_source(article):
+    # Description plus whatever body text the source gave us, without repeats
+    description = (article.get('description') or '').strip()
+    content = strip_truncation(article.get('content')).strip()
+    if content.startswith(description[:60]):
+        return content or description
+    return f"{description} {content}".strip()
+
+
+def content_key(text):
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+
+def textrank(documents, limit=SUMMARY_SENTENCES):
+    """Summarize several documents with one sentence graph.
+
+    Every sentence of the batch becomes a row of one term matrix, and a
+    single matrix product gives all cosine similarities. A block mask keeps
+    the edges inside each document, so the PageRank iterations run over the
+    whole batch at once.
+    """
+    sentence_lists = [split_sentences(text) for text in documents]
+    summaries = [None] * len(documents)
+    graph_docs = []
+    for i, sentences in enumerate(sentence_lists):
+        if len(sentences) <= limit:
+            summaries[i] = ' '.join(sentences) if sentences else documents[i].strip()
+        else:
+            graph_docs.append(i)
+    if not graph_docs:
+        return summaries
+
+    vocab = {}
+    rows, cols, owners = [], [], []
+    sentences = []
+    for doc in graph_docs:
+        for sentence in sentence_lists[doc]:
+            row = len(sentences)
+            sentences.append(sentence)
+            owners.append(doc)
+            for term in tokenize(sentence):
+                rows.append(row)
+                cols.append(vocab.setdefault(term, len(vocab)))
+
+    counts = np.zeros((len(sentences), max(len(vocab), 1)), dtype=np.float32)
+    np.add.at(counts, (np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64)), 1.0)
+    matrix = np.log1p(counts)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+
+    owners = np.array(owners)
+    similarity = matrix @ matrix.T
+    similarity *= owners[:, None] == owners[None, :]
+    np.fill_diagonal(similarity, 0.0)
+
+    # Row-normalized transitions; sentences with no edges spread evenly within their document
+    doc_sizes = np.bincount(owners)[owners].astype(np.float32)
+    out_weight = similarity.sum(axis=1)
+    isolated = out_weight == 0
+    if isolated.any():
+        similarity[isolated] = (owners[isolated][:, None] == owners[None, :]) / doc_sizes[isolated][:, None]
+        out_weight[isolated] = 1.0
+    transition = similarity / out_weight[:, None]
+
+    scores = 1.0 / doc_sizes
+    for _ in range(ITERATIONS):
+        scores = (1 - DAMPING) / doc_sizes + DAMPING * (transition.T @ scores)
+
+    starts = np.searchsorted(owners, graph_docs)
+    for doc, start in zip(graph_docs, starts):
+        end = start + len(sentence_lists[doc])
+        best = np.sort(np.argsort(-scores[start:end], kind='stable')[:limit])
+        summaries[doc] = ' '.join(sentences[start + i] for i in best)
+    return summaries
+
+
+class Summarizer:
+    """Summarizes pages of articles on a worker thread, cached by content hash."""
+
+    def __init__(self, cache_items=CACHE_ITEMS):
+        self.cache = LruCache(max_items=cache_items)
+        self.queue = queue.Queue()
+        threading.Thread(target=self._work, name="summarizer", daemon=True).start()
+
+    def cached(self, article):
+        text = summary_source(article)
+        if not text:
+            return None
+        return self.cache.get(content_key(text))
+
+    def submit(self, articles, callback):
+        # callback(results) runs on the worker with {url: summary} for newly summarized articles
+        pending = [a for a in articles if self.cached(a) is None and summary_source(a)]
+        if pending:
+            self.queue.put((pending, callback))
+
+    def summarize(self, articles):
+        results = {}
+        for start in range(0, len(articles), BATCH_ARTICLES):
+            batch = articles[start:start + BATCH_ARTICLES]
+            texts = [summary_source(a) for a in batch]
+            for article, text, summary in zip(batch, texts, textrank(texts)):
+                self.cache.put(content_key(text), summary)
+                results[article.get('url')] = summary
+        return results
+
+    def _work(self):
+        while True:
+            articles, callback = self.queue.get()
+            try:
+                results = self.summarize(articles)
+            except Exception as e:
+                print(f"Error summarizing articles: {e}")
+                continue
+            callback(results)
@@ -0,0 +1,46 @@
+import threading
+from clustering import StoryClusterer
+
+
+def article(i, title):
+    return {'url': f"https://example.com/{i}", 'title': title, 'source': {'name': f"Source {i}"}}
+
+
+ARTICLES = [
+    article(0, "Volcano erupts near Reykjavik, flights grounded across Iceland"),
+    article(1, "Stock markets rally as inflation cools"),
+    article(2, "Iceland volcano erupts again near Reykjavik as flights are grounded"),
+    article(3, "Football club signs new striker"),
+]
+
+
+def test_similar_headlines_form_one_story():
+    clusterer = StoryClusterer()
+    clusterer.add(ARTICLES)
+    stories = clusterer.stories(ARTICLES)
+    grouped = [indices for cluster, indices, lead in stories if len(indices) > 1]
+    assert grouped == [[0, 2]]
+    lead = next(lead for cluster, indices, lead in stories if indices == [0, 2])
+    assert lead in (0, 2)
+    # Every article appears exactly once
+    assert sorted(i for _, indices, _ in stories for i in indices) == [0, 1, 2, 3]
+
+
+def test_vectors_keep_only_used_features():
+    clusterer = StoryClusterer()
+    features, matrix = clusterer.vectorize([["volcano", "iceland"], ["markets"]])
+    assert matrix.shape == (2, len(features))
+    assert len(features) <= 3
+    assert clusterer.doc_freq.sum() == len(features)
+
+
+def test_grouping_runs_after_earlier_submissions():
+    clusterer = StoryClusterer()
+    done = threading.Event()
+    results = []
+    clusterer.submit(ARTICLES[:2])
+    clusterer.submit(ARTICLES[2:])
+    clusterer.submit_grouping(ARTICLES, lambda stories: (results.append(stories), done.set()))
+    assert done.wait(5)
+    assert results[0] == clusterer.stories(ARTICLES)
+    assert [0, 2] in [indices for _, indices, _ in results[0]]
@@ -0,0 +1,69 @@
+import threading
+import time
+from dispatcher import UiDispatcher
+
+
+class FakeRoot:
+    def __init__(self):
+        self.timers = []
+        self.lock = threading.Lock()
+
+    def after(self, ms, callback):
+        with self.lock:
+            self.timers.append((ms, callback))
+
+    def run_due(self):
+        with self.lock:
+            timers, self.timers = self.timers, []
+        for _, callback in timers:
+            callback()
+        return len(timers)
+
+
+class Counter:
+    def __init__(self):
+        self.counts = {}
+
+    def incr(self, key, n=1):
+        self.counts[key] = self.counts.get(key, 0) + n
+
+    def observe(self, key, value):
+        pass
+
+
+def test_idle_dispatcher_schedules_nothing_until_a_post():
+    root = FakeRoot()
+    ui = UiDispatcher(root)
+    assert root.timers == []
+    ran = []
+    worker = threading.Thread(target=lambda: [ui.post(lambda i=i: ran.append(i)) for i in range(3)])
+    worker.start()
+    worker.join()
+    assert len(root.timers) == 1  # Only the post that filled the empty queue schedules a tick
+    root.run_due()
+    assert ran == [0, 1, 2]
+    assert root.timers == []
+
+
+def test_deferred_counts_updates_left_for_later_ticks():
+    root = FakeRoot()
+    metrics = Counter()
+    ui = UiDispatcher(root, metrics, budget_ms=1)
+    for _ in range(4):
+        ui.post(lambda: time.sleep(0.002))  # Each update overruns the budget on its own
+    ticks = 0
+    while root.run_due():
+        ticks += 1
+    assert ticks == 4
+    assert metrics.counts['ui.dispatched'] == 4
+    assert metrics.counts['ui.deferred'] == 3 + 2 + 1
+
+
+def test_polling_driver_keeps_ticking():
+    root = FakeRoot()
+    ui = UiDispatcher(root, poll_when_idle=True)
+    assert len(root.timers) == 1
+    root.run_due()
+    assert len(root.timers) == 1
+    ui.post(lambda: None)
+    assert len(root.timers) == 1  # Already polling, so the post adds no tick of its own
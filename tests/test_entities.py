@@ -0,0 +1,45 @@
+from entities import EntityIndex
+
+
+def fetched(i, text="Angela Merkel visits Paris"):
+    return {'url': f"https://example.com/{i}", 'title': text}
+
+
+def test_saved_articles_survive_the_cap():
+    index = EntityIndex(max_articles=10)
+    saved = {'path': '/library/a.txt', 'title': "Tim Cook visits Tokyo"}
+    index.add([saved])
+    index.add([fetched(i) for i in range(25)])
+    assert saved in index.articles_for('Tim Cook')
+    # Only the newest fetched articles are kept
+    urls = {article.get('url') for article in index.articles_for('Angela Merkel')}
+    assert "https://example.com/24" in urls
+    assert "https://example.com/0" not in urls
+    assert len(index.articles) - len(index.saved) <= 10
+
+
+def test_saving_a_fetched_article_pins_it():
+    index = EntityIndex(max_articles=10)
+    index.add([fetched(0, "Tim Cook visits Tokyo")])
+    index.add([{'path': '/library/a.txt', 'url': "https://example.com/0", 'title': "Tim Cook visits Tokyo"}])
+    index.add([fetched(i) for i in range(1, 30)])
+    assert [a['url'] for a in index.articles_for('Tim Cook')] == ["https://example.com/0"]
+
+
+def test_removing_a_saved_file():
+    index = EntityIndex(max_articles=10)
+    index.add([{'path': '/library/a.txt', 'title': "Tim Cook visits Tokyo"}])
+    index.add([fetched(0, "Angela Merkel visits Paris")])
+    index.add([{'path': '/library/b.txt', 'url': "https://example.com/0", 'title': "Angela Merkel visits Paris"}])
+
+    # A library-only article disappears with its file
+    index.remove_saved('/library/a.txt')
+    assert index.articles_for('Tim Cook') == []
+    assert 'Tim Cook' not in dict((name, count) for name, _, count in index.top())
+
+    # A fetched article that was also saved is only unpinned, and is evicted like any other
+    index.remove_saved('/library/b.txt')
+    assert len(index.articles_for('Angela Merkel')) == 1
+    index.add([fetched(i) for i in range(1, 30)])
+    assert "https://example.com/0" not in {a['url'] for a in index.articles_for('Angela Merkel')}
+    assert index.saved == set()
@@ -0,0 +1,20 @@
+from fuzzy import TrigramIndex
+
+
+def test_keys_after_clear_and_add():
+    index = TrigramIndex()
+    index.clear()
+    assert index.keys() == []
+    index.add('a', "Central bank raises rates")
+    index.add('b', "Storm hits the coast")
+    assert sorted(index.keys()) == ['a', 'b']
+
+
+def test_keys_after_remove_and_rebuild():
+    index = TrigramIndex()
+    for i in range(1500):
+        index.add(i, f"headline number {i}")
+    for i in range(1200):
+        index.remove(i)  # Past the dead threshold, so the postings are rebuilt
+    assert sorted(index.keys()) == list(range(1200, 1500))
+    assert index.search("headline number 1499")[0][0] == 1499
@@ -0,0 +1,110 @@
+import pytest
+import requests
+from fixture_server import FixtureServer
+from news_sources import FeedCollection, FeedSource, NewsSource, parse_feed
+
+
+@pytest.fixture
+def server():
+    server = FixtureServer(items=5).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def fetch_items(url):
+    response = requests.get(url, timeout=5)
+    response.raise_for_status()
+    # Small chunks exercise the incremental parser across element boundaries
+    body = response.content
+    return list(parse_feed((body[i:i + 97] for i in range(0, len(body), 97)), url))
+
+
+def test_rss_items_are_normalized(server):
+    url = server.feed_url('world')
+    items = fetch_items(url)
+    assert len(items) == 5
+    first = items[0]
+    assert first == {
+        'source': {'id': url, 'name': "World Fixture"},
+        'author': "Reporter 4",
+        'title': "World story 4: football update",
+        'description': "Coverage of football from the world desk, item 4.",
+        'url': "http://fixture.local/world/4",
+        'urlToImage': "http://fixture.local/world/4.jpg",
+        'publishedAt': "2024-01-01T04:00:00Z",
+        'content': "Coverage of football from the world desk, item 4."
+    }
+
+
+def test_atom_items_are_normalized(server):
+    url = server.feed_url('tech', 'atom')
+    items = fetch_items(url)
+    assert [item['url'] for item in items] == [f"http://fixture.local/tech/{i}" for i in range(4, -1, -1)]
+    first = items[0]
+    assert first['source'] == {'id': url, 'name': "Tech Atom Fixture"}
+    assert first['author'] == "Reporter 4"
+    assert first['description'] == "Coverage of football from the tech desk, item 4."
+    assert first['publishedAt'] == "2024-01-01T04:00:00Z"
+    assert first['urlToImage'] is None
+
+
+def test_poll_sends_validators_and_handles_304(server):
+    feed = FeedSource(server.feed_url('world'))
+    assert feed.poll(force=True)
+    assert feed.etag and feed.last_modified
+    assert len(feed.items) == 5
+
+    assert not feed.poll(force=True)
+    assert feed.not_modified == 1
+    assert server.feed_hits == 1
+    assert len(feed.items) == 5  # A 304 keeps the items from the last full fetch
+
+    # Only Last-Modified known: the server falls back to If-Modified-Since
+    feed.etag = None
+    assert not feed.poll(force=True)
+    assert feed.not_modified == 2
+
+    server.feeds.bump('world')
+    assert feed.poll(force=True)
+    assert len(feed.items) == 6
+    assert server.feed_hits == 2
+
+
+def test_poll_respects_interval(server):
+    feed = FeedSource(server.feed_url('world'))
+    assert feed.poll(force=True)
+    assert not feed.poll()
+    assert feed.polls == 1
+
+
+def test_poll_all_merges_feeds(server):
+    urls = [server.feed_url('world'), server.feed_url('tech', 'atom'), server.feed_url('world', 'atom')]
+    feeds = FeedCollection(urls + [f"{server.base_url}/feeds/missing.txt"])
+    assert feeds.poll_all(force=True) == 3
+    assert list(feeds.errors) == [f"{server.base_url}/feeds/missing.txt"]
+
+    articles = feeds.articles()
+    # The RSS and Atom renderings of 'world' share item URLs and are merged
+    assert len(articles) == 10
+    assert len({a['url'] for a in articles}) == 10
+    published = [a['publishedAt'] for a in articles]
+    assert published == sorted(published, reverse=True)
+
+    assert feeds.poll_all(force=True) == 0
+    assert sum(feed.not_modified for feed in feeds.feeds) == 3
+
+
+def test_collection_pages_and_searches(server):
+    feeds = FeedCollection([server.feed_url('world'), server.feed_url('tech', 'atom')])
+    page, total = feeds.top_headlines(page=2, page_size=4)
+    assert total == 10
+    assert len(page) == 4
+    matches, total = feeds.search("tech football")
+    assert total == 1
+    assert matches[0]['url'] == "http://fixture.local/tech/4"
+
+
+def test_source_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        NewsSource()
@@ -0,0 +1,80 @@
+import queue
+import prefetch
+from prefetch import NeighbourPrefetcher
+
+
+def run_queued(prefetcher, loaded, limit=None):
+    # limit: loads a worker gets through before the next key repeat
+    before = len(loaded)
+    while limit is None or len(loaded) - before < limit:
+        try:
+            prefetcher._run(prefetcher.queue.get_nowait())
+        except queue.Empty:
+            break
+
+
+def make_prefetcher(monkeypatch, loaded):
+    ticks = iter(range(1000))
+    # Selections 0.05 s apart count as holding an arrow key
+    monkeypatch.setattr(prefetch.time, 'monotonic', lambda: next(ticks) * 0.05)
+    return NeighbourPrefetcher({
+        'image': (lambda article: loaded.append(('image', article)), None, False),
+        'related': (lambda article: loaded.append(('related', article)), 2, True),
+    }, workers=0)
+
+
+def test_held_arrow_key_keeps_look_ahead_work(monkeypatch):
+    loaded = []
+    prefetcher = make_prefetcher(monkeypatch, loaded)
+    articles = list(range(100))
+    ahead = 0
+    for index in range(1, 40):
+        prefetcher.on_select(articles, index)
+        before = len(loaded)
+        run_queued(prefetcher, loaded, limit=2)  # Workers fall behind the key repeat
+        ahead += sum(1 for _, row in loaded[before:] if row > index)
+    assert prefetcher.distance == prefetch.MAX_DISTANCE
+    # Jobs queued by earlier selections still ran while the key was held, warming rows ahead
+    assert ahead >= 30
+    assert not any(kind == 'related' for kind, _ in loaded)
+    # Rows the selection has left behind the window are dropped instead of loaded
+    prefetcher.on_select(articles, 80)
+    before = len(loaded)
+    run_queued(prefetcher, loaded)
+    assert all(74 <= row <= 86 for _, row in loaded[before:])
+
+
+def test_related_work_only_for_a_settled_selection(monkeypatch):
+    loaded = []
+    prefetcher = make_prefetcher(monkeypatch, loaded)
+    articles = list(range(100))
+    prefetcher.on_select(articles, 10)
+    prefetcher.on_settle(articles, 10)
+    prefetcher.on_select(articles, 11)  # Moved on before the related lookups ran
+    prefetcher.on_settle(articles, 11)
+    run_queued(prefetcher, loaded)
+    assert sorted(row for kind, row in loaded if kind == 'related') == [10, 12]
+
+
+class Counter:
+    def __init__(self):
+        self.counts = {}
+
+    def incr(self, key, n=1):
+        self.counts[key] = self.counts.get(key, 0) + n
+
+
+def test_only_rows_leaving_the_window_are_cancelled(monkeypatch):
+    loaded = []
+    prefetcher = make_prefetcher(monkeypatch, loaded)
+    prefetcher.metrics = metrics = Counter()
+    articles = list(range(100))
+    for index in range(10, 20):
+        prefetcher.on_select(articles, index)
+    assert prefetcher.window == (13, 25)
+    stale = [row for _, _, row in prefetcher.queued if not 13 <= row <= 25 or row == 19]
+    run_queued(prefetcher, loaded)
+    images = sorted(row for kind, row in loaded if kind == 'image')
+    assert images == [row for row in range(13, 26) if row != 19]
+    # Only the rows the selection left behind, and the selected row itself, were dropped
+    assert stale and metrics.counts['prefetch.cancelled'] == len(stale)
@@ -0,0 +1,56 @@
+from io import BytesIO
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+from PIL import Image
+import pytest
+import progressive
+from fixture_server import FixtureServer
+from progressive import BandwidthEstimator, stream_image
+
+
+@pytest.fixture
+def jpeg_server():
+    image = Image.effect_noise((640, 480), 60).convert('RGB')
+    output = BytesIO()
+    image.save(output, format='JPEG', quality=90, progressive=True)
+    body = output.getvalue()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'image/jpeg')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/photo.jpg", body
+    server.shutdown()
+    server.server_close()
+
+
+def test_jpeg_previews_and_final_image(jpeg_server, monkeypatch):
+    monkeypatch.setattr(progressive, 'PREVIEW_INTERVAL', 0)
+    url, body = jpeg_server
+    previews = []
+    estimator = BandwidthEstimator()
+    data, image = stream_image(url, estimator, previews.append, (160, 120))
+    assert data == body
+    assert image.size == (640, 480)
+    assert previews and all(preview.size[0] <= 640 for preview in previews)
+    assert estimator.average_image_bytes == len(body)
+
+
+def test_png_is_returned_decoded():
+    server = FixtureServer().start()
+    try:
+        data, image = stream_image(f"{server.base_url}/images/3.png", on_preview=lambda image: None)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert data.startswith(b'\x89PNG')
+    assert image.size == (400, 240)
@@ -0,0 +1,31 @@
+from query_engine import ArticleQueryEngine
+
+
+def article(name, source="Wire", published="2024-01-01T00:00:00Z"):
+    return {'url': f"https://example.com/{name}", 'title': name.upper(), 'source': {'name': source},
+            'publishedAt': published}
+
+
+def titles(results):
+    return [a['title'] for a in results]
+
+
+def test_rank_is_kept_per_scope():
+    engine = ArticleQueryEngine()
+    engine.add([article('x'), article('y'), article('z')], scope='s1')
+    engine.add([article('z'), article('y'), article('x')], scope='s2')
+    assert titles(engine.query(scope='s1', sort=(('rank', False),))) == ['X', 'Y', 'Z']
+    assert titles(engine.query(scope='s2', sort=(('rank', False),))) == ['Z', 'Y', 'X']
+
+
+def test_readd_updates_sort_keys_and_facets():
+    engine = ArticleQueryEngine()
+    engine.add([article('x', published="2024-01-01T00:00:00Z"), article('y', published="2024-01-02T00:00:00Z")],
+               scope='s1')
+    assert titles(engine.query(scope='s1')) == ['Y', 'X']
+    engine.add([article('x', source="Other", published="2024-01-03T00:00:00Z")], scope='s1')
+    assert titles(engine.query(scope='s1')) == ['X', 'Y']
+    facets = engine.facets()
+    assert facets['source'] == {'Wire': 1, 'Other': 1}
+    assert '2024-01-01' not in facets['day']
+    assert titles(engine.query(sources=['Other'])) == ['X']
@@ -0,0 +1,39 @@
+import json
+import os
+import numpy as np
+from trending import LEGACY_VOCAB_FILE, TermTrendStore
+
+NOW = 1_700_000_000
+
+
+def articles(n, word):
+    return [{'url': f"https://example.com/{word}/{i}", 'title': f"{word} news item {i}",
+             'publishedAt': None} for i in range(n)]
+
+
+def test_save_and_load_keep_terms_with_counts(tmp_path):
+    store = TermTrendStore()
+    store.add(articles(5, "volcano"), now=NOW)
+    store.save(str(tmp_path))
+    assert os.listdir(tmp_path) == ["trending.npz"]
+
+    loaded = TermTrendStore.load(str(tmp_path))
+    assert loaded.terms == store.terms
+    assert np.array_equal(loaded.counts, store.counts)
+    column = loaded.vocab["volcano"]
+    assert loaded.counts[:, column].sum() == 5
+
+
+def test_load_reads_the_legacy_vocabulary_file(tmp_path):
+    store = TermTrendStore()
+    store.add(articles(3, "harbour"), now=NOW)
+    np.savez_compressed(tmp_path / "trending.npz", counts=store.counts, row_hours=store.row_hours,
+                        seen=np.fromiter(store.seen, dtype=np.int64, count=len(store.seen)))
+    with open(tmp_path / LEGACY_VOCAB_FILE, 'w', encoding='utf-8') as f:
+        json.dump(store.terms, f)
+
+    loaded = TermTrendStore.load(str(tmp_path))
+    assert loaded.terms == store.terms
+    loaded.add(articles(1, "ferry"), now=NOW)
+    loaded.save(str(tmp_path))
+    assert not (tmp_path / LEGACY_VOCAB_FILE).exists()
@@ -0,0 +1,39 @@
+import re
+import zlib
+
+WORD_RE = re.compile(r"[a-z0-9][a-z0-9'\-]*[a-z0-9]|[a-z0-9]")
+TRUNCATION_RE = re.compile(r'\s*\[\+\d+ chars\]\s*$')  # NewsAPI content suffix
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from further had
+has have having he her here hers herself him himself his how i if in into is it its itself just
+me more most my myself no nor not now of off on once only or other our ours ourselves out over own
+same says said she should so some such than that the their theirs them themselves then there these
+they this those through to too under until up very was we were what when where which while who
+whom why will with would you your yours yourself yourselves new news latest today report reports
+update updates video watch live amp via one two first last year years week day days time get gets
+""".split())
+
+
+def article_text(article):
+    return f"{article.get('title') or ''} {article.get('description') or ''}"
+
+
+def strip_truncation(text):
+    return TRUNCATION_RE.sub('', text or '')
+
+
+def tokenize(text):
+    # Lower-cased word tokens without stopwords or bare numbers
+    return [t for t in WORD_RE.findall(text.lower())
+            if len(t) > 2 and t not in STOPWORDS and not t.isdigit()]
+
+
+def stable_hash(term):
+    # Python's hash() is salted per process; feature ids must survive restarts
+    return zlib.crc32(term.encode('utf-8'))
+
+
+def hashed_features(tokens, n_features):
+    return [stable_hash(t) % n_features for t in tokens]
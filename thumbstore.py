@@ -0,0 +1,236 @@
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import zlib
+
+# Record: magic, key, payload length, payload crc32, then the payload
+RECORD = struct.Struct('<4s16sII')
+MAGIC = b'THMB'
+# Index snapshot entry: key, segment, offset, length, last access tick
+INDEX_ENTRY = struct.Struct('<16sIQIQ')
+INDEX_HEADER = struct.Struct('<4sIQ')  # magic, entry count, tick
+INDEX_MAGIC = b'TIDX'
+
+SEGMENT_BYTES = 16 * 1024 * 1024
+MAX_BYTES = 256 * 1024 * 1024
+COMPACT_TO = 0.75  # Fraction of the cap kept by a compaction
+
+
+def thumbnail_key(url, size):
+    return hashlib.blake2b(f"{size[0]}x{size[1]}|{url}".encode('utf-8'), digest_size=16).digest()
+
+
+class ThumbnailStore:
+    """Packed, append-only thumbnail segments read through mmap.
+
+    Thumbnails are appended to segment files and located through an
+    in-memory index keyed by a hash of URL and size. The index is
+    snapshotted on flush; anything appended after the last snapshot is
+    recovered by scanning the segment tails, and a torn final record is
+    truncated away.
+    """
+
+    def __init__(self, folder, max_bytes=MAX_BYTES):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.index = {}      # key -> [segment, offset, length, tick]
+        self.maps = {}       # segment -> mmap
+        self.tick = 0
+        self.live_bytes = 0
+        self.disk_bytes = 0
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def _segment_path(self, segment):
+        return os.path.join(self.folder, f"seg-{segment:06d}.dat")
+
+    def _segments(self):
+        return sorted(int(name[4:10]) for name in os.listdir(self.folder)
+                      if name.startswith('seg-') and name.endswith('.dat'))
+
+    def _load(self):
+        scanned_to = self._load_index_snapshot()
+        segments = self._segments()
+        for segment in segments:
+            self._scan(segment, scanned_to.get(segment, 0))
+            self.disk_bytes += os.path.getsize(self._segment_path(segment))
+        self.active = segments[-1] if segments else 1
+        self.active_file = open(self._segment_path(self.active), 'ab')
+
+    def _load_index_snapshot(self):
+        scanned_to = {}
+        try:
+            with open(os.path.join(self.folder, 'index.bin'), 'rb') as f:
+                magic, count, tick = INDEX_HEADER.unpack(f.read(INDEX_HEADER.size))
+                if magic != INDEX_MAGIC:
+                    return {}
+                data = f.read(count * INDEX_ENTRY.size)
+            if len(data) != count * INDEX_ENTRY.size:
+                return {}
+        except (OSError, struct.error):
+            return {}
+
+        self.tick = tick
+        for key, segment, offset, length, last in INDEX_ENTRY.iter_unpack(data):
+            path = self._segment_path(segment)
+            if not os.path.exists(path) or os.path.getsize(path) < offset + length:
+                continue
+            self.index[key] = [segment, offset, length, last]
+            self.live_bytes += length
+            end = offset + length
+            if end > scanned_to.get(segment, 0):
+                scanned_to[segment] = end
+        return scanned_to
+
+    def _scan(self, segment, start):
+        # Recover records appended after the last index snapshot
+        path = self._segment_path(segment)
+        size = os.path.getsize(path)
+        if start >= size:
+            return
+        good = start
+        with open(path, 'rb') as f:
+            f.seek(start)
+            while True:
+                header = f.read(RECORD.size)
+                if len(header) < RECORD.size:
+                    break
+                magic, key, length, crc = RECORD.unpack(header)
+                payload = f.read(length)
+                if magic != MAGIC or len(payload) < length or zlib.crc32(payload) != crc:
+                    break
+                self._index_put(key, segment, good + RECORD.size, length)
+                good += RECORD.size + length
+        if good < size:
+            # Torn append from a crash: drop the partial record
+            with open(path, 'r+b') as f:
+                f.truncate(good)
+
+    def _index_put(self, key, segment, offset, length):
+        old = self.index.get(key)
+        if old:
+            self.live_bytes -= old[2]
+        self.tick += 1
+        self.index[key] = [segment, offset, length, self.tick]
+        self.live_bytes += length
+        self.dirty = True
+
+    def _map(self, segment, end):
+        mapped = self.maps.get(segment)
+        if mapped is None or len(mapped) < end:
+            if mapped is not None:
+                mapped.close()
+            with open(self._segment_path(segment), 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.maps[segment] = mapped
+        return mapped
+
+    def get(self, url, size):
+        key = thumbnail_key(url, size)
+        with self.lock:
+            entry = self.index.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            segment, offset, length, _ = entry
+            self.tick += 1
+            entry[3] = self.tick
+            self.hits += 1
+            return self._map(segment, offset + length)[offset:offset + length]
+
+    def contains(self, url, size):
+        with self.lock:
+            return thumbnail_key(url, size) in self.index
+
+    def put(self, url, size, data):
+        if not data:
+            return
+        key = thumbnail_key(url, size)
+        record = RECORD.pack(MAGIC, key, len(data), zlib.crc32(data))
+        with self.lock:
+            if self.active_file.tell() + len(record) + len(data) > SEGMENT_BYTES and self.active_file.tell():
+                self._roll()
+            offset = self.active_file.tell() + len(record)
+            # Header and payload go out in one write, so a crash leaves at most one torn tail record
+            self.active_file.write(record + data)
+            self.active_file.flush()
+            self.disk_bytes += len(record) + len(data)
+            self._index_put(key, self.active, offset, len(data))
+            # Replaced thumbnails leave dead records behind, so disk usage is capped too
+            if self.live_bytes > self.max_bytes or self.disk_bytes > 1.5 * self.max_bytes:
+                self._compact()
+
+    def _roll(self):
+        self.active_file.close()
+        self.active += 1
+        self.active_file = open(self._segment_path(self.active), 'ab')
+
+    def _compact(self):
+        # Rewrite the most recently used thumbnails into fresh segments, drop the rest
+        keep_bytes = int(self.max_bytes * COMPACT_TO)
+        entries = sorted(self.index.items(), key=lambda item: item[1][3], reverse=True)
+        old_segments = self._segments()
+
+        self.active_file.flush()
+        self.active = old_segments[-1]
+        self._roll()
+
+        kept = {}
+        total = 0
+        disk = 0
+        for key, (segment, offset, length, tick) in entries:
+            if total + length > keep_bytes:
+                break
+            data = self._map(segment, offset + length)[offset:offset + length]
+            if self.active_file.tell() + RECORD.size + length > SEGMENT_BYTES and self.active_file.tell():
+                self._roll()
+            self.active_file.write(RECORD.pack(MAGIC, key, length, zlib.crc32(data)) + data)
+            kept[key] = [self.active, self.active_file.tell() - length, length, tick]
+            total += length
+            disk += RECORD.size + length
+        self.active_file.flush()
+
+        # The new index is on disk before the old segments go away
+        self.index = kept
+        self.live_bytes = total
+        self.disk_bytes = disk
+        self._write_index()
+        for segment in old_segments:
+            mapped = self.maps.pop(segment, None)
+            if mapped is not None:
+                mapped.close()
+            os.remove(self._segment_path(segment))
+
+    def _write_index(self):
+        tmp_path = os.path.join(self.folder, 'index.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(INDEX_HEADER.pack(INDEX_MAGIC, len(self.index), self.tick))
+            for key, (segment, offset, length, tick) in self.index.items():
+                f.write(INDEX_ENTRY.pack(key, segment, offset, length, tick))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, os.path.join(self.folder, 'index.bin'))
+        self.dirty = False
+
+    def flush(self):
+        with self.lock:
+            self.active_file.flush()
+            os.fsync(self.active_file.fileno())
+            if self.dirty:
+                self._write_index()
+
+    def close(self):
+        self.flush()
+        with self.lock:
+            self.active_file.close()
+            for mapped in self.maps.values():
+                mapped.close()
+            self.maps.clear()
+
+    def __len__(self):
+        return len(self.index)
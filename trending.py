@@ -0,0 +1,138 @@
+import json
+import os
+import time
+import numpy as np
+from query_engine import parse_published
+from textutil import article_text, tokenize, stable_hash
+
+VOCAB_SIZE = 8192         # Terms that get their own column, first come first served
+OVERFLOW_BUCKETS = 2048   # Hashed columns shared by every later term
+HISTORY_HOURS = 14 * 24   # Ring of hourly buckets: a 7 day window plus its baseline
+MIN_COUNT = 3
+MAX_SEEN = 200000
+LEGACY_VOCAB_FILE = "trending_vocab.json"  # Vocabulary file from before it moved into trending.npz
+
+
+class TermTrendStore:
+    """Hourly term counts with burst detection against a rolling baseline.
+
+    Counts live in a ring of hourly rows; each row remembers which absolute
+    hour it holds so stale rows are recycled in place instead of shifted.
+    """
+
+    def __init__(self):
+        self.counts = np.zeros((HISTORY_HOURS, VOCAB_SIZE + OVERFLOW_BUCKETS), dtype=np.uint16)
+        self.row_hours = np.full(HISTORY_HOURS, -1, dtype=np.int64)
+        self.vocab = {}
+        self.terms = []
+        self.seen = set()
+        self.dirty = False
+
+    def column(self, term):
+        slot = self.vocab.get(term)
+        if slot is None:
+            if len(self.terms) >= VOCAB_SIZE:
+                return VOCAB_SIZE + stable_hash(term) % OVERFLOW_BUCKETS
+            slot = len(self.terms)
+            self.vocab[term] = slot
+            self.terms.append(term)
+        return slot
+
+    def add(self, articles, now=None):
+        now_hour = int((now or time.time()) // 3600)
+        rows, cols = [], []
+        for article in articles:
+            key = stable_hash(article.get('url') or article_text(article))
+            if key in self.seen:
+                continue
+            if len(self.seen) >= MAX_SEEN:
+                self.seen.clear()
+            self.seen.add(key)
+
+            published = parse_published(article.get('publishedAt'))
+            hour = min(int(published // 3600), now_hour) if published else now_hour
+            if hour <= now_hour - HISTORY_HOURS:
+                continue
+
+            row = hour % HISTORY_HOURS
+            if self.row_hours[row] != hour:
+                if self.row_hours[row] > hour:
+                    continue  # Slot already recycled for a newer hour
+                self.counts[row] = 0
+                self.row_hours[row] = hour
+
+            # Count each term once per article
+            for term in set(tokenize(article_text(article))):
+                rows.append(row)
+                cols.append(self.column(term))
+
+        if rows:
+            width = self.counts.shape[1]
+            cells, increments = np.unique(np.array(rows) * width + np.array(cols), return_counts=True)
+            rows, cols = np.divmod(cells, width)
+            # Saturate instead of wrapping around
+            updated = self.counts[rows, cols].astype(np.uint32) + increments
+            self.counts[rows, cols] = np.minimum(updated, np.iinfo(np.uint16).max)
+            self.dirty = True
+        return len(articles)
+
+    def window_counts(self, start_hour, end_hour):
+        mask = (self.row_hours > start_hour) & (self.row_hours <= end_hour)
+        return self.counts[mask].sum(axis=0, dtype=np.int64)
+
+    def rising(self, window_hours, now=None, limit=25):
+        # Poisson z-score of the window against the preceding hours
+        now_hour = int((now or time.time()) // 3600)
+        baseline_hours = max(HISTORY_HOURS - window_hours, window_hours)
+        observed = self.window_counts(now_hour - window_hours, now_hour)[:VOCAB_SIZE]
+        baseline = self.window_counts(now_hour - window_hours - baseline_hours,
+                                      now_hour - window_hours)[:VOCAB_SIZE]
+
+        expected = (baseline + 0.5) * (window_hours / baseline_hours)
+        scores = (observed - expected) / np.sqrt(expected + 1.0)
+        scores[observed < MIN_COUNT] = -np.inf
+        scores[len(self.terms):] = -np.inf
+
+        candidates = min(limit, int(np.isfinite(scores).sum()))
+        if not candidates:
+            return []
+        top = np.argpartition(-scores, candidates - 1)[:candidates]
+        top = top[np.argsort(-scores[top])]
+        return [(self.terms[i], int(observed[i]), float(observed[i] / expected[i]), float(scores[i]))
+                for i in top]
+
+    def save(self, folder):
+        if not self.dirty:
+            return
+        # The vocabulary goes in the same file as the counts so one replace swaps both
+        tmp_path = os.path.join(folder, "trending.tmp.npz")
+        np.savez_compressed(tmp_path, counts=self.counts, row_hours=self.row_hours,
+                            seen=np.fromiter(self.seen, dtype=np.int64, count=len(self.seen)),
+                            terms=np.array(self.terms, dtype=str))
+        os.replace(tmp_path, os.path.join(folder, "trending.npz"))
+        try:
+            os.remove(os.path.join(folder, LEGACY_VOCAB_FILE))
+        except OSError:
+            pass
+        self.dirty = False
+
+    @classmethod
+    def load(cls, folder):
+        store = cls()
+        try:
+            with np.load(os.path.join(folder, "trending.npz")) as data:
+                if data['counts'].shape != store.counts.shape:
+                    return store
+                if 'terms' in data.files:
+                    terms = data['terms'].tolist()
+                else:
+                    with open(os.path.join(folder, LEGACY_VOCAB_FILE), encoding='utf-8') as f:
+                        terms = json.load(f)
+                store.counts = data['counts']
+                store.row_hours = data['row_hours']
+                store.seen = set(data['seen'].tolist())
+            store.terms = terms[:VOCAB_SIZE]
+            store.vocab = {term: i for i, term in enumerate(store.terms)}
+        except (OSError, ValueError, KeyError):
+            pass
+        return store
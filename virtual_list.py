@@ -0,0 +1,199 @@
+from itertools import chain
+from tkinter import ttk
+
+OVERSCAN = 40            # Rows kept in the tree above and below the viewport
+DEFAULT_ROW_HEIGHT = 20
+
+
+class VirtualTreeview:
+    """Shows a window of a large row model in a ttk.Treeview.
+
+    The model is a row count plus row(index) -> (values, tags), which is only
+    called for rows entering the window. Items are keyed by str(index), so
+    identify_row and the tree selection still map straight to model indices.
+    The scrollbar follows the model position rather than the tree's own.
+    """
+
+    def __init__(self, tree, scrollbar, on_select=None, overscan=OVERSCAN):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.on_select = on_select
+        self.overscan = overscan
+        self.count = 0
+        self.row = None
+        self.start = self.end = 0   # Model rows currently in the tree
+        self.top = 0                # Model row at the top of the viewport
+        self.selected = None
+        self.paused = False
+        self.pending = None
+        tree.configure(yscrollcommand=self._on_tree_scroll)
+        scrollbar.configure(command=self.yview)
+        tree.bind('<<TreeviewSelect>>', self._on_tree_select, add='+')
+        tree.bind('<Configure>', lambda e: self._schedule(), add='+')
+
+    def set_model(self, count, row, keep_position=False):
+        self.paused = False
+        self.count = count
+        self.row = row
+        if keep_position:
+            stale = [str(i) for i in range(max(count, self.start), self.end)]
+            if stale:
+                self.tree.delete(*stale)
+            self.end = max(self.start, min(self.end, count))
+            if self.selected is not None and self.selected >= count:
+                self.selected = None
+            self.refresh()
+        else:
+            self.clear_tree()
+            self.top = 0
+            self.selected = None
+        self.render()
+
+    def pause(self):
+        # The caller fills the tree itself (e.g. a nested layout); scrolling goes back to the tree
+        self.clear_tree()
+        self.count = 0
+        self.selected = None
+        self.paused = True
+
+    def clear_tree(self):
+        self.tree.delete(*self.tree.get_children())
+        self.start = self.end = 0
+
+    def refresh(self):
+        # Re-read the rows currently in the window, e.g. after the model changed in place
+        for i in range(self.start, self.end):
+            values, tags = self.row(i)
+            self.tree.item(str(i), values=values, tags=tags)
+
+    def row_height(self):
+        style = self.tree.cget('style') or 'Treeview'
+        try:
+            return int(ttk.Style(self.tree).lookup(style, 'rowheight') or DEFAULT_ROW_HEIGHT)
+        except (ValueError, TypeError):
+            return DEFAULT_ROW_HEIGHT
+
+    def visible_rows(self):
+        # One row's worth of height goes to the headings
+        return max(1, self.tree.winfo_height() // self.row_height() - 1)
+
+    def render(self):
+        self.pending = None
+        if self.paused:
+            return
+        visible = self.visible_rows()
+        self.top = max(0, min(self.top, self.count - visible))
+        start = max(0, self.top - self.overscan)
+        end = min(self.count, self.top + visible + self.overscan)
+        if (start, end) != (self.start, self.end):
+            self._shift(start, end)
+        if self.end > self.start:
+            self.tree.yview_moveto((self.top - self.start) / (self.end - self.start))
+        self._update_scrollbar(visible)
+
+    def _shift(self, start, end):
+        old_start, old_end = self.start, self.end
+        if start >= old_end or end <= old_start:
+            self.clear_tree()
+            old_start = old_end = start
+        else:
+            stale = [str(i) for i in chain(range(old_start, start), range(end, old_end))]
+            if stale:
+                self.tree.delete(*stale)
+            old_start, old_end = max(start, old_start), min(end, old_end)
+        for i in range(old_start - 1, start - 1, -1):
+            values, tags = self.row(i)
+            self.tree.insert('', 0, iid=str(i), values=values, tags=tags)
+        for i in range(old_end, end):
+            values, tags = self.row(i)
+            self.tree.insert('', 'end', iid=str(i), values=values, tags=tags)
+        self.start, self.end = start, end
+
+        # The selected row drops out of the tree while scrolled away; restore it on return
+        if self.selected is not None and start <= self.selected < end:
+            iid = str(self.selected)
+            if self.tree.selection() != (iid,):
+                self.tree.selection_set(iid)
+                self.tree.focus(iid)
+
+    def _update_scrollbar(self, visible):
+        if self.count <= visible:
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(self.top / self.count, min(1, (self.top + visible) / self.count))
+
+    def _schedule(self):
+        if self.pending is None:
+            self.pending = self.tree.after_idle(self.render)
+
+    def _on_tree_scroll(self, first, last):
+        if self.paused:
+            self.scrollbar.set(first, last)
+            return
+        size = self.end - self.start
+        if not size:
+            return
+        self.top = self.start + round(float(first) * size)
+        visible = self.visible_rows()
+        self._update_scrollbar(visible)
+        # Wheel and arrow-key scrolling happen inside the tree; move the window near its edges
+        margin = self.overscan // 2
+        if (self.start > 0 and self.top - self.start < margin or
+                self.end < self.count and self.end - self.top - visible < margin):
+            self._schedule()
+
+    def _on_tree_select(self, event):
+        selection = self.tree.selection()
+        if self.paused:
+            if self.on_select:
+                self.on_select(event)
+            return
+        if not selection or not selection[0].isdigit():
+            return  # Emptied because the selected row left the window
+        index = int(selection[0])
+        if index != self.selected:
+            self.selected = index
+            if self.on_select:
+                self.on_select(event)
+
+    def yview(self, *args):
+        # Scrollbar protocol: 'moveto fraction' or 'scroll n units|pages'
+        if self.paused:
+            return self.tree.yview(*args)
+        if args[0] == 'moveto':
+            self.top = int(float(args[1]) * self.count)
+        elif args[0] == 'scroll':
+            self.top += int(args[1]) * (self.visible_rows() if args[2] == 'pages' else 1)
+        self.render()
+
+    def fraction(self):
+        if self.paused:
+            return self.tree.yview()[0]
+        return self.top / self.count if self.count else 0.0
+
+    def see(self, index):
+        if self.paused:
+            return self.tree.see(index)
+        visible = self.visible_rows()
+        if index < self.top:
+            self.top = index
+        elif index >= self.top + visible:
+            self.top = index - visible + 1
+        self.render()
+
+    def select(self, index):
+        self.see(index)
+        iid = str(index)
+        if self.tree.exists(iid):
+            self.tree.selection_set(iid)
+            self.tree.focus(iid)
+
+    def selected_index(self):
+        selection = self.tree.selection()
+        if selection:
+            return int(selection[0]) if selection[0].isdigit() else None
+        return None if self.paused else self.selected
+
+    def index_at(self, y):
+        row = self.tree.identify_row(y)
+        return int(row) if row.isdigit() else None
@@ -0,0 +1,226 @@
+from collections import deque
+import json
+import os
+import re
+import threading
+import time
+from textutil import strip_truncation, stable_hash
+
+MAX_ALERTS = 1000
+MAX_SEEN = 200000
+WORD_SEPARATOR_RE = re.compile(r'[\W_]+')
+
+
+def normalize(text):
+    # Words separated and padded by single spaces, so " acme " only matches the whole word
+    return f" {WORD_SEPARATOR_RE.sub(' ', (text or '').casefold()).strip()} "
+
+
+def parse_rule(text):
+    """'Name: term, another phrase, -excluded' -> (name, include terms, exclude terms)."""
+    name, _, terms = text.partition(':')
+    if not terms.strip():
+        name, terms = text, text
+    include, exclude = [], []
+    for term in terms.split(','):
+        term = term.strip().strip('"')
+        if term.startswith('-'):
+            term = term[1:].strip()
+            if normalize(term).strip():
+                exclude.append(term)
+        elif normalize(term).strip():
+            include.append(term)
+    return name.strip(), include, exclude
+
+
+class Automaton:
+    """Aho-Corasick automaton: every pattern found in one pass over the text."""
+
+    def __init__(self, patterns):
+        goto = [{}]
+        out = [[]]
+        for pattern_id, pattern in enumerate(patterns):
+            state = 0
+            for ch in pattern:
+                next_state = goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][ch] = next_state
+                    goto.append({})
+                    out.append([])
+                state = next_state
+            out[state].append(pattern_id)
+
+        # Breadth first, so each state's failure link points at an already finished state
+        fail = [0] * len(goto)
+        pending = deque(goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for ch, next_state in goto[state].items():
+                pending.append(next_state)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[next_state] = goto[f].get(ch, 0)
+                out[next_state] += out[fail[next_state]]
+
+        self.goto = goto
+        self.fail = fail
+        self.out = [tuple(o) for o in out]
+
+    def __len__(self):
+        return len(self.goto)
+
+    def find(self, text):
+        goto, fail, out = self.goto, self.fail, self.out
+        found = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+class Watchlist:
+    """User keyword rules checked against every batch of fetched articles.
+
+    All rules' terms are compiled into one automaton, rebuilt only when the
+    rules change, so a batch costs one scan per article however many rules
+    there are. A rule fires when any of its terms appears as whole words in
+    the title, description or content and none of its excluded terms do;
+    each rule fires at most once per article.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.rules = []
+        self.alerts = deque(maxlen=MAX_ALERTS)   # Newest last
+        self.seen = set()                        # (rule id, article key) pairs that already fired
+        self.next_id = 1
+        self.automaton = None
+        self.patterns = []                       # pattern id -> normalized term
+        self.pattern_rules = []                  # pattern id -> [(rule index, excluded)]
+        self.unread = 0
+        self.dirty = False
+
+    def __len__(self):
+        return len(self.rules)
+
+    def add_rule(self, text):
+        name, include, exclude = parse_rule(text)
+        if not include:
+            raise ValueError("a rule needs at least one term to look for")
+        with self.lock:
+            rule = {'id': self.next_id, 'name': name, 'include': include, 'exclude': exclude,
+                    'created': time.time()}
+            self.next_id += 1
+            self.rules.append(rule)
+            self.automaton = None
+            self.dirty = True
+        return rule
+
+    def remove_rule(self, rule_id):
+        with self.lock:
+            self.rules = [rule for rule in self.rules if rule['id'] != rule_id]
+            self.automaton = None
+            self.dirty = True
+
+    def _compile(self):
+        patterns = {}
+        self.pattern_rules = []
+        for index, rule in enumerate(self.rules):
+            for excluded, terms in ((False, rule['include']), (True, rule['exclude'])):
+                for term in terms:
+                    pattern = normalize(term)
+                    pattern_id = patterns.get(pattern)
+                    if pattern_id is None:
+                        pattern_id = patterns[pattern] = len(self.pattern_rules)
+                        self.pattern_rules.append([])
+                    self.pattern_rules[pattern_id].append((index, excluded))
+        self.patterns = list(patterns)
+        self.automaton = Automaton(self.patterns)
+
+    def scan(self, articles):
+        """Check a batch of articles; returns the alerts it raised."""
+        with self.lock:
+            if not self.rules:
+                return []
+            if self.automaton is None:
+                self._compile()
+            raised = []
+            for article in articles:
+                text = normalize(f"{article.get('title') or ''} {article.get('description') or ''} "
+                                 f"{strip_truncation(article.get('content'))}")
+                found = self.automaton.find(text)
+                if not found:
+                    continue
+                hits = {}
+                excluded = set()
+                for pattern_id in found:
+                    for index, is_exclude in self.pattern_rules[pattern_id]:
+                        if is_exclude:
+                            excluded.add(index)
+                        else:
+                            hits.setdefault(index, []).append(self.patterns[pattern_id].strip())
+                key = stable_hash(article.get('url') or text)
+                for index, terms in hits.items():
+                    if index in excluded:
+                        continue
+                    rule = self.rules[index]
+                    if (rule['id'], key) in self.seen:
+                        continue
+                    if len(self.seen) >= MAX_SEEN:
+                        self.seen.clear()
+                    self.seen.add((rule['id'], key))
+                    alert = {
+                        'rule': rule['id'], 'name': rule['name'], 'terms': sorted(terms), 'key': key,
+                        'time': time.time(),
+                        'article': {field: article.get(field) for field in
+                                    ('title', 'description', 'url', 'urlToImage', 'author', 'publishedAt',
+                                     'source', 'content')}
+                    }
+                    self.alerts.append(alert)
+                    raised.append(alert)
+            if raised:
+                self.unread += len(raised)
+                self.dirty = True
+            return raised
+
+    def recent(self):
+        with self.lock:
+            return list(reversed(self.alerts))
+
+    def clear_alerts(self):
+        with self.lock:
+            self.alerts.clear()
+            self.unread = 0
+            self.dirty = True
+
+    def save(self, folder):
+        with self.lock:
+            if not self.dirty:
+                return
+            state = {'rules': self.rules, 'alerts': list(self.alerts), 'next_id': self.next_id}
+            self.dirty = False
+        tmp_path = os.path.join(folder, "watchlist.json.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, os.path.join(folder, "watchlist.json"))
+
+    @classmethod
+    def load(cls, folder):
+        watchlist = cls()
+        try:
+            with open(os.path.join(folder, "watchlist.json"), encoding='utf-8') as f:
+                state = json.load(f)
+            watchlist.rules = state['rules']
+            watchlist.alerts.extend(state['alerts'])
+            watchlist.next_id = state['next_id']
+            # Articles seen again after a restart must not fire twice
+            watchlist.seen = {(alert['rule'], alert['key']) for alert in watchlist.alerts}
+        except (OSError, ValueError, KeyError):
+            pass
+        return watchlist